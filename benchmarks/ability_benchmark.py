@@ -0,0 +1,78 @@
+'''
+Benchmark: dispatching ability hooks in full battles (see `AbilityRegistry`).
+
+Plays the same seeded battles between two teams where every member has an ability, most of which have no hooks in battle (or only a few),
+first with the dispatch table the engine uses, which only calls the hooks each ability overrides, then with a naive table calling every hook of every member.
+Reports battles per second and hook calls per battle for each, and checks both give identical battles.
+
+Usage:
+    python benchmarks/ability_benchmark.py [battles]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects.battle.AbilityRegistry import AbilityRegistry
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.RandomPolicy import RandomPolicy
+from simulation_benchmark import teams
+
+# The abilities of the simulation benchmark's teams, given to every member.
+ABILITIES = (("rough-skin", "intimidate", "levitate"), ("sand-stream", "steadfast", "water-absorb"))
+
+def counted(table : dict, calls : dict) -> dict:
+    '''
+    Wrap every handler of a dispatch table so each call is counted, by hook.
+    '''
+    def wrap(hook, handler):
+        def counting(*arguments):
+            calls[hook] += 1
+            return handler(*arguments)
+        return counting
+    return {
+        hook: None if handlers is None else tuple(tuple(None if handler is None else wrap(hook, handler) for handler in side) for side in handlers)
+        for hook, handlers in table.items()
+    }
+
+def play(battles : int, teams : tuple, table : dict) -> list:
+    '''
+    Play seeded battles between random policies with a dispatch table, returning each battle's final state.
+    '''
+    policies = (RandomPolicy(), RandomPolicy())
+    results = []
+    for seed in range(battles):
+        battle = PokeBattle(teams, seed=seed)
+        # The leads' on_summon hooks have been called through the engine's table by now, which at most skips calls that do nothing.
+        battle.hooks = table
+        battle.play(policies)
+        results.append(battle.state.key())
+    return results
+
+def main():
+    battles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    battle_teams = teams()
+    for team, abilities in zip(battle_teams, ABILITIES):
+        for pokemon, ability in zip(team, abilities):
+            pokemon.ability = ability
+    tables = (("subscribed", AbilityRegistry.dispatch(battle_teams)), ("naive", AbilityRegistry.dispatch(battle_teams, subscribed_only=False)))
+    # Warm up, so one-off work (building the type chart) isn't counted.
+    play(10, battle_teams, tables[0][1])
+    baseline = None
+    for name, table in tables:
+        start = time.perf_counter()
+        results = play(battles, battle_teams, table)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = results
+        elif results != baseline:
+            raise AssertionError(f"The {name} table gave different battles.")
+        calls = dict.fromkeys(table, 0)
+        play(battles, battle_teams, counted(table, calls))
+        hooks = sum(1 for handlers in table.values() if handlers is not None)
+        print(f"{name:<10}   {battles / elapsed:>8.0f} battles/s   {sum(calls.values()) / battles:>6.1f} hook calls/battle   {hooks} hook(s) dispatched")
+    print("results: identical")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+'''
+Benchmark: scoring (moveset, opponent typing) combinations with `poketype.run_calculations(...)` one opponent at a time versus `poketype.run_batch_calculations(...)`.
+
+Scores random four-move movesets (with STAB) against every one of the 171 single and dual typings, for each type chart revision.
+The per-call loop is timed on a sample and extrapolated, as it is far too slow to run on the full batch.
+
+Requires the optional 'numpy' package.
+
+Usage:
+    python benchmarks/batch_benchmark.py [movesets]
+'''
+import itertools
+import os
+import random
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+from objects.type.TypeChart import TypeChart
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(0)
+    typings = [(type, -1) for type in range(TypeChart.SIZE)] + list(itertools.combinations(range(TypeChart.SIZE), 2))
+    primary = numpy.array([typing[0] for typing in typings])
+    secondary = numpy.array([typing[1] for typing in typings])
+    moves = numpy.array([rng.sample(range(TypeChart.SIZE), 4) for _ in range(count)])
+    users = numpy.array([[rng.randrange(TypeChart.SIZE), rng.choice([-1, rng.randrange(TypeChart.SIZE)])] for _ in range(count)])
+    combinations = count * len(typings)
+
+    for generation in (8, 4, 1):
+        poketype.run_batch_calculations(moves[:1], primary, secondary, users[:1], generation=generation)
+        start = time.perf_counter()
+        result = poketype.run_batch_calculations(moves, primary, secondary, users, generation=generation)
+        batch = time.perf_counter() - start
+
+        # Time the per-call loop on a sample of the movesets, checking it agrees with the batch.
+        sample = min(count, 50)
+        start = time.perf_counter()
+        for attacker in range(sample):
+            names = [TypeChart.name(move) for move in moves[attacker]]
+            user = [TypeChart.name(type) for type in users[attacker] if type >= 0]
+            for defender, (first, second) in enumerate(typings):
+                opponent = [TypeChart.name(first)] + ([TypeChart.name(second)] if second >= 0 else [])
+                categories = poketype.run_calculations(user=user, opponent=opponent, moves=names, generation=generation)
+                merged = {move: value for category in categories for move, value in category.items()}
+                assert all(abs(merged[name] - result[attacker, index, defender]) < 1e-9 for index, name in enumerate(names))
+        loop = (time.perf_counter() - start) / sample * count
+
+        print(f"generation {generation}   {combinations} combinations   run_calculations ~{loop:>7.2f}s (extrapolated)   batch {batch:>7.4f}s   {loop / batch:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+'''
+Benchmark: one `PokeData(name=...)` per Pokemon versus `PokeData.load_many(...)`.
+
+Loads 1,000 and 10,000 Pokemon from the local stand-in API, with the response cache disabled and the identity map cleared between runs, so every Pokemon is a real request.
+A small per-request latency is added to the stand-in to mimic a remote server; pass 0 to measure raw throughput.
+
+Usage:
+    python benchmarks/bulk_benchmark.py [latency-ms] [workers]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.standin_server import StandInServer
+from objects.api.PokeRegistry import PokeRegistry
+from objects.api.PokeSession import PokeSession
+from objects.data.PokeData import PokeData
+
+def main():
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 2.0 / 1000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    # Few moves per Pokemon, so the stand-in can hold 10k payloads in memory.
+    with StandInServer(latency=latency, move_count=5) as server:
+        PokeSession.configure(base_url=server.base_url, pool_maxsize=workers, cache=None)
+        for count in (1000, 10000):
+            names = [f"pokemon-{id}" for id in range(1, count + 1)]
+
+            PokeRegistry.default_registry().clear()
+            start = time.perf_counter()
+            for name in names:
+                PokeData(name=name)
+            sequential = time.perf_counter() - start
+
+            PokeRegistry.default_registry().clear()
+            start = time.perf_counter()
+            results = PokeData.load_many(names, workers=workers)
+            bulk = time.perf_counter() - start
+            failures = sum(1 for result in results if isinstance(result, Exception))
+
+            print(f"{count:>6} Pokemon   sequential {count / sequential:>8.1f}/s ({sequential:.2f}s)   load_many {count / bulk:>8.1f}/s ({bulk:.2f}s)   {sequential / bulk:.1f}x   {failures} failures")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+'''
+Benchmark: finding which typings a set of move types hits super effectively (and which resist it), by looping over every typing versus `poketype.get_coverage(...)`.
+
+Uses random sets of one to four move types, for each type chart revision.
+
+Usage:
+    python benchmarks/coverage_benchmark.py [queries]
+'''
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+from objects.type.TypeChart import TypeChart
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(0)
+    queries = [rng.sample(TypeChart.TYPES, rng.randint(1, 4)) for _ in range(count)]
+    typings = [[TypeChart.name(type) for type in typing if type >= 0] for typing in TypeChart.TYPINGS]
+
+    for generation in (8, 4, 1):
+        # Warm up, so one-off work (such as building the reverse tables) isn't counted.
+        poketype.get_coverage(queries[0], generation=generation)
+        start = time.perf_counter()
+        results = [poketype.get_coverage(moves, generation=generation) for moves in queries]
+        indexed = (time.perf_counter() - start) / count
+
+        # The slow way: the best move's multiplier against every typing, from its defensive profile. Checked against the indexed results.
+        start = time.perf_counter()
+        for moves, result in zip(queries, results):
+            super_effective = []
+            for typing in typings:
+                profile = poketype.get_defensive_profile(typing, generation=generation)
+                if max(profile[move_type] for move_type in moves) > 1.0:
+                    super_effective.append(typing)
+            assert super_effective == [list(typing) for typing in result["super_effective"]]
+        looped = (time.perf_counter() - start) / count
+
+        print(f"generation {generation}   loop over typings {looped * 1e6:>8.1f} us/query   get_coverage {indexed * 1e6:>6.1f} us/query   {looped / indexed:>5.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+'''
+Benchmark: the damage calculator.
+
+Micro-benchmarks a few typical attacks through `DamageCalculator.rolls(...)` (each calculated from scratch, and repeated as a battle would) and `DamageCalculator.expected(...)`,
+then times `DamageCalculator.batch(...)` over many random attacks against calling rolls() for each one, checking they agree.
+
+Requires the optional 'numpy' package (for the batch benchmark).
+
+Usage:
+    python benchmarks/damage_benchmark.py [attacks]
+'''
+import os
+import random
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects.battle.DamageCalculator import DamageCalculator
+from objects.type.AbilityModifier import AbilityModifier
+from objects.type.TypeChart import TypeChart
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    calculator = DamageCalculator(8)
+    fire, grass, steel, water, ground, rock = (TypeChart.index(type) for type in ("fire", "grass", "steel", "water", "ground", "rock"))
+    scenarios = {
+        "plain": ((50, 100, 100, 80, grass, [], [fire]), {}),
+        "STAB, 4x": ((50, 150, 100, 90, fire, [fire], [grass, steel]), {}),
+        "critical, stages": ((50, 150, 100, 90, fire, [fire], [grass, steel]), {"critical": True, "attack_stage": -2, "defense_stage": 2}),
+        "weather, burn, ability": ((50, 150, 100, 90, water, [water], [ground, rock]), {"weather": "rain", "burned": True, "defender_ability": "filter"}),
+    }
+    calls = 20000
+    for name, (arguments, options) in scenarios.items():
+        start = time.perf_counter()
+        for _ in range(calls):
+            # Forget the remembered rolls each time, to time the full formula.
+            calculator._rolls.clear()
+            calculator.rolls(*arguments, **options)
+        cold = (time.perf_counter() - start) / calls
+        start = time.perf_counter()
+        for _ in range(calls):
+            calculator.rolls(*arguments, **options)
+        warm = (time.perf_counter() - start) / calls
+        start = time.perf_counter()
+        for _ in range(calls):
+            calculator.expected(*arguments, critical_stage=1, **{key: value for key, value in options.items() if key != "critical"})
+        expected = (time.perf_counter() - start) / calls
+        print(f"{name:<24} rolls {cold * 1e6:>6.2f} us   repeated {warm * 1e6:>6.2f} us   expected {expected * 1e6:>6.2f} us")
+
+    rng = random.Random(0)
+    abilities = [""] * 4 + list(AbilityModifier._registry)
+    attacks = [(
+        rng.randint(1, 100), rng.randint(10, 400), rng.randint(10, 400), rng.choice((40, 60, 80, 90, 100, 120)), rng.randrange(TypeChart.SIZE),
+        list(rng.choice(TypeChart.TYPINGS)), list(rng.choice(TypeChart.TYPINGS)), rng.random() < 0.5, rng.randint(-2, 2), rng.randint(-2, 2), rng.random() < 0.05, rng.random() < 0.1,
+        rng.choice(abilities), rng.choice(abilities),
+    ) for _ in range(count)]
+    # The batch takes arrays, with abilities as modifier indices.
+    columns = [numpy.array(column) for column in list(zip(*attacks))[:12]]
+    attacker_abilities = numpy.array([AbilityModifier.index(attack[12]) for attack in attacks])
+    defender_abilities = numpy.array([AbilityModifier.index(attack[13]) for attack in attacks])
+    calculator.batch(*columns, attacker_abilities=attacker_abilities, defender_abilities=defender_abilities)
+    start = time.perf_counter()
+    result = calculator.batch(*columns, attacker_abilities=attacker_abilities, defender_abilities=defender_abilities)
+    batch = time.perf_counter() - start
+
+    sample = attacks[:min(count, 20000)]
+    calculator._rolls.clear()
+    start = time.perf_counter()
+    for index, attack in enumerate(sample):
+        rolls = calculator.rolls(*attack[:12], attacker_ability=attack[12], defender_ability=attack[13])
+        assert rolls == tuple(result[index]), (attack, rolls, result[index])
+    loop = (time.perf_counter() - start) / len(sample) * count
+    print(f"{count} random attacks   rolls() ~{loop:>6.2f}s (extrapolated)   batch {batch:>6.3f}s   {loop / batch:>4.0f}x   {count / batch:>10.0f} attacks/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+'''
+Benchmark: throughput and memory of streaming matchup queries through `poketype.run_batch(...)`.
+
+Writes files of random JSONL queries of increasing size, then streams each through run_batch() (as JSONL and as CSV output) to os.devnull, once timed and once with memory traced.
+Peak memory should stay flat as the number of queries grows.
+
+Usage:
+    python benchmarks/headless_benchmark.py [queries]
+'''
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+from objects.type.TypeChart import TypeChart
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    directory = tempfile.mkdtemp()
+    for count in (largest // 4, largest):
+        path = os.path.join(directory, f"queries-{count}.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            for index in range(count):
+                query = {
+                    "id": index,
+                    "user": rng.sample(TypeChart.TYPES, rng.randint(1, 2)),
+                    "opponent": rng.sample(TypeChart.TYPES, rng.randint(1, 2)),
+                    "moves": rng.sample(TypeChart.TYPES, 4),
+                }
+                file.write(json.dumps(query) + "\n")
+
+        for output_format in poketype.BATCH_FORMATS:
+            # Timed first on its own, as tracing memory slows everything down.
+            with open(path, encoding="utf-8") as input, open(os.devnull, "w", encoding="utf-8") as output:
+                start = time.perf_counter()
+                poketype.run_batch(input, output, output_format=output_format)
+                elapsed = time.perf_counter() - start
+            with open(path, encoding="utf-8") as input, open(os.devnull, "w", encoding="utf-8") as output:
+                tracemalloc.start()
+                poketype.run_batch(input, output, output_format=output_format)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            print(f"{count:>8} queries   jsonl -> {output_format:<5}   {count / elapsed:>8.0f} queries/s   peak memory {peak / 1024:>7.1f} KiB")
+        os.remove(path)
+    os.rmdir(directory)
+
+if __name__ == "__main__":
+    main()
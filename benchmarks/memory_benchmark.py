@@ -0,0 +1,63 @@
+'''
+Benchmark: memory held by PokeData objects keeping raw JSON versus the compact representation.
+
+Builds synthetic Pokemon payloads with the stand-in API's payload generator, round-trips each through `json` so every string is a fresh object (as it is after a real request), then measures the memory retained by the loaded objects with tracemalloc.
+No server or network is involved.
+
+Usage:
+    python benchmarks/memory_benchmark.py [count] [moves-per-pokemon]
+'''
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.standin_server import pokemon_payload
+from objects.api.PokeRegistry import PokeRegistry
+from objects.data.PokeData import PokeData
+
+BASE_URL = "http://127.0.0.1/api/v2/"
+
+def measure(documents : list, compact : bool) -> tuple:
+    '''
+    Load every document into a PokeData, returning the memory retained and the time taken.
+    '''
+    def load():
+        PokeRegistry.default_registry().clear()
+        gc.collect()
+        # Parse inside the measurement, so the JSON of compact Pokemon is allocated and then released, as it would be after a request.
+        return [PokeData.from_data(json.loads(document), url=f"{BASE_URL}pokemon/{index + 1}/", compact=compact) for index, document in enumerate(documents)]
+
+    # Time a run without tracemalloc first, as tracing slows allocation down considerably.
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    pokemon = load()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Sanity check that the accessors still agree with the source data.
+    assert pokemon[0].get_default_types() == [entry["type"]["name"] for entry in json.loads(documents[0])["types"]]
+    del pokemon
+    return retained, peak, elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    documents = [json.dumps(pokemon_payload(BASE_URL, id, move_count=moves)) for id in range(1, count + 1)]
+
+    raw, raw_peak, raw_time = measure(documents, compact=False)
+    compact, compact_peak, compact_time = measure(documents, compact=True)
+    print(f"{count} Pokemon, {moves} moves each")
+    print(f"  raw JSON   {raw / count / 1024:>8.1f} KiB/Pokemon retained   {raw_peak / 1024 / 1024:>7.1f} MiB peak   {raw_time:.2f}s")
+    print(f"  compact    {compact / count / 1024:>8.1f} KiB/Pokemon retained   {compact_peak / 1024 / 1024:>7.1f} MiB peak   {compact_time:.2f}s")
+    print(f"  {raw / compact:.1f}x less memory retained")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+'''
+Benchmark: finding the best four move types by brute force over `poketype.run_calculations(...)` versus `poketype.find_best_moves(...)`.
+
+For a few user typings, the candidates are every type (a full learnset reduces to at most 18 distinct move types), scored against all 171 typings.
+The brute force is timed on a sample of its 3,060 movesets and extrapolated.
+
+Requires the optional 'numpy' package.
+
+Usage:
+    python benchmarks/optimiser_benchmark.py
+'''
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+from objects.type.TypeChart import TypeChart
+
+def main():
+    opponents = [[TypeChart.name(type) for type in typing if type >= 0] for typing in TypeChart.typings()]
+    movesets = list(itertools.combinations(TypeChart.TYPES, 4))
+    # Warm up, so one-off work (importing NumPy, building the chart's array) isn't counted.
+    poketype.find_best_moves(list(TypeChart.TYPES))
+    for user in (["water", "ground"], ["dragon"], ["normal", "fairy"]):
+        start = time.perf_counter()
+        for _ in range(10):
+            result = poketype.find_best_moves(list(TypeChart.TYPES), user=user)
+        optimised = (time.perf_counter() - start) / 10
+
+        # Score a sample of movesets the slow way: every opponent through run_calculations, keeping each opponent's best move.
+        sample = movesets[::100]
+        start = time.perf_counter()
+        for moves in sample:
+            total = 0.0
+            for opponent in opponents:
+                categories = poketype.run_calculations(user=user, opponent=opponent, moves=list(moves))
+                total += max(value for category in categories for value in category.values())
+        brute = (time.perf_counter() - start) / len(sample) * len(movesets)
+
+        print(f"{'/'.join(user):<14} best {', '.join(result['moves']):<32} {result['score']:.3f}x   brute force ~{brute:>6.1f}s (extrapolated)   optimiser {optimised * 1000:>6.2f}ms   {brute / optimised:>6.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+'''
+Benchmark: loading Pokemon from the response cache in full versus with a field projection.
+
+Fills a temporary PokeCache with synthetic Pokemon payloads (from the stand-in API's payload generator), then loads every Pokemon from it with `PokeData(...)` and with `PokeData(..., fields=PokeData.BASIC_FIELDS)`, measuring the time taken and the memory retained.
+No server or network is involved; every load is a cache hit.
+
+Usage:
+    python benchmarks/projection_benchmark.py [count] [moves-per-pokemon]
+'''
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.standin_server import pokemon_payload
+from objects.api.PokeCache import PokeCache
+from objects.api.PokeRegistry import PokeRegistry
+from objects.api.PokeSession import PokeSession
+from objects.data.PokeData import PokeData
+
+BASE_URL = "http://127.0.0.1/api/v2/"
+
+def measure(count : int, fields : tuple) -> tuple:
+    '''
+    Load every Pokemon from the cache, returning the time taken and the memory retained.
+    '''
+    def load():
+        PokeRegistry.default_registry().clear()
+        gc.collect()
+        return [PokeData(url=f"{BASE_URL}pokemon/{id}/", fields=fields) for id in range(1, count + 1)]
+
+    # Time a run without tracemalloc first, as tracing slows allocation down considerably.
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    pokemon = load()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert pokemon[0].get_default_stats() == {entry["stat"]["name"]: entry["base_stat"] for entry in pokemon_payload(BASE_URL, 1)["stats"]}
+    del pokemon
+    return elapsed, retained
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PokeCache(os.path.join(directory, "responses.sqlite3"), max_bytes=4 * 1024 * 1024 * 1024)
+        for id in range(1, count + 1):
+            url = PokeSession.canonical_url(f"{BASE_URL}pokemon/{id}")
+            cache.put(url, pokemon_payload(BASE_URL, id, move_count=moves))
+        PokeSession.configure(base_url=BASE_URL, cache=cache)
+
+        full_time, full_memory = measure(count, ())
+        projected_time, projected_memory = measure(count, PokeData.BASIC_FIELDS)
+        print(f"{count} Pokemon, {moves} moves each, loaded from the cache")
+        print(f"  full        {count / full_time:>9.1f}/s   {full_memory / count / 1024:>8.1f} KiB/Pokemon retained")
+        print(f"  projected   {count / projected_time:>9.1f}/s   {projected_memory / count / 1024:>8.1f} KiB/Pokemon retained")
+        print(f"  {full_time / projected_time:.1f}x faster, {full_memory / projected_memory:.1f}x less memory retained")
+        PokeSession.default_session().close()
+        cache.close()
+
+if __name__ == "__main__":
+    main()
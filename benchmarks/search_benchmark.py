@@ -0,0 +1,67 @@
+'''
+Benchmark: the search AI (`SearchPolicy`), for tuning its budget for real-time play.
+
+For a few wall-clock budgets per choice, plays mirror battles (the same team on both sides, swapping sides every battle) of the search against the greedy policy,
+reporting the nodes searched per second, the nodes per choice, and the search's win rate. Then checks that a node budget makes choices reproducible.
+
+Usage:
+    python benchmarks/search_benchmark.py [battles]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects.battle.BattleRunner import BattleRunner
+from objects.battle.GreedyPolicy import GreedyPolicy
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.SearchPolicy import SearchPolicy
+from simulation_benchmark import teams
+
+class RecordingPolicy(SearchPolicy):
+    '''
+    A search policy that keeps the statistics of every choice.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.history = []
+
+    def choose(self, battle, side : int) -> int:
+        action = super().choose(battle, side)
+        if len(battle.legal_actions(side)) > 1:
+            self.history.append(self.statistics)
+        return action
+
+def main():
+    battles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    team = teams()[0]
+    greedy = GreedyPolicy()
+    for time_limit in (0.01, 0.05, 0.1):
+        search = RecordingPolicy(time_limit=time_limit)
+        wins = 0
+        start = time.perf_counter()
+        for battle in range(battles):
+            side = battle % 2
+            game = PokeBattle((team, team), seed=battle)
+            wins += game.play((search, greedy) if side == 0 else (greedy, search)) == side
+        elapsed = time.perf_counter() - start
+        nodes = sum(choice["nodes"] for choice in search.history)
+        seconds = sum(choice["seconds"] for choice in search.history)
+        low, high = BattleRunner.interval(wins, battles)
+        print(f"{time_limit * 1000:>5.0f}ms/choice   {nodes / seconds:>8.0f} nodes/s   {nodes / len(search.history):>7.0f} nodes/choice   "
+              f"won {wins}/{battles} against greedy (95% CI {low:.2f}-{high:.2f})   {elapsed:.1f}s")
+
+    # With a node budget instead of a time limit, the same battle gives the same choices.
+    results = set()
+    for _ in range(2):
+        game = PokeBattle((team, team), seed=7)
+        game.play((SearchPolicy(time_limit=None, max_nodes=2000), greedy))
+        results.add(game.state.key())
+    if len(results) != 1:
+        raise AssertionError("A node budget gave different results.")
+    print("node budget: reproducible")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+'''
+Benchmark: bare `requests.get` versus the pooled PokeSession.
+
+Runs a sequential loop of GETs against the local stand-in API, first opening a fresh connection per request (the old behaviour of PokeData / PokeAbilityData), then re-using pooled keep-alive connections through PokeSession.
+The stand-in serves plain HTTP, so the saving shown here is TCP setup only; against the real PokeAPI each avoided connection also skips a TLS handshake.
+
+Usage:
+    python benchmarks/session_benchmark.py [requests] [latency-ms]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from benchmarks.standin_server import StandInServer
+from objects.api.PokeSession import PokeSession
+
+def run(label : str, get, urls : list, server : StandInServer):
+    connections = server.connections
+    start = time.perf_counter()
+    for url in urls:
+        get(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {len(urls) / elapsed:>10.1f} req/s   {server.connections - connections:>6} connections opened")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    with StandInServer(latency=latency) as server:
+        urls = [f"{server.base_url}pokemon/{(index % 151) + 1}" for index in range(count)]
+        run("requests.get", requests.get, urls, server)
+        session = PokeSession(base_url=server.base_url)
+        run("PokeSession.get", session.get, urls, server)
+        session.close()
+
+if __name__ == "__main__":
+    main()
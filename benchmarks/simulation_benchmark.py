@@ -0,0 +1,77 @@
+'''
+Benchmark: Monte Carlo battle simulation with `BattleRunner`.
+
+Plays the same seeded battles between two fixed teams with 1, 2 and 4 worker processes, reporting battles per second, and checks every run gives identical results.
+Scaling with workers is limited by the number of CPUs available.
+
+Usage:
+    python benchmarks/simulation_benchmark.py [battles]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects.battle.BattleMove import BattleMove
+from objects.battle.BattlePokemon import BattlePokemon
+from objects.battle.BattleRunner import BattleRunner
+from objects.battle.GreedyPolicy import GreedyPolicy
+from objects.battle.RandomPolicy import RandomPolicy
+
+def teams() -> tuple:
+    '''
+    Build the two teams the benchmark battles with, from base stats so no data needs to be loaded.
+    '''
+    earthquake = BattleMove("earthquake", "ground", 100)
+    flamethrower = BattleMove("flamethrower", "fire", 90, damage_class="special", burn_chance=10)
+    surf = BattleMove("surf", "water", 90, damage_class="special")
+    ice_beam = BattleMove("ice-beam", "ice", 90, damage_class="special")
+    thunderbolt = BattleMove("thunderbolt", "electric", 90, damage_class="special")
+    close_combat = BattleMove("close-combat", "fighting", 120, pp=5, stat_changes={"defense": -1, "special-defense": -1}, targets_user=True)
+    swords_dance = BattleMove("swords-dance", "normal", accuracy=None, damage_class="status", pp=20, stat_changes={"attack": 2}, targets_user=True)
+    will_o_wisp = BattleMove("will-o-wisp", "fire", accuracy=85, damage_class="status", pp=15, burn_chance=100)
+    dragon_claw = BattleMove("dragon-claw", "dragon", 80, pp=15)
+    stone_edge = BattleMove("stone-edge", "rock", 100, accuracy=80, pp=5, critical_stage=1)
+    crunch = BattleMove("crunch", "dark", 80, pp=15, stat_changes={"defense": -1}, stat_chance=20)
+    shadow_ball = BattleMove("shadow-ball", "ghost", 80, damage_class="special", pp=15)
+    first = [
+        BattlePokemon.from_base_stats("garchomp", ["dragon", "ground"], {"hp": 108, "attack": 130, "defense": 95, "special-attack": 80, "special-defense": 85, "speed": 102},
+                                      [earthquake, dragon_claw, stone_edge, swords_dance], ability="rough-skin"),
+        BattlePokemon.from_base_stats("gyarados", ["water", "flying"], {"hp": 95, "attack": 125, "defense": 79, "special-attack": 60, "special-defense": 100, "speed": 81},
+                                      [surf, ice_beam, earthquake, stone_edge]),
+        BattlePokemon.from_base_stats("gengar", ["ghost", "poison"], {"hp": 60, "attack": 65, "defense": 60, "special-attack": 130, "special-defense": 75, "speed": 110},
+                                      [shadow_ball, thunderbolt, will_o_wisp, ice_beam], ability="levitate"),
+    ]
+    second = [
+        BattlePokemon.from_base_stats("tyranitar", ["rock", "dark"], {"hp": 100, "attack": 134, "defense": 110, "special-attack": 95, "special-defense": 100, "speed": 61},
+                                      [stone_edge, crunch, earthquake, ice_beam]),
+        BattlePokemon.from_base_stats("lucario", ["fighting", "steel"], {"hp": 70, "attack": 110, "defense": 70, "special-attack": 115, "special-defense": 70, "speed": 90},
+                                      [close_combat, swords_dance, shadow_ball, earthquake]),
+        BattlePokemon.from_base_stats("vaporeon", ["water"], {"hp": 130, "attack": 65, "defense": 60, "special-attack": 110, "special-defense": 95, "speed": 65},
+                                      [surf, ice_beam, shadow_ball, flamethrower], ability="water-absorb"),
+    ]
+    return (first, second)
+
+def main():
+    battles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{os.cpu_count()} CPU(s) available")
+    for name, policies in (("random vs random", (RandomPolicy(), RandomPolicy())), ("greedy vs random", (GreedyPolicy(), RandomPolicy()))):
+        runner = BattleRunner(teams(), policies)
+        # Warm up, so one-off work (building the type chart) isn't counted.
+        runner.run(10, workers=1)
+        baseline = None
+        for workers in (1, 2, 4):
+            start = time.perf_counter()
+            result = runner.run(battles, seed=42, workers=workers)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = result
+            elif result != baseline:
+                raise AssertionError(f"{workers} workers gave different results: {result} != {baseline}")
+            low, high = result["interval"]
+            print(f"{name:<18} {workers} worker(s)   {battles / elapsed:>8.0f} battles/s   win rate {result['win_rate']:.3f} (95% CI {low:.3f}-{high:.3f})   "
+                  f"{result['draws']} draws   {result['turns']:.1f} turns/battle")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+'''
+A local stand-in for the PokeAPI, used by the benchmarks in this folder.
+
+The server speaks HTTP/1.1 with keep-alive, and answers `/api/v2/<resource>/<name or id>/` with a synthetic payload shaped like the real API's.
+Pokemon are named `pokemon-<id>` and abilities `ability-<id>`, so both name and ID lookups work.
+No network access is needed, and an optional per-request latency can be added to mimic a remote server.
+'''
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TYPES = ["normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+def pokemon_payload(base_url : str, id : int, move_count : int = 80, version_groups : int = 6) -> dict:
+    '''
+    Build a synthetic Pokemon payload.
+
+    Arguments:
+        base_url (str): The base URL of the API, used for nested resource URLs.
+        id (int): The ID of the Pokemon.
+        move_count (int): The number of moves the Pokemon learns. Real payloads range from a handful to several hundred.
+        version_groups (int): The number of version group details per move.
+    Returns:
+        dict: The payload.
+    '''
+    rng = random.Random(id)
+    types = rng.sample(TYPES, rng.choice([1, 2]))
+    return {
+        "id": id,
+        "name": f"pokemon-{id}",
+        "height": rng.randint(1, 100),
+        "weight": rng.randint(1, 2000),
+        "order": id,
+        "base_experience": rng.randint(40, 300),
+        "is_default": True,
+        "abilities": [
+            {"ability": {"name": f"ability-{(id * 7 + slot) % 300 + 1}", "url": f"{base_url}ability/{(id * 7 + slot) % 300 + 1}/"}, "is_hidden": slot == 3, "slot": slot}
+            for slot in (1, 2, 3)
+        ],
+        "forms": [{"name": f"pokemon-{id}", "url": f"{base_url}pokemon-form/{id}/"}],
+        "types": [{"slot": slot + 1, "type": {"name": name, "url": f"{base_url}type/{TYPES.index(name) + 1}/"}} for slot, name in enumerate(types)],
+        "stats": [{"base_stat": rng.randint(20, 160), "effort": 0, "stat": {"name": name, "url": f"{base_url}stat/{index + 1}/"}} for index, name in enumerate(STATS)],
+        "moves": [
+            {
+                "move": {"name": f"move-{move}", "url": f"{base_url}move/{move}/"},
+                "version_group_details": [
+                    {
+                        "level_learned_at": rng.randint(0, 60),
+                        "move_learn_method": {"name": "level-up", "url": f"{base_url}move-learn-method/1/"},
+                        "version_group": {"name": f"version-group-{group}", "url": f"{base_url}version-group/{group}/"},
+                    }
+                    for group in range(1, version_groups + 1)
+                ],
+            }
+            for move in rng.sample(range(1, 900), move_count)
+        ],
+        "game_indices": [{"game_index": id, "version": {"name": f"version-{version}", "url": f"{base_url}version/{version}/"}} for version in range(1, 20)],
+        "sprites": {
+            "front_default": f"https://example.invalid/sprites/{id}.png",
+            "back_default": f"https://example.invalid/sprites/back/{id}.png",
+            "front_shiny": f"https://example.invalid/sprites/shiny/{id}.png",
+            "back_shiny": f"https://example.invalid/sprites/back/shiny/{id}.png",
+            "front_female": None,
+            "back_female": None,
+            "front_shiny_female": None,
+            "back_shiny_female": None,
+            "other": {},
+        },
+        "species": {"name": f"pokemon-{id}", "url": f"{base_url}pokemon-species/{id}/"},
+    }
+
+def ability_payload(base_url : str, id : int) -> dict:
+    '''
+    Build a synthetic ability payload.
+
+    Arguments:
+        base_url (str): The base URL of the API, used for nested resource URLs.
+        id (int): The ID of the ability.
+    Returns:
+        dict: The payload.
+    '''
+    return {
+        "id": id,
+        "name": f"ability-{id}",
+        "is_main_series": True,
+        "effect_entries": [{"effect": f"Effect of ability {id}.", "short_effect": f"Ability {id}.", "language": {"name": "en", "url": f"{base_url}language/9/"}}],
+        "pokemon": [],
+    }
+
+def generic_payload(base_url : str, resource : str, id : int) -> dict:
+    '''
+    Build a minimal payload for any other resource (species, forms, moves, ...).
+
+    Arguments:
+        base_url (str): The base URL of the API.
+        resource (str): The resource type.
+        id (int): The ID of the resource.
+    Returns:
+        dict: The payload.
+    '''
+    return {"id": id, "name": f"{resource}-{id}", "url": f"{base_url}{resource}/{id}/"}
+
+class StandInServer:
+    '''
+    A threaded HTTP/1.1 server imitating the PokeAPI, run on a background thread.
+
+    Usage:
+        with StandInServer(latency=0.005) as server:
+            PokeSession.configure(base_url=server.base_url)
+    '''
+
+    def __init__(self, latency : float = 0.0, count : int = 100000, move_count : int = 80):
+        self.latency = latency
+        self.count = count
+        self.move_count = move_count
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v2/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _body(self, resource : str, identifier : str) -> bytes | None:
+        key = (resource, identifier)
+        body = self._bodies.get(key)
+        if body is not None:
+            return body
+        # Accept either 'pokemon-25' style names or bare IDs.
+        id_part = identifier.rsplit("-", 1)[-1]
+        if not id_part.isdigit() or not (0 < int(id_part) <= self.count):
+            return None
+        id = int(id_part)
+        if resource == "pokemon":
+            payload = pokemon_payload(self.base_url, id, move_count=self.move_count)
+        elif resource == "ability":
+            payload = ability_payload(self.base_url, id)
+        else:
+            payload = generic_payload(self.base_url, resource, id)
+        body = json.dumps(payload).encode()
+        self._bodies[key] = body
+        return body
+
+    def _listing(self, resource : str, query : dict) -> bytes:
+        # A named API resource list, like the real API's list endpoints.
+        limit = int(query.get("limit", 20))
+        offset = int(query.get("offset", 0))
+        ids = range(offset + 1, min(offset + limit, self.count) + 1)
+        results = [{"name": f"{resource}-{id}", "url": f"{self.base_url}{resource}/{id}/"} for id in ids]
+        return json.dumps({"count": self.count, "next": None, "previous": None, "results": results}).encode()
+
+    def _handler(self):
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer each response into a single write, and send it immediately, so small responses don't stall on delayed ACKs.
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with owner._lock:
+                    owner.connections += 1
+
+            def do_GET(self):
+                with owner._lock:
+                    owner.requests += 1
+                if owner.latency:
+                    time.sleep(owner.latency)
+                path, _, query = self.path.partition("?")
+                parts = [part for part in path.split("/") if part]
+                body = None
+                if len(parts) == 4 and parts[0] == "api" and parts[1] == "v2":
+                    body = owner._body(parts[2], parts[3].lower())
+                elif len(parts) == 3 and parts[0] == "api" and parts[1] == "v2":
+                    body = owner._listing(parts[2], dict(pair.partition("=")[::2] for pair in query.split("&") if pair))
+                if body is None:
+                    body = b'{"detail": "Not found."}'
+                    self.send_response(404)
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Keep benchmark output clean.
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,68 @@
+'''
+Benchmark: saving and restoring a battle's state, as a search does at every branch.
+
+Times `BattleState.snapshot()` + `restore(...)` against deep-copying the same state held as nested lists and dicts (the way the old Pokemon class holds it),
+then times branching from one position many times: restoring the position and playing a turn from it.
+
+Usage:
+    python benchmarks/state_benchmark.py
+'''
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects.battle.BattleState import BattleState
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.RandomPolicy import RandomPolicy
+from simulation_benchmark import teams
+
+def main():
+    battle = PokeBattle(teams(), seed=1)
+    policy = RandomPolicy()
+    # Play a few turns, to branch from a position part way through.
+    for _ in range(3):
+        battle.step(policy.choose(battle, 0), policy.choose(battle, 1))
+    state = battle.state
+    # The same state as nested objects: each side's active member and stages, and each member's HP, status and PP.
+    nested = [
+        {
+            "active": battle.active(side),
+            "stages": {stat: battle.stage(side, stat) for stat in ("attack", "defense", "special-attack", "special-defense", "speed")},
+            "members": [{"hp": battle.hp(side, member), "status": battle.status(side, member), "pp": list(state.data[state.member(side, member) + BattleState.PP:][:4])}
+                        for member in range(state.sizes[side])],
+        }
+        for side in (0, 1)
+    ]
+    print(f"state: {len(state.data)} values, {len(state.data) * state.data.itemsize} bytes")
+
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        state.restore(state.snapshot())
+    compact = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    for _ in range(count):
+        nested = copy.deepcopy(nested)
+    deep = (time.perf_counter() - start) / count
+    print(f"snapshot + restore     {compact * 1e9:>8.0f}ns")
+    print(f"deepcopy (nested)      {deep * 1e9:>8.0f}ns   {deep / compact:>5.0f}x")
+
+    # Branch from the same position: restore it, and play a turn with random actions.
+    position = state.snapshot()
+    key = state.key()
+    count = 20000
+    start = time.perf_counter()
+    for _ in range(count):
+        state.restore(position)
+        battle.step(policy.choose(battle, 0), policy.choose(battle, 1))
+    branching = (time.perf_counter() - start) / count
+    state.restore(position)
+    if state.key() != key:
+        raise AssertionError("Restoring the snapshot didn't restore the position.")
+    print(f"branch (restore + turn) {branching * 1e6:>7.1f}us   {1 / branching:>8.0f} branches/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+'''
+Benchmark: ranking candidate six-member teams by defensive coverage, by counting through each member's defensive profile versus `poketype.rank_teams(...)`.
+
+Teams are drawn at random from the 171 single and dual typings, for each type chart revision.
+The per-member loop is timed on a sample and extrapolated.
+
+Usage:
+    python benchmarks/team_benchmark.py [teams]
+'''
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+from objects.type.TypeChart import TypeChart
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    typings = [[TypeChart.name(type) for type in typing if type >= 0] for typing in TypeChart.typings()]
+    teams = [[rng.choice(typings) for _ in range(6)] for _ in range(count)]
+
+    for generation in (8, 4, 1):
+        # Warm up, so one-off work (such as building the masks) isn't counted.
+        poketype.rank_teams(teams[:1], generation=generation)
+        start = time.perf_counter()
+        ranked = poketype.rank_teams(teams, count=10, generation=generation)
+        fast = time.perf_counter() - start
+
+        # Score a sample of the teams the slow way, checking it agrees with the analyser.
+        sample = teams[:min(count, 2000)]
+        start = time.perf_counter()
+        scores = []
+        for team in sample:
+            profiles = [poketype.get_defensive_profile(member, generation=generation) for member in team]
+            score = 0
+            for type in TypeChart.TYPES:
+                weak = sum(1 for profile in profiles if profile[type] > 1.0)
+                resisting = sum(1 for profile in profiles if profile[type] < 1.0)
+                score += resisting - weak - (weak >= 2) - (resisting == 0)
+            scores.append(score)
+        slow = (time.perf_counter() - start) / len(sample) * count
+        assert scores == [score for _, score in sorted(poketype.rank_teams(sample, generation=generation))]
+
+        print(f"generation {generation}   {count} teams   best score {ranked[0][1]:>3}   profiles ~{slow:>7.2f}s (extrapolated)   rank_teams {fast:>7.3f}s   {slow / fast:>5.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+'''
+Benchmark: per-call latency of `poketype.run_calculations(...)`.
+
+Times a fixed workload of single- and dual-type opponents, each against a four-move moveset with STAB, for each type chart revision, with and without the results cache, and with and without abilities.
+The workload repeats its queries, like a bot asking about the same matchups throughout a battle.
+Then times a full defensive profile (all 18 attacking types) of every typing, computed from the chart versus read from the precomputed profiles.
+Run it on an older checkout to compare implementations.
+
+Usage:
+    python benchmarks/type_benchmark.py [calls]
+'''
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poketype
+
+TYPES = ["normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel", "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy"]
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Every typing, cycled with a rotating moveset and user typing.
+    typings = [[type] for type in TYPES] + [list(pair) for pair in itertools.combinations(TYPES, 2)]
+    workload = [
+        (typings[index % len(typings)], [TYPES[(index + offset) % len(TYPES)] for offset in (0, 5, 9, 13)], [TYPES[index % len(TYPES)]])
+        for index in range(calls)
+    ]
+    # The same workload, with abilities on both sides.
+    abilities = [(["adaptability", "tinted-lens", ""][index % 3], ["levitate", "thick-fat", "wonder-guard", "filter", "flash-fire", ""][index % 6]) for index in range(calls)]
+    for generation in (8, 4, 1):
+        # Timed with the cache disabled (with and without abilities), then with it enabled (where the workload's repeated queries are lookups).
+        for size, label, with_abilities in ((0, "uncached", False), (0, "uncached + abilities", True), (poketype.CACHE_SIZE, "cached", False)):
+            poketype.configure_cache(size)
+            # Warm up, so one-off work (such as compiling a chart) isn't counted.
+            poketype.run_calculations(user=workload[0][2], opponent=workload[0][0], moves=workload[0][1], generation=generation)
+            start = time.perf_counter()
+            if with_abilities:
+                for (opponent, moves, user), (user_ability, opponent_ability) in zip(workload, abilities):
+                    poketype.run_calculations(user=user, opponent=opponent, moves=moves, generation=generation, user_ability=user_ability, opponent_ability=opponent_ability)
+            else:
+                for opponent, moves, user in workload:
+                    poketype.run_calculations(user=user, opponent=opponent, moves=moves, generation=generation)
+            elapsed = time.perf_counter() - start
+            info = poketype.get_cache_info()
+            print(f"generation {generation}   {label:<20}   {elapsed / calls * 1e6:>8.2f} us/call   {calls / elapsed:>10.0f} calls/s   {info.hits} hits   {info.misses} misses")
+    poketype.configure_cache()
+
+    chart = poketype.get_type_chart(8)
+    typings = chart.typings()
+    chart.defensive_profile(0)
+    rounds = max(1, calls // len(typings))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for typing in typings:
+            defending = [type for type in typing if type >= 0]
+            tuple(chart.effectiveness(attacking, defending) for attacking in range(chart.SIZE))
+    computed = (time.perf_counter() - start) / (rounds * len(typings))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for primary, secondary in typings:
+            chart.defensive_profile(primary, secondary)
+    cached = (time.perf_counter() - start) / (rounds * len(typings))
+    print(f"defensive profile   computed {computed * 1e6:>6.2f} us   precomputed {cached * 1e6:>6.2f} us   {computed / cached:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    # aiohttp is only needed by the async data layer. We'll just set the variable to None, and handle it when a session is created.
+    aiohttp = None
+
+from objects.api.PokeCache import PokeCache
+from objects.api.PokeHealth import APIUnavailableError, PokeHealth
+from objects.api.PokeProjection import PokeProjection
+from objects.api.PokeSession import PokeSession
+from objects.api.PokeSnapshot import SnapshotMissError
+from objects.Logger import Logger
+
+class AsyncPokeSession:
+    '''
+    An asyncio HTTP client for the PokeAPI, built on aiohttp.
+
+    The async counterpart of PokeSession: requests share keep-alive connections, consult the same persistent PokeCache, and report to the same PokeHealth circuit breaker.
+    By default, the base URL, cache and health monitor are taken from the default PokeSession, so sync and async code share state.
+    The default session's snapshot and offline mode are honoured too.
+
+    At most `concurrency` requests are in flight at once, and concurrent requests for the same URL are merged into a single request.
+    The snapshot and cache are SQLite-backed and synchronous, so they're read and written on worker threads, keeping the event loop free while they're used.
+
+    Usage:
+        async with AsyncPokeSession(concurrency=32) as session:
+            data = await session.fetch(url)
+    '''
+
+    def __init__(self, concurrency : int = 16, base_url : str = "", timeout : float = 15, cache : PokeCache | None | str = "default", health : PokeHealth | None = None, logger : Logger = Logger.no_logger()):
+        if aiohttp is None:
+            raise ImportError("The async data layer requires the 'aiohttp' package. Please install it (pip install aiohttp) and try again.")
+        shared = PokeSession.default_session()
+        self.base_url = base_url if base_url != "" else shared.base_url
+        if not self.base_url.endswith("/"):
+            self.base_url += "/"
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # "default" shares the default session's cache, None disables caching.
+        self.cache = shared.cache if cache == "default" else cache
+        self.health = health if health is not None else shared.health
+        self.snapshot = shared.snapshot
+        self.offline = shared.offline
+        self.logger = logger
+
+        self._session = None
+        self._semaphore = None
+        # URL -> task, so concurrent requests for the same resource share one request.
+        self._inflight = {}
+
+    async def fetch(self, url : str, logger : Logger | None = None, fields : tuple = ()) -> dict:
+        '''
+        Retrieve the JSON data of an API resource.
+
+        The snapshot (if any) is consulted first, then the cache, and the network is only used on a miss.
+        If the same resource is already being fetched, this waits for that request instead of sending another.
+        When `fields` is given, only those top-level fields (plus the ID and name) are returned, as with PokeSession.fetch().
+
+        Arguments:
+            url (str): The URL of the resource.
+            logger (Logger | None): The logger to route request failures to. Defaults to the session's logger.
+            fields (tuple[str]): The top-level fields to return. If empty, the whole resource is returned.
+        Returns:
+            dict: The JSON data of the resource.
+        Raises:
+            APIUnavailableError: If the API is known to be unreachable.
+            SnapshotMissError: If the session is offline and the resource is not in the snapshot.
+            aiohttp.ClientResponseError: If the request fails.
+        '''
+        key = PokeSession.canonical_url(url)
+        if self.snapshot is not None:
+            data = await asyncio.to_thread(self.snapshot.get, key, fields)
+            if data is not None:
+                return data
+        if self.offline:
+            raise SnapshotMissError(f"'{url}' is not in the snapshot, and the session is in offline mode.")
+        if self.cache is not None:
+            data = await asyncio.to_thread(self.cache.get, key, fields)
+            if data is not None:
+                return data
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__request(url, key, logger if logger is not None else self.logger))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared request, so one cancelled waiter doesn't cancel it for the others.
+        return PokeProjection.project(await asyncio.shield(task), fields)
+
+    def resource_url(self, resource : str, identifier : str | int) -> str:
+        '''
+        Build the URL of a single API resource.
+
+        Arguments:
+            resource (str): The resource type, e.g. 'pokemon' or 'ability'.
+            identifier (str | int): The name or ID of the resource.
+        Returns:
+            str: The URL of the resource.
+        '''
+        return f"{self.base_url}{resource}/{identifier}"
+
+    async def close(self):
+        '''
+        Close the session and every pooled connection it holds.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def __request(self, url : str, key : str, logger : Logger) -> dict:
+        '''
+        Internal method for sending a single request, bounded by the concurrency limit.
+
+        Arguments:
+            url (str): The URL of the resource.
+            key (str): The canonical URL of the resource.
+            logger (Logger): The logger to route request failures to.
+        Returns:
+            dict: The JSON data of the resource.
+        '''
+        if self._session is None:
+            # aiohttp sessions must be created inside a running event loop, so this is done on first use.
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            if not self.health.allow_request():
+                raise APIUnavailableError(f"The PokeAPI is currently unreachable, request to '{url}' was not sent.")
+            try:
+                async with self._session.get(url) as response:
+                    # Server errors count against reachability, anything else (including 404) proves the API is up.
+                    if response.status >= 500:
+                        self.health.record_failure()
+                    else:
+                        self.health.record_success()
+                    logger.route(response.raise_for_status, raise_exceptions=True)  # type: ignore
+                    data = await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.health.record_failure()
+                raise
+            except BaseException:
+                # Anything else (e.g. a response that isn't JSON, or cancellation) must not leave a half-open probe outstanding. Once the outcome is recorded, this changes nothing.
+                self.health.record_abandoned()
+                raise
+
+        if self.cache is not None:
+            aliases = PokeSession.resource_aliases(key, data)
+            await asyncio.to_thread(self.cache.put, aliases[0] if len(aliases) != 0 else key, data, aliases=[key] + aliases)
+        return data
@@ -0,0 +1,241 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from objects.api.PokeProjection import PokeProjection
+from objects.Logger import Logger
+
+class PokeCache:
+    '''
+    A persistent, on-disk cache of PokeAPI responses.
+
+    Responses are stored in a SQLite database keyed by their canonical resource URL, compressed with zlib.
+    Bodies carry a PokeProjection field index, so a hit can decode just the fields the caller asked for.
+    PokeAPI resources are effectively immutable, so entries are kept for a long time-to-live, and the least recently used entries are evicted once the cache grows beyond its size limit.
+
+    The database is only opened on first use, so creating a PokeCache is free.
+    '''
+
+    # The process-wide default cache, and the lock guarding its creation.
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path : str, ttl : float = 30 * 24 * 60 * 60, max_bytes : int = 256 * 1024 * 1024, logger : Logger = Logger.no_logger()):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logger
+
+        self._connection = None
+        self._size = 0
+        # Set when the database cannot be opened, so a broken cache is skipped rather than retried on every request.
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def get(self, url : str, fields : tuple = ()) -> dict | None:
+        '''
+        Retrieve a cached response.
+
+        Expired entries are treated as missing. A hit marks the entry as recently used.
+
+        Arguments:
+            url (str): The canonical URL of the resource.
+            fields (tuple[str]): The top-level fields to decode. If empty, the whole response is decoded.
+        Returns:
+            dict | None: The cached JSON data, or None if the resource is not cached.
+        '''
+        with self._lock:
+            connection = self.__connect()
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT entries.url, entries.body, entries.stored_at FROM aliases JOIN entries ON entries.url = aliases.target WHERE aliases.alias = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            target, body, stored_at = row
+            now = time.time()
+            if self.ttl > 0 and now - stored_at > self.ttl:
+                # The entry has expired. Remove it now so it stops counting towards the size limit.
+                self.__delete(connection, target)
+                return None
+            connection.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, target))
+        return PokeProjection.loads(zlib.decompress(body), fields)
+
+    def put(self, url : str, data : dict, aliases : list = []):
+        '''
+        Store a response in the cache.
+
+        Aliases are other URLs resolving to the same resource (e.g. the name-based and ID-based URL of a Pokemon), and are answered from the same entry.
+
+        Arguments:
+            url (str): The canonical URL of the resource.
+            data (dict): The JSON data of the response.
+            aliases (list[str]): Other canonical URLs of the same resource.
+        Returns:
+            None
+        '''
+        body = zlib.compress(PokeProjection.dumps(data))
+        now = time.time()
+        with self._lock:
+            connection = self.__connect()
+            if connection is None:
+                return
+            previous = connection.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (url, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (url, body, len(body), now, now),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO aliases (alias, target) VALUES (?, ?)",
+                [(alias, url) for alias in set([url] + list(aliases))],
+            )
+            self._size += len(body) - (previous[0] if previous is not None else 0)
+            if self._size > self.max_bytes:
+                self.__evict(connection)
+
+    def clear(self):
+        '''
+        Remove every entry from the cache.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            connection = self.__connect()
+            if connection is None:
+                return
+            connection.execute("DELETE FROM aliases")
+            connection.execute("DELETE FROM entries")
+            self._size = 0
+
+    def size(self) -> int:
+        '''
+        Retrieve the total size of all cached (compressed) responses.
+
+        Arguments:
+            None
+        Returns:
+            int: The size of the cache, in bytes.
+        '''
+        with self._lock:
+            self.__connect()
+            return self._size
+
+    def close(self):
+        '''
+        Close the underlying database. It will be re-opened if the cache is used again.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __connect(self) -> sqlite3.Connection | None:
+        '''
+        Internal method for opening the database on first use.
+
+        Must be called with the lock held.
+
+        Arguments:
+            None
+        Returns:
+            sqlite3.Connection | None: The open connection, or None if the cache could not be opened.
+        '''
+        if self._connection is not None or self._disabled:
+            return self._connection
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; every statement is its own small transaction.
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            connection.execute("CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, target TEXT NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS aliases_target ON aliases (target)")
+            self._size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warn(f"Response cache at '{self.path}' could not be opened and has been disabled: {e}")
+            self._disabled = True
+            return None
+        self._connection = connection
+        return connection
+
+    def __delete(self, connection : sqlite3.Connection, url : str):
+        '''
+        Internal method for removing a single entry and its aliases.
+
+        Must be called with the lock held.
+
+        Arguments:
+            connection (sqlite3.Connection): The open connection.
+            url (str): The canonical URL of the entry.
+        Returns:
+            None
+        '''
+        row = connection.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return
+        connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+        connection.execute("DELETE FROM aliases WHERE target = ?", (url,))
+        self._size -= row[0]
+
+    def __evict(self, connection : sqlite3.Connection):
+        '''
+        Internal method for evicting the least recently used entries until the cache is back under its size limit.
+
+        Eviction frees down to 90% of the limit, so a full cache doesn't evict on every single insert.
+        Must be called with the lock held.
+
+        Arguments:
+            connection (sqlite3.Connection): The open connection.
+        Returns:
+            None
+        '''
+        # Other processes may share the database, so start from the real total rather than our running count.
+        self._size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = self.max_bytes * 0.9
+        while self._size > target:
+            rows = connection.execute("SELECT url, size FROM entries ORDER BY accessed_at LIMIT 64").fetchall()
+            if len(rows) == 0:
+                break
+            for url, size in rows:
+                connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+                connection.execute("DELETE FROM aliases WHERE target = ?", (url,))
+                self._size -= size
+                if self._size <= target:
+                    break
+        self.logger.debug(f"Response cache evicted down to {self._size} bytes")
+
+    @staticmethod
+    def default_cache():
+        '''
+        Retrieve the default cache, stored in the user's cache directory.
+
+        The location follows $XDG_CACHE_HOME when set, and is `~/.cache/pokesuite/responses.sqlite3` otherwise.
+
+        Arguments:
+            None
+        Returns:
+            PokeCache: The default cache.
+        '''
+        if PokeCache._default is None:
+            with PokeCache._default_lock:
+                # Check again, another thread may have created the cache while we waited for the lock.
+                if PokeCache._default is None:
+                    root = os.environ.get("XDG_CACHE_HOME", "") or os.path.join("~", ".cache")
+                    PokeCache._default = PokeCache(os.path.join(root, "pokesuite", "responses.sqlite3"))
+        return PokeCache._default
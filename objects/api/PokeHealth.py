@@ -0,0 +1,155 @@
+import threading
+import time
+from requests.exceptions import ConnectionError as RequestConnectionError
+
+from objects.Logger import Logger
+
+class APIUnavailableError(RequestConnectionError):
+    '''
+    Raised instead of sending a request while the PokeAPI is known to be unreachable.
+
+    Subclasses requests' ConnectionError, so callers already handling connection failures handle this too.
+    '''
+    pass
+
+class PokeHealth:
+    '''
+    Passive reachability tracking for the PokeAPI, in the form of a circuit breaker.
+
+    Rather than spending a request to test the connection, PokeHealth watches the outcome of real requests:
+        - 'closed': The API is reachable. Every request is allowed.
+        - 'open': Too many consecutive requests failed. Requests are refused without touching the network until the reset timeout passes.
+        - 'half-open': The reset timeout has passed. A single request is let through as a probe; its success closes the circuit again, its failure re-opens it.
+
+    Only connection failures, timeouts and server errors (5xx) count as failures. A 404 still proves the API is reachable.
+    '''
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold : int = 3, reset_timeout : float = 30.0, logger : Logger = Logger.no_logger()):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.logger = logger
+
+        self._state = PokeHealth.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # Whether the half-open probe request is currently in flight, and when it was sent.
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def get_state(self) -> str:
+        '''
+        Retrieve the current state of the circuit.
+
+        An open circuit whose reset timeout has passed is reported as 'half-open', as the next request will be allowed through as a probe.
+
+        Arguments:
+            None
+        Returns:
+            str: One of 'closed', 'open' or 'half-open'.
+        '''
+        with self._lock:
+            if self._state == PokeHealth.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return PokeHealth.HALF_OPEN
+            return self._state
+
+    def is_available(self) -> bool:
+        '''
+        Check whether the API is believed to be reachable, without sending a request.
+
+        Arguments:
+            None
+        Returns:
+            bool: False if the circuit is open, True otherwise.
+        '''
+        return self.get_state() != PokeHealth.OPEN
+
+    def allow_request(self) -> bool:
+        '''
+        Decide whether a request may be sent.
+
+        Callers that are allowed through must report the outcome with `record_success()` or `record_failure()`, or `record_abandoned()` if the request ended without one.
+
+        Arguments:
+            None
+        Returns:
+            bool: True if the request may be sent, False if it should be refused.
+        '''
+        with self._lock:
+            if self._state == PokeHealth.CLOSED:
+                return True
+            if self._state == PokeHealth.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                # Reset timeout has passed, let this request through as the probe.
+                self._state = PokeHealth.HALF_OPEN
+                self.logger.info("PokeAPI circuit half-open, probing with the next request")
+            elif self._probing and time.monotonic() - self._probe_started < self.reset_timeout:
+                # Half-open with a probe already in flight. Only one probe at a time, unless the last one never reported back.
+                return False
+            self._probing = True
+            self._probe_started = time.monotonic()
+            return True
+
+    def record_success(self):
+        '''
+        Report a request that reached the API.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            if self._state != PokeHealth.CLOSED:
+                self.logger.info("PokeAPI reachable again, circuit closed")
+            self._state = PokeHealth.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        '''
+        Report a request that failed to reach the API.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            self._failures += 1
+            if self._state == PokeHealth.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != PokeHealth.OPEN:
+                    self.logger.warn(f"PokeAPI unreachable after {self._failures} failed request(s), circuit opened")
+                self._state = PokeHealth.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_abandoned(self):
+        '''
+        Report a request that was allowed through but ended without showing whether the API is reachable, e.g. because it raised an unexpected error or was cancelled.
+
+        Neither counts as a success nor a failure, but a half-open probe ending this way frees the way for the next one.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            self._probing = False
+
+    def reset(self):
+        '''
+        Forget all failures and close the circuit.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        self.record_success()
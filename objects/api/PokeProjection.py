@@ -0,0 +1,87 @@
+import json
+
+class PokeProjection:
+    '''
+    Helpers for storing API documents so that a subset of their top-level fields can be decoded on its own.
+
+    Documents are stored as an index line followed by the compact JSON of the document, e.g.
+        {"id":[1,7],"name":[13,24]}\\n{"id":25,"name":"pikachu"}
+    where the index maps each top-level key to the byte range of its value.
+    Decoding a projection then only decodes the requested values, skipping every other subtree without parsing it (the `moves` of a popular Pokemon are most of its document).
+
+    Bodies without an index (e.g. cached before the index was introduced) are still understood; they are decoded in full and projected afterwards.
+    '''
+
+    # Fields every projection keeps, as they are needed to identify and register the resource.
+    IDENTITY_FIELDS = ("id", "name")
+
+    @staticmethod
+    def dumps(data : dict) -> bytes:
+        '''
+        Encode a document with its field index.
+
+        Arguments:
+            data (dict): The JSON data of the resource.
+        Returns:
+            bytes: The encoded document.
+        '''
+        parts = []
+        index = {}
+        # Each value is encoded separately, so its position in the document is known as it is written.
+        offset = 1
+        for key, value in data.items():
+            member = json.dumps(key) + ":"
+            encoded = json.dumps(value, separators=(",", ":"))
+            start = offset + len(member.encode())
+            index[key] = [start, start + len(encoded.encode())]
+            parts.append(member + encoded)
+            offset += len(parts[-1].encode()) + 1
+        document = "{" + ",".join(parts) + "}"
+        return json.dumps(index, separators=(",", ":")).encode() + b"\n" + document.encode()
+
+    @staticmethod
+    def loads(body : bytes, fields : tuple = ()) -> dict:
+        '''
+        Decode a document, or only some of its top-level fields.
+
+        Arguments:
+            body (bytes): The encoded document, with or without a field index.
+            fields (tuple[str]): The top-level fields to decode. If empty, the whole document is decoded. The ID and name are always decoded.
+        Returns:
+            dict: The decoded document, containing only the requested fields that it has.
+        '''
+        header, newline, document = body.partition(b"\n")
+        if newline == b"":
+            # A plain JSON body, without a field index.
+            return PokeProjection.project(json.loads(header), fields)
+        if len(fields) == 0:
+            return json.loads(document)
+        index = json.loads(header)
+        return {key: json.loads(document[index[key][0]:index[key][1]]) for key in PokeProjection.__wanted(fields) if key in index}
+
+    @staticmethod
+    def project(data : dict, fields : tuple = ()) -> dict:
+        '''
+        Project an already-decoded document onto some of its top-level fields.
+
+        Arguments:
+            data (dict): The JSON data of the resource.
+            fields (tuple[str]): The top-level fields to keep. If empty, the document is returned as-is. The ID and name are always kept.
+        Returns:
+            dict: The projected document.
+        '''
+        if len(fields) == 0:
+            return data
+        return {key: data[key] for key in PokeProjection.__wanted(fields) if key in data}
+
+    @staticmethod
+    def __wanted(fields : tuple) -> list:
+        '''
+        Internal helper function listing the fields a projection decodes, identity fields first.
+
+        Arguments:
+            fields (tuple[str]): The requested fields.
+        Returns:
+            list[str]: The fields to decode, without duplicates.
+        '''
+        return list(dict.fromkeys(PokeProjection.IDENTITY_FIELDS + tuple(fields)))
@@ -0,0 +1,166 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+from objects.api.PokeSession import PokeSession
+
+class PokeRegistry:
+    '''
+    An in-process identity map of loaded data objects.
+
+    Data objects register themselves under every canonical URL they can be reached by (the requested URL, and the ID- and name-based URLs of the resource).
+    Constructing the same resource again, by name or by URL, then returns the already-loaded object instead of fetching it a second time.
+    The first object registered for a resource keeps it: a second object loaded under another of its URLs (e.g. by ID while the first was loaded by name) is mapped onto the first.
+    Loads of the same URL can also hold `loading(url)`, so concurrent loads wait for the first rather than each fetching the resource.
+
+    The registry holds strong references to the most recently used objects, up to `max_size` of them.
+    Objects evicted from that LRU remain reachable through weak references for as long as something else keeps them alive.
+    '''
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_size : int = 2048):
+        self.max_size = max_size
+
+        # Primary key -> object, in least to most recently used order.
+        self._recent = OrderedDict()
+        # Primary key -> object, for objects still alive outside of the registry.
+        self._alive = weakref.WeakValueDictionary()
+        # Canonical URL -> primary key.
+        self._aliases = {}
+        # Canonical URL -> the lock held while it's being loaded, kept only while someone holds it.
+        self._loading = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, url : str) -> Any:
+        '''
+        Retrieve the loaded object for a resource URL.
+
+        Arguments:
+            url (str): Any URL of the resource.
+        Returns:
+            Any: The loaded object, or None if the resource has not been loaded.
+        '''
+        canonical = PokeSession.canonical_url(url)
+        with self._lock:
+            key = self._aliases.get(canonical)
+            if key is None:
+                return None
+            obj = self._recent.get(key)
+            if obj is not None:
+                self._recent.move_to_end(key)
+                return obj
+            obj = self._alive.get(key)
+            if obj is None:
+                # The object has been garbage collected; forget its aliases lazily.
+                del self._aliases[canonical]
+                return None
+            # Still alive elsewhere, promote it back into the LRU.
+            self.__remember(key, obj)
+            return obj
+
+    def register(self, obj : Any, url : str, aliases : list = []) -> Any:
+        '''
+        Register a loaded object.
+
+        If another object is already registered under any of the URLs, it keeps the resource, and every URL is mapped to it instead.
+
+        Arguments:
+            obj (Any): The loaded object.
+            url (str): The URL the object was loaded from.
+            aliases (list[str]): Other URLs of the same resource, such as the ID- and name-based URLs.
+        Returns:
+            Any: The object registered for the resource: `obj`, or the object registered before it.
+        '''
+        canonical = [PokeSession.canonical_url(alias) for alias in [url] + list(aliases)]
+        with self._lock:
+            # Re-registering an object (e.g. once a lazy object has loaded) keeps its existing key, as does registering a second object for the same resource.
+            key = None
+            for alias in canonical:
+                registered = self._alive.get(self._aliases.get(alias, ""))
+                if registered is not None:
+                    key, obj = self._aliases[alias], registered
+                    break
+            if key is None:
+                # The first alias is the ID-based URL when known, which is the most stable key.
+                key = canonical[1] if len(canonical) > 1 else canonical[0]
+            for alias in canonical:
+                self._aliases[alias] = key
+            self._alive[key] = obj
+            self.__remember(key, obj)
+            return obj
+
+    def loading(self, url : str) -> threading.Lock:
+        '''
+        Retrieve the lock to hold while loading a resource, so concurrent loads of the same URL wait for the first instead of each fetching it.
+
+        Usage:
+            with registry.loading(url):
+                obj = registry.get(url)
+                if obj is None:
+                    ...  # load and register it
+
+        Arguments:
+            url (str): Any URL of the resource.
+        Returns:
+            threading.Lock: The lock, shared by everyone loading the same canonical URL at the same time.
+        '''
+        canonical = PokeSession.canonical_url(url)
+        with self._lock:
+            lock = self._loading.get(canonical)
+            if lock is None:
+                lock = threading.Lock()
+                self._loading[canonical] = lock
+            return lock
+
+    def clear(self):
+        '''
+        Forget every registered object.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            self._recent.clear()
+            self._alive.clear()
+            self._aliases.clear()
+
+    def __len__(self) -> int:
+        return len(self._alive)
+
+    def __remember(self, key : str, obj : Any):
+        '''
+        Internal method for placing an object at the most recently used end of the LRU, evicting the least recently used if full.
+
+        Must be called with the lock held.
+
+        Arguments:
+            key (str): The primary key of the object.
+            obj (Any): The object.
+        Returns:
+            None
+        '''
+        self._recent[key] = obj
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+
+    @staticmethod
+    def default_registry():
+        '''
+        Retrieve the process-wide default registry, creating it on first use.
+
+        Arguments:
+            None
+        Returns:
+            PokeRegistry: The default registry.
+        '''
+        if PokeRegistry._default is None:
+            with PokeRegistry._default_lock:
+                if PokeRegistry._default is None:
+                    PokeRegistry._default = PokeRegistry()
+        return PokeRegistry._default
@@ -0,0 +1,278 @@
+import os
+import threading
+from typing import Any
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestConnectionError, Timeout
+
+from objects.api.PokeCache import PokeCache
+from objects.api.PokeHealth import APIUnavailableError, PokeHealth
+from objects.api.PokeProjection import PokeProjection
+from objects.Logger import Logger
+
+class PokeSession:
+    '''
+    A connection-pooled HTTP client for the PokeAPI.
+
+    Every data object (PokeData, PokeAbilityData, ...) routes its requests through a PokeSession rather than calling `requests.get` directly.
+    This lets connections be kept alive and re-used between objects, so only the first request to the API pays for the TCP + TLS handshake.
+
+    A single process-wide session is available through `PokeSession.default_session()`, and can be reconfigured with `PokeSession.configure(...)`.
+
+    JSON responses fetched through `fetch()` are kept in a persistent PokeCache (the default cache unless configured otherwise), so a resource is only downloaded once.
+    Pass `cache=None` to disable caching.
+
+    Every request also reports its outcome to the session's PokeHealth circuit breaker, so API reachability is known without test requests.
+    While the API is unreachable, requests fail immediately with an APIUnavailableError instead of waiting on the network.
+
+    A PokeSnapshot can be attached to serve resources from a local artifact before anything else. In offline mode, nothing is ever sent to the network, and resources missing from the snapshot raise a SnapshotMissError.
+    '''
+
+    # The process-wide default session, and the lock guarding its creation.
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, base_url : str = "https://pokeapi.co/api/v2/", pool_connections : int = 4, pool_maxsize : int = 16, timeout : float | tuple = (3.05, 15), max_retries : int = 0, keep_alive : bool = True, cache : PokeCache | None | str = "default", health : PokeHealth | None = None, snapshot : Any = None, offline : bool = False, logger : Logger = Logger.no_logger()):
+        # Base URL always ends in a slash, so resources can simply be appended to it.
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        # "default" is resolved here rather than in the signature, so importing this module doesn't open the cache, and the default cache at construction time is used.
+        self.cache = PokeCache.default_cache() if cache == "default" else cache
+        self.health = health if health is not None else PokeHealth(logger=logger)
+        # A PokeSnapshot (or None). Typed as Any, as PokeSnapshot itself depends on this module.
+        self.snapshot = snapshot
+        self.offline = offline
+        self.logger = logger
+
+        self.session = requests.Session()
+        # The adapter owns the connection pools. pool_connections is the number of hosts to keep pools for, pool_maxsize the number of connections per host.
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            # Ask the server to close every connection after the response, disabling re-use.
+            self.session.headers["Connection"] = "close"
+
+    def get(self, url : str, **kwargs) -> requests.Response:
+        '''
+        Send a GET request through the pooled session.
+
+        The session's default timeout is applied unless a timeout is passed explicitly.
+        The outcome is reported to the session's health monitor; while the API is known to be unreachable no request is sent at all.
+
+        Arguments:
+            url (str): The URL to request.
+            **kwargs: Keyword arguments passed through to `requests.Session.get`.
+        Returns:
+            requests.Response: The response of the request.
+        Raises:
+            APIUnavailableError: If the API is known to be unreachable, or the session is offline.
+        '''
+        if self.offline:
+            raise APIUnavailableError(f"The session is in offline mode, request to '{url}' was not sent.")
+        if not self.health.allow_request():
+            raise APIUnavailableError(f"The PokeAPI is currently unreachable, request to '{url}' was not sent.")
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.get(url, **kwargs)
+        except (RequestConnectionError, Timeout):
+            self.health.record_failure()
+            raise
+        except BaseException:
+            # Anything else (e.g. an invalid URL) says nothing about reachability, but mustn't leave a half-open probe outstanding.
+            self.health.record_abandoned()
+            raise
+        # Server errors count against reachability, anything else (including 404) proves the API is up.
+        if response.status_code >= 500:
+            self.health.record_failure()
+        else:
+            self.health.record_success()
+        return response
+
+    def fetch(self, url : str, logger : Logger = Logger.no_logger(), fields : tuple = ()) -> dict:
+        '''
+        Retrieve the JSON data of an API resource.
+
+        The snapshot (if any) is consulted first, then the cache, and the network is only used on a miss.
+        Successful responses are stored in the cache under the resource's ID-based URL, with the requested and name-based URLs as aliases.
+
+        When `fields` is given, snapshot and cache hits only decode those top-level fields (plus the ID and name), skipping the rest of the document.
+        Network responses are always stored in full, then projected.
+
+        Arguments:
+            url (str): The URL of the resource.
+            logger (Logger): The logger to route request failures to.
+            fields (tuple[str]): The top-level fields to return. If empty, the whole resource is returned.
+        Returns:
+            dict: The JSON data of the resource.
+        Raises:
+            HTTPError: If the request fails.
+            SnapshotMissError: If the session is offline and the resource is not in the snapshot.
+        '''
+        key = PokeSession.canonical_url(url)
+        if self.snapshot is not None:
+            data = self.snapshot.get(key, fields)
+            if data is not None:
+                return data
+        if self.offline:
+            # Imported here, as PokeSnapshot depends on this module.
+            from objects.api.PokeSnapshot import SnapshotMissError
+            raise SnapshotMissError(f"'{url}' is not in the snapshot, and the session is in offline mode.")
+        if self.cache is not None:
+            data = self.cache.get(key, fields)
+            if data is not None:
+                return data
+
+        request = self.get(url)
+        # Raise an exception if the request fails.
+        logger.route(request.raise_for_status, raise_exceptions=True)  # type: ignore
+        data = request.json()
+
+        if self.cache is not None:
+            aliases = PokeSession.resource_aliases(key, data)
+            self.cache.put(aliases[0] if len(aliases) != 0 else key, data, aliases=[key] + aliases)
+        return PokeProjection.project(data, fields)
+
+    def resource_url(self, resource : str, identifier : str | int) -> str:
+        '''
+        Build the URL of a single API resource.
+
+        Arguments:
+            resource (str): The resource type, e.g. 'pokemon' or 'ability'.
+            identifier (str | int): The name or ID of the resource.
+        Returns:
+            str: The URL of the resource.
+        '''
+        return f"{self.base_url}{resource}/{identifier}"
+
+    def close(self):
+        '''
+        Close the session and every pooled connection it holds.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        self.session.close()
+
+    @staticmethod
+    def canonical_url(url : str) -> str:
+        '''
+        Normalise a resource URL, so equivalent URLs compare equal.
+
+        The path is lowercased and always ends in a slash, matching the URLs the PokeAPI itself links to.
+
+        Arguments:
+            url (str): The URL to normalise.
+        Returns:
+            str: The canonical URL.
+        '''
+        path, _, query = url.strip().partition("?")
+        path = path.lower()
+        if not path.endswith("/"):
+            path += "/"
+        return path + ("?" + query if query else "")
+
+    @staticmethod
+    def split_url(url : str) -> tuple:
+        '''
+        Split a resource URL into its resource type and identifier.
+
+        For example, '.../api/v2/pokemon/25/' is split into ('pokemon', '25').
+
+        Arguments:
+            url (str): The URL to split.
+        Returns:
+            tuple[str, str]: The resource type and identifier (name or ID), or two empty strings if the URL is not a single resource.
+        '''
+        parts = PokeSession.canonical_url(url).partition("?")[0].rstrip("/").split("/")
+        if len(parts) < 2 or parts[-2] in ("", "v2"):
+            return ("", "")
+        return (parts[-2], parts[-1])
+
+    @staticmethod
+    def identity_fields(url : str, known : dict = {}) -> dict:
+        '''
+        Work out which identifying fields of a resource are known without fetching it.
+
+        Arguments:
+            url (str): The URL of the resource. A name-based URL gives away the name, an ID-based URL the ID.
+            known (dict): Fields passed in by the caller, which take priority. Empty values are ignored.
+        Returns:
+            dict: The known fields.
+        '''
+        fields = {}
+        identifier = PokeSession.split_url(url)[1]
+        if identifier.isdigit(): fields["id"] = int(identifier)
+        elif identifier != "": fields["name"] = identifier
+        fields.update({key: value for key, value in known.items() if value not in ("", None)})
+        return fields
+
+    @staticmethod
+    def resource_aliases(url : str, data : dict) -> list:
+        '''
+        List the canonical URLs a fetched resource can be reached by.
+
+        The ID-based URL is always listed first, followed by the name-based URL.
+
+        Arguments:
+            url (str): The URL the resource was fetched from.
+            data (dict): The JSON data of the resource.
+        Returns:
+            list[str]: The canonical URLs of the resource, or an empty list if the data does not describe a single resource.
+        '''
+        resource, identifier = PokeSession.split_url(url)
+        if resource == "" or "id" not in data:
+            return []
+        canonical = PokeSession.canonical_url(url)
+        base = canonical[:canonical.rfind(f"/{resource}/{identifier}/") + 1]
+        aliases = [f"{base}{resource}/{data['id']}/"]
+        if data.get("name"):
+            aliases.append(PokeSession.canonical_url(f"{base}{resource}/{data['name']}"))
+        return aliases
+
+    @staticmethod
+    def default_session():
+        '''
+        Retrieve the process-wide default session, creating it on first use.
+
+        If the POKESUITE_SNAPSHOT environment variable is set, the default session serves from the snapshot at that path in offline mode.
+
+        Arguments:
+            None
+        Returns:
+            PokeSession: The default session.
+        '''
+        if PokeSession._default is None:
+            with PokeSession._default_lock:
+                # Check again, another thread may have created the session while we waited for the lock.
+                if PokeSession._default is None:
+                    snapshot_path = os.environ.get("POKESUITE_SNAPSHOT", "")
+                    if snapshot_path != "":
+                        # Imported here, as PokeSnapshot depends on this module.
+                        from objects.api.PokeSnapshot import PokeSnapshot
+                        PokeSession._default = PokeSession(snapshot=PokeSnapshot(snapshot_path), offline=True)
+                    else:
+                        PokeSession._default = PokeSession()
+        return PokeSession._default
+
+    @staticmethod
+    def configure(**kwargs):
+        '''
+        Replace the process-wide default session with a newly configured one.
+
+        Accepts the same keyword arguments as the PokeSession constructor (e.g. `configure(pool_maxsize=32, timeout=5)`).
+        The previous default session, if any, is closed.
+
+        Arguments:
+            **kwargs: Keyword arguments passed to the PokeSession constructor.
+        Returns:
+            PokeSession: The new default session.
+        '''
+        with PokeSession._default_lock:
+            previous = PokeSession._default
+            PokeSession._default = PokeSession(**kwargs)
+        if previous is not None:
+            previous.close()
+        return PokeSession._default
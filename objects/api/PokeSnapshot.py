@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from objects.api.PokeProjection import PokeProjection
+from objects.api.PokeSession import PokeSession
+from objects.Logger import Logger
+
+class SnapshotMissError(LookupError):
+    '''
+    Raised in offline mode when a resource is not in the snapshot.
+    '''
+    pass
+
+class PokeSnapshot:
+    '''
+    A local, read-only snapshot of the PokeAPI resources used by PokeSuite.
+
+    A snapshot is a single SQLite file holding every crawled resource as zlib-compressed JSON, keyed by 'resource/id' with its 'resource/name' as an alias.
+    Keys don't include the host, so a snapshot serves URLs of any base URL (e.g. the links inside API data).
+
+    Build one with `PokeSnapshot.build(path)`, or from the command line:
+        python -m objects.api.PokeSnapshot build <path> [resource ...]
+
+    Serve from it by configuring the session, e.g. `PokeSession.configure(snapshot=PokeSnapshot(path), offline=True)`, or by setting the POKESUITE_SNAPSHOT environment variable to the snapshot's path.
+    '''
+
+    # The resources PokeSuite uses. Forms are included as PokeData.get_forms() loads them.
+    DEFAULT_RESOURCES = ("pokemon", "pokemon-form", "pokemon-species", "ability", "move", "evolution-chain")
+
+    def __init__(self, path : str):
+        self.path = os.path.expanduser(path)
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"No snapshot found at '{self.path}'.")
+        # Read-only, so a snapshot can be shared between processes (and live on read-only storage).
+        self._connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def get(self, url : str, fields : tuple = ()) -> dict | None:
+        '''
+        Retrieve a resource from the snapshot.
+
+        Arguments:
+            url (str): Any URL of the resource, by name or by ID.
+            fields (tuple[str]): The top-level fields to decode. If empty, the whole resource is decoded.
+        Returns:
+            dict | None: The JSON data of the resource, or None if it is not in the snapshot.
+        '''
+        resource, identifier = PokeSession.split_url(url)
+        if resource == "":
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT entries.body FROM aliases JOIN entries ON entries.key = aliases.key WHERE aliases.alias = ?",
+                (f"{resource}/{identifier}",),
+            ).fetchone()
+        if row is None:
+            return None
+        return PokeProjection.loads(zlib.decompress(row[0]), fields)
+
+    def get_info(self) -> dict:
+        '''
+        Retrieve information about the snapshot: when it was built, from which API, and how many of each resource it holds.
+
+        Arguments:
+            None
+        Returns:
+            dict: The snapshot's metadata.
+        '''
+        with self._lock:
+            rows = self._connection.execute("SELECT name, value FROM meta").fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def close(self):
+        '''
+        Close the snapshot file.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def build(path : str, resources : tuple = DEFAULT_RESOURCES, session : PokeSession | None = None, workers : int = 16, limit : int = -1, progress : Callable[[str, int, int], Any] | None = None, logger : Logger = Logger.no_logger()):
+        '''
+        Crawl the PokeAPI into a new snapshot file.
+
+        Each resource type is listed through the API's list endpoint, then every resource is fetched in parallel and written to the snapshot as it arrives.
+        An existing file at `path` is replaced once the new snapshot is complete.
+
+        Arguments:
+            path (str): The path of the snapshot file to create.
+            resources (tuple[str]): The resource types to crawl.
+            session (PokeSession | None): The session to crawl with. Defaults to the default session, or, if that is offline (e.g. it serves from a snapshot), an online session with the same base URL.
+            workers (int): The number of threads to fetch with.
+            limit (int): The maximum number of each resource to crawl. If -1, every resource is crawled.
+            progress (Callable[[str, int, int], Any] | None): Called as `progress(resource, done, total)` as resources are fetched. This is optional.
+            logger (Logger): The logger to use.
+        Returns:
+            PokeSnapshot: The newly built snapshot.
+        '''
+        owned = None
+        if session is None:
+            session = PokeSession.default_session()
+            if session.offline:
+                # Rebuilding from an environment that already serves from a snapshot, so crawl with a session of our own.
+                session = owned = PokeSession(base_url=session.base_url, pool_maxsize=max(1, workers), cache=None, logger=logger)
+        try:
+            return PokeSnapshot.__build(path, resources, session, workers, limit, progress, logger)
+        finally:
+            if owned is not None:
+                owned.close()
+
+    @staticmethod
+    def __build(path : str, resources : tuple, session : PokeSession, workers : int, limit : int, progress : Callable[[str, int, int], Any] | None, logger : Logger):
+        '''
+        Internal method crawling the PokeAPI into a new snapshot file with the given session. See `PokeSnapshot.build(...)`.
+
+        Arguments:
+            path (str): The path of the snapshot file to create.
+            resources (tuple[str]): The resource types to crawl.
+            session (PokeSession): The session to crawl with.
+            workers (int): The number of threads to fetch with.
+            limit (int): The maximum number of each resource to crawl. If -1, every resource is crawled.
+            progress (Callable[[str, int, int], Any] | None): Called as `progress(resource, done, total)` as resources are fetched.
+            logger (Logger): The logger to use.
+        Returns:
+            PokeSnapshot: The newly built snapshot.
+        '''
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+
+        connection = sqlite3.connect(partial)
+        connection.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, body BLOB NOT NULL) WITHOUT ROWID")
+        connection.execute("CREATE TABLE aliases (alias TEXT PRIMARY KEY, key TEXT NOT NULL) WITHOUT ROWID")
+        connection.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+
+        def fetch(url : str) -> dict:
+            response = session.get(url)
+            response.raise_for_status()
+            return response.json()
+
+        counts = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for resource in resources:
+                # The list endpoint returns every resource's name and URL in a single page when the limit is high enough.
+                listing = fetch(f"{session.base_url}{resource}/?limit={limit if limit > 0 else 100000}&offset=0")
+                urls = [entry["url"] for entry in listing.get("results", [])]
+                counts[resource] = 0
+                # Map in chunks, so results are written as they arrive rather than held until the end.
+                for start in range(0, len(urls), 256):
+                    chunk = urls[start:start + 256]
+                    for url, data in zip(chunk, executor.map(PokeSnapshot.__try_fetch, [fetch] * len(chunk), chunk, [logger] * len(chunk))):
+                        if data is None:
+                            continue
+                        key = f"{resource}/{data.get('id', PokeSession.split_url(url)[1])}"
+                        body = zlib.compress(PokeProjection.dumps(data), 9)
+                        connection.execute("INSERT OR REPLACE INTO entries (key, body) VALUES (?, ?)", (key, body))
+                        aliases = set([key, f"{resource}/{PokeSession.split_url(url)[1]}"])
+                        if data.get("name"):
+                            aliases.add(f"{resource}/{str(data['name']).lower()}")
+                        connection.executemany("INSERT OR REPLACE INTO aliases (alias, key) VALUES (?, ?)", [(alias, key) for alias in aliases])
+                        counts[resource] += 1
+                    connection.commit()
+                    if progress is not None:
+                        progress(resource, min(start + 256, len(urls)), len(urls))
+                logger.info(f"Snapshot: crawled {counts[resource]} of {len(urls)} '{resource}' resources")
+
+        meta = {"built_at": time.time(), "base_url": session.base_url, "counts": counts}
+        connection.executemany("INSERT INTO meta (name, value) VALUES (?, ?)", [(name, json.dumps(value)) for name, value in meta.items()])
+        connection.commit()
+        # Reclaim free pages left behind by replaced rows, for the smallest possible artifact.
+        connection.execute("VACUUM")
+        connection.close()
+        os.replace(partial, path)
+        return PokeSnapshot(path)
+
+    @staticmethod
+    def __try_fetch(fetch : Callable[[str], dict], url : str, logger : Logger) -> dict | None:
+        '''
+        Internal method for fetching a single resource during a crawl, logging rather than raising on failure.
+
+        Arguments:
+            fetch (Callable[[str], dict]): The function to fetch with.
+            url (str): The URL of the resource.
+            logger (Logger): The logger to use.
+        Returns:
+            dict | None: The JSON data of the resource, or None if it could not be fetched.
+        '''
+        try:
+            return fetch(url)
+        except Exception as e:
+            logger.warn(f"Snapshot: skipping '{url}': {e}")
+            return None
+
+# If this file is ran standalone, build a snapshot from the command line.
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        print("Usage: python -m objects.api.PokeSnapshot build <path> [resource ...]")
+        exit(1)
+    PokeSnapshot.build(
+        sys.argv[2],
+        resources=tuple(sys.argv[3:]) if len(sys.argv) > 3 else PokeSnapshot.DEFAULT_RESOURCES,
+        progress=lambda resource, done, total: print(f"\r{resource}: {done}/{total}", end="" if done < total else "\n"),
+        logger=Logger.default_logger(),
+    )
@@ -0,0 +1,120 @@
+import threading
+
+from objects.battle.BattleAbility import BattleAbility
+from objects.type.AbilityModifier import AbilityModifier
+
+class AbilityRegistry:
+    '''
+    The abilities with effects in battle (see `BattleAbility`), by name, and the dispatch tables the battle engine calls their hooks through.
+
+    Which hooks an ability overrides is found once per ability class, by comparing its hooks with `BattleAbility`'s do-nothing ones.
+    A battle's dispatch table then lists, for each hook, the handler of every team member whose ability overrides it, so each phase of a turn only calls the abilities subscribed to it,
+    and skips the phase entirely when no Pokemon in the battle is. Tables are shared by every battle between the same teams.
+
+    Abilities are registered by their PokeAPI names (e.g. "speed-boost"), and a few are registered by default.
+
+    Usage:
+        AbilityRegistry.register(SpeedBoostAbility())
+        AbilityRegistry.subscriptions(AbilityRegistry.get("speed-boost"))  # ("post_turn",)
+    '''
+
+    # Ability name -> ability.
+    _registry = {}
+    # Ability class -> the hooks it overrides.
+    _subscriptions = {}
+    # (first team, second team, subscribed only) -> dispatch table, emptied whenever it fills up or an ability is registered.
+    _tables = {}
+    _lock = threading.Lock()
+    # The number of dispatch tables kept.
+    TABLES_SIZE = 1024
+    # The ability members without one with effects in battle have in a naive table, all of whose hooks do nothing.
+    _NO_ABILITY = BattleAbility()
+
+    @staticmethod
+    def register(ability : BattleAbility):
+        '''
+        Register an ability, replacing any registered under the same name.
+
+        Arguments:
+            ability (BattleAbility): The ability.
+        '''
+        with AbilityRegistry._lock:
+            AbilityRegistry._registry[AbilityModifier.canonical(ability.name)] = ability
+            AbilityRegistry._tables = {}
+
+    @staticmethod
+    def get(name : str):
+        '''
+        Retrieve an ability.
+
+        Arguments:
+            name (str): The name of the ability.
+        Returns:
+            BattleAbility | None: The ability, or None if it has no effects in battle (or isn't known).
+        '''
+        if name == "":
+            return None
+        ability = AbilityRegistry._registry.get(name)
+        if ability is None:
+            ability = AbilityRegistry._registry.get(AbilityModifier.canonical(name))
+        return ability
+
+    @staticmethod
+    def subscriptions(ability : BattleAbility) -> tuple:
+        '''
+        Retrieve the hooks an ability overrides, found the first time each class of ability is seen.
+
+        Arguments:
+            ability (BattleAbility): The ability.
+        Returns:
+            tuple[str]: The names of the hooks, in `BattleAbility.HOOKS` order.
+        '''
+        kind = type(ability)
+        hooks = AbilityRegistry._subscriptions.get(kind)
+        if hooks is None:
+            hooks = AbilityRegistry._subscriptions[kind] = tuple(hook for hook in BattleAbility.HOOKS if getattr(kind, hook) is not getattr(BattleAbility, hook))
+        return hooks
+
+    @staticmethod
+    def dispatch(teams : tuple, subscribed_only : bool = True) -> dict:
+        '''
+        Retrieve the dispatch table of a battle between two teams.
+
+        Arguments:
+            teams (tuple[tuple[BattlePokemon], tuple[BattlePokemon]]): The two teams.
+            subscribed_only (bool): Whether to only include the hooks each ability overrides. If False, every hook of every member is included (the do-nothing ones of
+                `BattleAbility` for members whose ability has no effects in battle), as a naive engine would call them, for comparison. Defaults to True.
+        Returns:
+            dict: Hook name -> None if no member's ability is subscribed to the hook, otherwise a tuple for each side of the handler of each member (in team order),
+                or None for members not subscribed. Handlers are called with the battle and the holder's side (plus the move, for the damage hooks).
+        '''
+        key = (tuple(teams[0]), tuple(teams[1]), subscribed_only)
+        table = AbilityRegistry._tables.get(key)
+        if table is None:
+            abilities = [[AbilityRegistry.get(pokemon.ability) for pokemon in team] for team in teams]
+            if not subscribed_only:
+                abilities = [[AbilityRegistry._NO_ABILITY if ability is None else ability for ability in side] for side in abilities]
+            table = {}
+            for hook in BattleAbility.HOOKS:
+                handlers = tuple(
+                    tuple(getattr(ability, hook) if ability is not None and (not subscribed_only or hook in AbilityRegistry.subscriptions(ability)) else None for ability in side)
+                    for side in abilities
+                )
+                table[hook] = handlers if any(handler is not None for side in handlers for handler in side) else None
+            with AbilityRegistry._lock:
+                if len(AbilityRegistry._tables) >= AbilityRegistry.TABLES_SIZE:
+                    AbilityRegistry._tables = {}
+                AbilityRegistry._tables[key] = table
+        return table
+
+# Imported here, as the abilities are only needed to register them.
+from objects.battle.abilities.AftermathAbility import AftermathAbility
+from objects.battle.abilities.IntimidateAbility import IntimidateAbility
+from objects.battle.abilities.RoughSkinAbility import RoughSkinAbility
+from objects.battle.abilities.SpeedBoostAbility import SpeedBoostAbility
+from objects.battle.abilities.StaticAbility import StaticAbility
+
+# The abilities with effects in battle, registered by default.
+for ability in (AftermathAbility(), IntimidateAbility(), RoughSkinAbility(), SpeedBoostAbility(), StaticAbility()):
+    AbilityRegistry.register(ability)
+del ability
@@ -0,0 +1,117 @@
+class BattleAbility:
+    '''
+    An ability's effects in battle, as hooks the battle engine calls at each phase of a turn, like the old PokeAbility's.
+
+    Every hook does nothing by default, and an ability only overrides the hooks it uses. The engine only calls the hooks an ability overrides (see `AbilityRegistry`),
+    so an ability with no effect in a phase costs nothing there. Abilities that only change how effective moves are (e.g. Adaptability, Levitate) are handled by `AbilityModifier` instead, and need no hooks.
+
+    Each hook is given the battle and the side of the ability's holder, which is always that side's active Pokemon. Abilities are shared between battles and holders,
+    so they must not keep any state of their own; everything they change goes through the battle (e.g. `battle.damage(...)`), so it's part of the battle's state.
+
+    Usage:
+        class SpeedBoostAbility(BattleAbility):
+            name = "speed-boost"
+
+            def post_turn(self, battle, side : int):
+                battle.boost(side, "speed", 1)
+    '''
+
+    # The name of the ability, as in `AbilityModifier.canonical(...)`.
+    name = ""
+
+    # Every hook, in the order they happen in a turn (apart from on_summon and on_faint, which happen whenever a Pokemon is sent out or faints).
+    HOOKS = ("on_summon", "pre_turn", "pre_user_damage", "pre_target_damage", "post_target_damage", "on_faint", "pre_field_tick", "pre_effect_tick", "post_turn")
+
+    def on_summon(self, battle, side : int):
+        '''
+        Called when the holder is sent out: at the start of the battle, and when switched in (by choice, or to replace a fainted Pokemon).
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
+
+    def pre_turn(self, battle, side : int):
+        '''
+        Called at the start of each turn, after both sides have chosen their actions but before any of them happen.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
+
+    def pre_user_damage(self, battle, side : int, move):
+        '''
+        Called when the holder uses a move, before the move has any effect (and before it can miss).
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+            move (BattleMove): The move.
+        '''
+        pass
+
+    def pre_target_damage(self, battle, side : int, move):
+        '''
+        Called when the opposing Pokemon uses a move on the holder, before the move has any effect (and before it can miss).
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+            move (BattleMove): The move.
+        '''
+        pass
+
+    def post_target_damage(self, battle, side : int, move):
+        '''
+        Called when a move the opposing Pokemon used damages the holder, right after the damage is dealt and before the move's other effects.
+        Called even if the move knocked the holder out, so reactions to being hit (e.g. Rough Skin) still happen.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+            move (BattleMove): The move.
+        '''
+        pass
+
+    def on_faint(self, battle, side : int):
+        '''
+        Called when the holder faints, before it's replaced.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
+
+    def pre_field_tick(self, battle, side : int):
+        '''
+        Called after both sides' actions, before the field's effects happen at the end of the turn. Not called if the holder has fainted.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
+
+    def pre_effect_tick(self, battle, side : int):
+        '''
+        Called at the end of the turn, before the holder's status (e.g. a burn) takes effect. Not called if the holder has fainted.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
+
+    def post_turn(self, battle, side : int):
+        '''
+        Called once everything else in the turn has happened, including fainted Pokemon being replaced.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The holder's side.
+        '''
+        pass
@@ -0,0 +1,85 @@
+from objects.type.TypeChart import TypeChart
+
+class BattleMove:
+    '''
+    A move, as the battle engine uses it: only the values needed to resolve it, with its type interned to an index.
+
+    Moves can be created directly, or from a PokeAPI move resource (the data PokeMoveData wraps) with `BattleMove.from_data(...)`.
+    '''
+
+    __slots__ = ("name", "type", "power", "accuracy", "special", "priority", "pp", "critical_stage", "stat_changes", "stat_chance", "targets_user", "burn_chance")
+
+    # The battle stats, in the order stat stages are stored.
+    STATS = ("attack", "defense", "special-attack", "special-defense", "speed")
+
+    def __init__(self, name : str, type : str, power : int = 0, accuracy : int | None = 100, damage_class : str = "physical", priority : int = 0, pp : int = 10,
+                 critical_stage : int = 0, stat_changes : dict = {}, stat_chance : int = 100, targets_user : bool = False, burn_chance : int = 0):
+        '''
+        Create a move.
+
+        Arguments:
+            name (str): The name of the move.
+            type (str): The type of the move.
+            power (int): The power of the move, or 0 for a move that deals no damage. Defaults to 0.
+            accuracy (int | None): The accuracy of the move as a percentage, or None for a move that never misses. Defaults to 100.
+            damage_class (str): "physical", "special" or "status". Defaults to "physical".
+            priority (int): The priority of the move. Defaults to 0.
+            pp (int): The PP of the move. Defaults to 10.
+            critical_stage (int): The critical hit stage of the move (e.g. 1 for a high critical hit ratio). Defaults to 0.
+            stat_changes (dict): The stat stages the move changes, keyed by stat name (see `BattleMove.STATS`), e.g. {"attack": 2} for Swords Dance. Defaults to none.
+            stat_chance (int): The chance of the stat changes happening, as a percentage. Defaults to 100.
+            targets_user (bool): Whether the stat changes apply to the user rather than the target. Defaults to False.
+            burn_chance (int): The chance of the move burning the target, as a percentage. Defaults to 0.
+        '''
+        self.name = name
+        self.type = TypeChart.index(type)
+        self.power = power
+        self.accuracy = accuracy
+        self.special = damage_class == "special"
+        self.priority = priority
+        self.pp = pp
+        self.critical_stage = critical_stage
+        # As (stat position, change) pairs.
+        self.stat_changes = tuple((BattleMove.STATS.index(stat), change) for stat, change in stat_changes.items() if stat in BattleMove.STATS)
+        self.stat_chance = stat_chance
+        self.targets_user = targets_user
+        self.burn_chance = burn_chance
+
+    @staticmethod
+    def from_data(data : dict):
+        '''
+        Create a move from a PokeAPI move resource.
+
+        Arguments:
+            data (dict): The move resource, as returned by the PokeAPI's /move endpoint.
+        Returns:
+            BattleMove: The move.
+        '''
+        meta = data.get("meta") or {}
+        damage_class = (data.get("damage_class") or {}).get("name", "physical")
+        burn_chance = 0
+        if (meta.get("ailment") or {}).get("name") == "burn":
+            # Status moves list a chance of 0, as they always inflict their ailment if they hit.
+            burn_chance = meta.get("ailment_chance") or (100 if damage_class == "status" else 0)
+        return BattleMove(
+            data.get("name", "Unknown"),
+            (data.get("type") or {}).get("name", ""),
+            power=data.get("power") or 0,
+            accuracy=data.get("accuracy"),
+            damage_class=damage_class,
+            priority=data.get("priority") or 0,
+            pp=data.get("pp") or 1,
+            critical_stage=meta.get("crit_rate") or 0,
+            stat_changes={change["stat"]["name"]: change["change"] for change in data.get("stat_changes", [])},
+            # As with ailments, a chance of 0 means the changes always happen.
+            stat_chance=meta.get("stat_chance") or 100,
+            # Damaging moves that change the user's stats (e.g. Close Combat, Flame Charge) target the opponent, so their category says where the changes go.
+            targets_user=(data.get("target") or {}).get("name") == "user" or (meta.get("category") or {}).get("name") == "damage+raise",
+            burn_chance=burn_chance,
+        )
+
+    def __repr__(self) -> str:
+        return f"BattleMove({self.name!r})"
+
+# The move used when a Pokemon has no PP left: typeless, and it always hits.
+BattleMove.STRUGGLE = BattleMove("struggle", "", power=50, accuracy=None, pp=0)
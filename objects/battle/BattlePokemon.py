@@ -0,0 +1,75 @@
+from objects.battle.BattleMove import BattleMove
+from objects.battle.DamageCalculator import DamageCalculator
+from objects.type.TypeChart import TypeChart
+
+class BattlePokemon:
+    '''
+    A Pokemon as it's brought into battle: its level, calculated stats, types (as indices), moves and ability.
+
+    Nothing here changes during a battle; HP, stat stages, status and PP are tracked by the battle itself, so the same team can be used in any number of battles at once.
+    '''
+
+    __slots__ = ("name", "level", "types", "stats", "moves", "ability")
+
+    # The stats, in the order they're stored.
+    STATS = ("hp",) + BattleMove.STATS
+
+    def __init__(self, name : str, level : int, types : list, stats : list, moves : list, ability : str = ""):
+        '''
+        Create a Pokemon for battle.
+
+        Arguments:
+            name (str): The name of the Pokemon.
+            level (int): The level of the Pokemon.
+            types (list[str]): The names of the Pokemon's types (one or two).
+            stats (list[int]): The Pokemon's calculated stats, in `BattlePokemon.STATS` order.
+            moves (list[BattleMove]): The Pokemon's moves (one to four).
+            ability (str): The Pokemon's ability. Defaults to none.
+        Raises:
+            ValueError: If the Pokemon has no moves, or more than four.
+        '''
+        if not 1 <= len(moves) <= 4:
+            raise ValueError(f"A Pokemon must have between one and four moves, but {name} has {len(moves)}.")
+        self.name = name
+        self.level = level
+        self.types = tuple(TypeChart.index(type) for type in types)
+        self.stats = tuple(stats)
+        self.moves = tuple(moves)
+        self.ability = ability
+
+    @staticmethod
+    def from_base_stats(name : str, types : list, base_stats : dict, moves : list, level : int = 50, ability : str = "", ivs : int = 31, evs : dict = {}):
+        '''
+        Create a Pokemon for battle from its base stats.
+
+        Arguments:
+            name (str): The name of the Pokemon.
+            types (list[str]): The names of the Pokemon's types (one or two).
+            base_stats (dict): The Pokemon's base stats, keyed by stat name (see `BattlePokemon.STATS`). Missing stats are 0.
+            moves (list[BattleMove]): The Pokemon's moves (one to four).
+            level (int): The level of the Pokemon. Defaults to 50.
+            ability (str): The Pokemon's ability. Defaults to none.
+            ivs (int): The individual value of every stat. Defaults to 31.
+            evs (dict): The effort value of each stat, keyed by stat name. Defaults to none.
+        Returns:
+            BattlePokemon: The Pokemon.
+        '''
+        stats = [DamageCalculator.stat(base_stats.get(stat, 0), level, ivs, evs.get(stat, 0), hp=stat == "hp") for stat in BattlePokemon.STATS]
+        return BattlePokemon(name, level, types, stats, moves, ability)
+
+    @staticmethod
+    def from_data(data, moves : list, level : int = 50, ability : str = "", ivs : int = 31, evs : dict = {}):
+        '''
+        Create a Pokemon for battle from its data.
+
+        Arguments:
+            data (PokeData): The Pokemon's data, for its name, base stats and types.
+            moves (list[BattleMove]): The Pokemon's moves (one to four).
+            level, ability, ivs, evs: As for `from_base_stats(...)`.
+        Returns:
+            BattlePokemon: The Pokemon.
+        '''
+        return BattlePokemon.from_base_stats(data.get_name(), data.get_default_types(), data.get_default_stats(), moves, level, ability, ivs, evs)
+
+    def __repr__(self) -> str:
+        return f"BattlePokemon({self.name!r}, level={self.level})"
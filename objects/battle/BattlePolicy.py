@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+
+class BattlePolicy(ABC):
+    '''
+    Chooses a side's action each turn of a PokeBattle.
+
+    Policies take any randomness they need from the battle's RNG (`battle.random`), so a battle stays reproducible from its seed.
+    They're pickled to be sent to the worker processes of a BattleRunner, so they should hold no unpicklable state.
+    A policy that keeps state between choices (e.g. a search's table) must forget it in `reset()`, which a BattleRunner calls before every battle,
+    so each battle's choices depend on its seed alone, and not on which battles the same process played before it.
+    '''
+
+    def reset(self):
+        '''
+        Forget any state kept from earlier battles, before a new battle. Does nothing by default.
+
+        Arguments:
+            None
+        '''
+        pass
+
+    @abstractmethod
+    def choose(self, battle, side : int) -> int:
+        '''
+        Choose a side's action for this turn.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The side to choose for (0 or 1).
+        Returns:
+            int: The action, one of `battle.legal_actions(side)`.
+        '''
+        pass
@@ -0,0 +1,142 @@
+import concurrent.futures
+import math
+import os
+
+from objects.battle.DamageCalculator import DamageCalculator
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.RandomPolicy import RandomPolicy
+
+class BattleRunner:
+    '''
+    Plays many battles between two teams (a Monte Carlo simulation), to estimate how often the first team wins.
+
+    Battles are split into chunks and played across a pool of worker processes, as each battle is independent and pure Python, so threads wouldn't run them in parallel.
+    Every battle is seeded from the run's seed and its own number alone (see `BattleRunner.seed(...)`), and the policies are reset before each one (see `BattlePolicy.reset()`),
+    so a run's results are the same whatever the number of workers or the order chunks finish in, and running it again gives the same results.
+
+    Usage:
+        runner = BattleRunner((team, other_team), (GreedyPolicy(), RandomPolicy()))
+        runner.run(10000, seed=42)  # {"battles": 10000, "wins": ..., "win_rate": ..., "interval": (low, high), ...}
+    '''
+
+    # The z-score of the confidence interval reported for the win rate (95%).
+    Z = 1.959964
+    # The number of chunks given to each worker, so a slow chunk doesn't hold up the whole run.
+    CHUNKS_PER_WORKER = 4
+
+    def __init__(self, teams : tuple, policies : tuple = (RandomPolicy(), RandomPolicy()), generation : int = 8, weather : str = "", max_turns : int = PokeBattle.MAX_TURNS):
+        '''
+        Create a battle runner.
+
+        Arguments:
+            teams (tuple[list[BattlePokemon], list[BattlePokemon]]): The two teams.
+            policies (tuple[BattlePolicy, BattlePolicy]): The policy choosing each team's actions. Defaults to random actions for both.
+            generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+            weather (str): The weather for every battle. Defaults to none.
+            max_turns (int): The number of turns after which a battle is a draw. Defaults to `PokeBattle.MAX_TURNS`.
+        '''
+        self.teams = (tuple(teams[0]), tuple(teams[1]))
+        self.policies = tuple(policies)
+        self.generation = generation
+        self.weather = weather
+        self.max_turns = max_turns
+
+    @staticmethod
+    def seed(seed : int, battle : int) -> str:
+        '''
+        Derive the seed of one battle in a run.
+
+        The seed is a string, which `random.Random` hashes with SHA-512, so battles with neighbouring numbers still get unrelated RNGs, and the seed doesn't depend on the process's hash seed.
+
+        Arguments:
+            seed (int): The seed of the run.
+            battle (int): The number of the battle in the run.
+        Returns:
+            str: The battle's seed.
+        '''
+        return f"{seed}/{battle}"
+
+    @staticmethod
+    def interval(successes : int, trials : int, z : float = Z) -> tuple:
+        '''
+        Calculate the Wilson score interval of a proportion, which (unlike the normal approximation) stays within 0-1 and behaves near 0% and 100%.
+
+        Arguments:
+            successes (int): The number of successes.
+            trials (int): The number of trials.
+            z (float): The z-score of the confidence level. Defaults to `BattleRunner.Z` (95%).
+        Returns:
+            tuple[float, float]: The lower and upper bounds. (0.0, 1.0) if there were no trials.
+        '''
+        if trials == 0:
+            return (0.0, 1.0)
+        proportion = successes / trials
+        denominator = 1 + z * z / trials
+        centre = (proportion + z * z / (2 * trials)) / denominator
+        margin = z * math.sqrt(proportion * (1 - proportion) / trials + z * z / (4 * trials * trials)) / denominator
+        return (max(centre - margin, 0.0), min(centre + margin, 1.0))
+
+    def run(self, battles : int, seed : int = 0, workers : int | None = None) -> dict:
+        '''
+        Play battles and aggregate their results.
+
+        Arguments:
+            battles (int): The number of battles to play.
+            seed (int): The seed of the run. Defaults to 0.
+            workers (int | None): The number of worker processes. If None, one per CPU; if 1, the battles are played in this process.
+        Returns:
+            dict: The number of "battles", the first team's "wins", "losses" and "draws", its "win_rate",
+                the 95% confidence "interval" of the win rate, and the mean number of "turns" per battle.
+        '''
+        workers = max(1, min(workers or os.cpu_count() or 1, battles))
+        if workers == 1:
+            totals = BattleRunner._play(self, seed, 0, battles)
+        else:
+            # Contiguous ranges of battle numbers; the counts are simply summed, so it doesn't matter which worker plays which.
+            chunks = min(workers * BattleRunner.CHUNKS_PER_WORKER, battles)
+            bounds = [battles * chunk // chunks for chunk in range(chunks + 1)]
+            totals = [0, 0, 0, 0]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(BattleRunner._play, self, seed, bounds[chunk], bounds[chunk + 1]) for chunk in range(chunks)]
+                for future in concurrent.futures.as_completed(futures):
+                    totals = [total + count for total, count in zip(totals, future.result())]
+        wins, losses, draws, turns = totals
+        return {
+            "battles": battles,
+            "wins": wins,
+            "losses": losses,
+            "draws": draws,
+            "win_rate": wins / battles if battles > 0 else 0.0,
+            "interval": BattleRunner.interval(wins, battles),
+            "turns": turns / battles if battles > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _play(runner, seed : int, start : int, stop : int) -> tuple:
+        '''
+        Internal helper function playing a range of battles, in a worker process. Not name-mangled, so the pool can pickle it.
+
+        Arguments:
+            runner (BattleRunner): The runner.
+            seed (int): The seed of the run.
+            start (int): The number of the first battle to play.
+            stop (int): The number after the last battle to play.
+        Returns:
+            tuple[int, int, int, int]: The first team's wins, losses and draws, and the total number of turns played.
+        '''
+        # One calculator for the whole range, so its remembered rolls carry over between battles.
+        calculator = DamageCalculator(runner.generation)
+        wins = losses = draws = turns = 0
+        for battle in range(start, stop):
+            for policy in runner.policies:
+                policy.reset()
+            game = PokeBattle(runner.teams, runner.generation, BattleRunner.seed(seed, battle), runner.weather, runner.max_turns, calculator)
+            winner = game.play(runner.policies)
+            if winner == 0:
+                wins += 1
+            elif winner == 1:
+                losses += 1
+            else:
+                draws += 1
+            turns += game.turn
+        return (wins, losses, draws, turns)
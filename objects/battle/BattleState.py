@@ -0,0 +1,143 @@
+import array
+
+from objects.battle.BattleMove import BattleMove
+
+class BattleState:
+    '''
+    Everything about a battle that changes as it's played, packed into one flat array of ints at fixed offsets: the field, each side's active member and stat stages,
+    and each member's HP, status and remaining PP.
+
+    Because the whole state is one array, a snapshot is a single copy of a few hundred bytes and restoring it is a single slice assignment,
+    so a search can branch from the same position thousands of times without copying any objects. The layout is:
+
+        field:  turn, weather, winner
+        side:   active member, stat stages (in `BattleMove.STATS` order)
+        member: HP, status, PP of each of the four move slots
+
+    with the field first, then each side followed by its members. The offset of each side is in `sides`, and of each member from `member(...)`; the constants below are added to them.
+
+    Usage:
+        snapshot = state.snapshot()
+        ...  # play some turns
+        state.restore(snapshot)
+    '''
+
+    __slots__ = ("sizes", "sides", "data")
+
+    # Field offsets.
+    TURN = 0
+    WEATHER = 1
+    WINNER = 2
+    FIELD = 3
+    # Side offsets, from `sides`.
+    ACTIVE = 0
+    STAGES = 1
+    SIDE = STAGES + len(BattleMove.STATS)
+    # Member offsets, from `member(...)`.
+    HP = 0
+    STATUS = 1
+    PP = 2
+    MEMBER = PP + 4
+
+    # Statuses.
+    HEALTHY = 0
+    BURNED = 1
+    PARALYSED = 2
+
+    # The weathers, by their stored code.
+    WEATHERS = ("", "rain", "sun", "sandstorm", "snow")
+    # The stored winner while the battle goes on.
+    ONGOING = -2
+
+    def __init__(self, teams : tuple, weather : str = ""):
+        '''
+        Create the state at the start of a battle: every member at full HP and PP, and the first member of each team active.
+
+        Arguments:
+            teams (tuple[list[BattlePokemon], list[BattlePokemon]]): The two teams.
+            weather (str): The weather (one of `BattleState.WEATHERS`). Defaults to none.
+        Raises:
+            ValueError: If the weather is not known.
+        '''
+        if weather not in BattleState.WEATHERS:
+            raise ValueError(f"Unknown weather '{weather}'. Expected one of {', '.join(BattleState.WEATHERS[1:])}.")
+        # The number of members in each team, and the offset of each side's values.
+        self.sizes = (len(teams[0]), len(teams[1]))
+        self.sides = (BattleState.FIELD, BattleState.FIELD + BattleState.SIDE + BattleState.MEMBER * self.sizes[0])
+        values = [0, BattleState.WEATHERS.index(weather), BattleState.ONGOING]
+        for team in teams:
+            values.extend([0] * BattleState.SIDE)
+            for pokemon in team:
+                # Empty move slots have no PP, so they're never legal.
+                values.extend([pokemon.stats[0], 0] + [move.pp for move in pokemon.moves] + [0] * (4 - len(pokemon.moves)))
+        self.data = array.array("i", values)
+
+    def member(self, side : int, member : int) -> int:
+        '''
+        Retrieve the offset of a team member's values.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            member (int): The position of the member in its team.
+        Returns:
+            int: The offset, to add `BattleState.HP`, `BattleState.STATUS` or `BattleState.PP` to.
+        '''
+        return self.sides[side] + BattleState.SIDE + BattleState.MEMBER * member
+
+    def active(self, side : int) -> int:
+        '''
+        Retrieve the offset of the values of a side's active member.
+
+        Arguments:
+            side (int): The side (0 or 1).
+        Returns:
+            int: The offset, as for `member(...)`.
+        '''
+        offset = self.sides[side]
+        return offset + BattleState.SIDE + BattleState.MEMBER * self.data[offset]
+
+    def snapshot(self) -> array.array:
+        '''
+        Take a snapshot of the state.
+
+        Arguments:
+            None
+        Returns:
+            array.array: The snapshot, to pass to `restore(...)`. Treat it as opaque.
+        '''
+        return self.data[:]
+
+    def restore(self, snapshot : array.array):
+        '''
+        Restore the state to a snapshot, in place.
+
+        Arguments:
+            snapshot (array.array): A snapshot from `snapshot()`, of this state or another for the same teams.
+        '''
+        self.data[:] = snapshot
+
+    def copy(self):
+        '''
+        Copy the state.
+
+        Arguments:
+            None
+        Returns:
+            BattleState: An independent copy.
+        '''
+        state = BattleState.__new__(BattleState)
+        state.sizes = self.sizes
+        state.sides = self.sides
+        state.data = self.data[:]
+        return state
+
+    def key(self) -> bytes:
+        '''
+        Retrieve a hashable key of the state, equal for equal states, e.g. for a transposition table.
+
+        Arguments:
+            None
+        Returns:
+            bytes: The key.
+        '''
+        return self.data.tobytes()
@@ -0,0 +1,301 @@
+from objects.type.AbilityModifier import AbilityModifier
+from objects.type.TypeChart import TypeChart
+
+class DamageCalculator:
+    '''
+    Calculates the damage of an attack with the standard damage formula, as used since Generation 5, on one generation's type chart:
+
+        damage = (floor(floor((2 * level / 5 + 2) * power * attack / defense) / 50) + 2) * targets * weather * critical * random * STAB * type * burn * other
+
+    Every step is rounded as the games do: the base damage is floored at each division, the other modifiers are applied in fixed point (4096ths) and rounded half down,
+    and the random roll is one of 16 values from 85% to 100%, so an attack has a distribution of 16 possible damage values (its "rolls").
+
+    Stats are given as already calculated (see `DamageCalculator.stat(...)`, e.g. from `PokeData.get_default_stats()`), with stat stages applied separately, as the old Pokemon class tracks them.
+    Moves are given by the values PokeMoveData exposes: power, type and damage class. Types are indices (see `TypeChart.index(...)`), and abilities are names (see `AbilityModifier`).
+
+    Usage:
+        calculator = DamageCalculator(4)
+        glaceon, garchomp = [TypeChart.index("ice")], [TypeChart.index("dragon"), TypeChart.index("ground")]
+        calculator.rolls(75, 123, 163, 65, TypeChart.index("ice"), glaceon, garchomp)  # (168, ..., 196)
+    '''
+
+    # The random rolls, as percentages.
+    ROLLS = tuple(range(85, 101))
+    # The rolls of an attack that deals no damage.
+    _IMMUNE = (0,) * len(ROLLS)
+    # The number of distinct attacks whose rolls are remembered.
+    ROLLS_CACHE_SIZE = 65536
+    # The multiplier of each stat stage from -6 to +6, as (numerator, denominator).
+    STAGES = {stage: (max(2, 2 + stage), max(2, 2 - stage)) for stage in range(-6, 7)}
+    # The chance of a critical hit at each critical hit stage (e.g. 1 for a high critical hit ratio move), by the first generation to use the chances.
+    CRITICAL_CHANCES = {2: (1 / 16, 1 / 8, 1 / 4, 1 / 3, 1 / 2), 6: (1 / 16, 1 / 8, 1 / 2, 1.0), 7: (1 / 24, 1 / 8, 1 / 2, 1.0)}
+    # Weather -> the multiplier of each attacking type it affects, in 4096ths.
+    WEATHER = {
+        "rain": {TypeChart.index("water"): 6144, TypeChart.index("fire"): 2048},
+        "sun": {TypeChart.index("fire"): 6144, TypeChart.index("water"): 2048},
+    }
+
+    def __init__(self, generation : int = 8):
+        '''
+        Create a damage calculator for a generation.
+
+        Arguments:
+            generation (int): The generation of Pokemon to use (1-9), for its type chart, critical hit multiplier and weather effects. Defaults to 8.
+        '''
+        self.generation = generation
+        self.chart = TypeChart.for_generation(generation)
+        # Critical hits deal 2x before Generation 6, and 1.5x since. In 4096ths.
+        self.critical = 8192 if generation < 6 else 6144
+        self.critical_chances = DamageCalculator.CRITICAL_CHANCES[max([first for first in DamageCalculator.CRITICAL_CHANCES if first <= generation], default=2)]
+        # (base damage, STAB, effectiveness, final modifier) -> rolls. Emptied whenever it fills up.
+        self._rolls = {}
+
+    @staticmethod
+    def stat(base : int, level : int, iv : int = 31, ev : int = 0, nature : float = 1.0, hp : bool = False) -> int:
+        '''
+        Calculate a Pokemon's stat from its base stat.
+
+        Arguments:
+            base (int): The base stat.
+            level (int): The Pokemon's level.
+            iv (int): The stat's individual value (0-31). Defaults to 31.
+            ev (int): The stat's effort value (0-252). Defaults to 0.
+            nature (float): The nature's multiplier for the stat: 1.1, 1.0 or 0.9. Defaults to 1.0.
+            hp (bool): Whether the stat is HP, which is calculated differently. Defaults to False.
+        Returns:
+            int: The stat.
+        '''
+        value = (2 * base + iv + ev // 4) * level // 100
+        if hp:
+            return value + level + 10
+        return int((value + 5) * nature)
+
+    def critical_chance(self, stage : int = 0) -> float:
+        '''
+        Retrieve the chance of a critical hit.
+
+        Arguments:
+            stage (int): The critical hit stage, e.g. 1 for a move with a high critical hit ratio (PokeMoveData's crit rate). Defaults to 0.
+        Returns:
+            float: The chance, from 0 to 1.
+        '''
+        return self.critical_chances[min(max(stage, 0), len(self.critical_chances) - 1)]
+
+    def rolls(self, level : int, attack : int, defense : int, power : int, move_type : int, attacker_types : list = [], defender_types : list = [], special : bool = False,
+              attack_stage : int = 0, defense_stage : int = 0, critical : bool = False, burned : bool = False, weather : str = "",
+              attacker_ability : str = "", defender_ability : str = "", targets : int = 1, other : float = 1.0) -> tuple:
+        '''
+        Calculate every damage value an attack can deal: one for each random roll, lowest first.
+
+        Arguments:
+            level (int): The attacker's level.
+            attack (int): The attacker's Attack (or Special Attack, for a special move), before stat stages.
+            defense (int): The defender's Defense (or Special Defense, for a special move), before stat stages.
+            power (int): The move's power.
+            move_type (int): The index of the move's type.
+            attacker_types (list[int]): The indices of the attacker's types, for STAB.
+            defender_types (list[int]): The indices of the defender's types (one or two).
+            special (bool): Whether the move is special rather than physical. Defaults to False.
+            attack_stage (int): The stage of the attacking stat (-6 to 6). Defaults to 0.
+            defense_stage (int): The stage of the defending stat (-6 to 6). Defaults to 0.
+            critical (bool): Whether the attack is a critical hit, which ignores the attacker's negative and the defender's positive stat stages. Defaults to False.
+            burned (bool): Whether the attacker is burned, which halves the damage of physical moves. Defaults to False.
+            weather (str): The weather: "rain", "sun", "sandstorm" or "snow", or "" for none. Defaults to none.
+            attacker_ability (str): The attacker's ability. Abilities that don't affect type effectiveness are ignored. Defaults to none.
+            defender_ability (str): The defender's ability. Defaults to none.
+            targets (int): The number of targets, as moves hitting more than one deal 0.75x. Defaults to 1.
+            other (float): Any further multiplier (e.g. from items). Defaults to 1.0.
+        Returns:
+            tuple[int]: The damage of each of the 16 random rolls. All 0 if the defender is immune.
+        '''
+        base, stab, effectiveness, burn, final = self.__prepare(level, attack, defense, power, move_type, attacker_types, defender_types, special, attack_stage, defense_stage,
+                                                                critical, burned, weather, attacker_ability, defender_ability, targets, other)
+        if effectiveness == 0.0:
+            return DamageCalculator._IMMUNE
+        # Only these five values vary from here, and a battle asks about the same few attacks over and over, so the rolls are remembered.
+        key = (base, stab, effectiveness, burn, final)
+        rolls = self._rolls.get(key)
+        if rolls is None:
+            if len(self._rolls) >= DamageCalculator.ROLLS_CACHE_SIZE:
+                self._rolls.clear()
+            # The rest of the formula, for each roll. (x * m + 2047) >> 12 is x * m / 4096, rounded half down.
+            if final == 4096 and not burn:
+                rolls = tuple([int(((base * roll // 100 * stab + 2047) >> 12) * effectiveness) or 1 for roll in DamageCalculator.ROLLS])
+            else:
+                # A burn halves the damage in a step of its own, rounded before the final modifier is applied.
+                halve = 2048 if burn else 4096
+                rolls = tuple([(((int(((base * roll // 100 * stab + 2047) >> 12) * effectiveness) * halve + 2047) >> 12) * final + 2047) >> 12 or 1 for roll in DamageCalculator.ROLLS])
+            self._rolls[key] = rolls
+        return rolls
+
+    def expected(self, level : int, attack : int, defense : int, power : int, move_type : int, attacker_types : list = [], defender_types : list = [], critical_stage : int = 0, **options) -> float:
+        '''
+        Calculate the average damage of an attack, over every random roll and the chance of a critical hit.
+
+        Arguments:
+            level, attack, defense, power, move_type, attacker_types, defender_types: As for `rolls(...)`.
+            critical_stage (int): The critical hit stage of the move (see `critical_chance(...)`). Defaults to 0.
+            **options: Any other arguments of `rolls(...)`, except critical.
+        Returns:
+            float: The average damage.
+        '''
+        normal = self.rolls(level, attack, defense, power, move_type, attacker_types, defender_types, critical=False, **options)
+        chance = self.critical_chance(critical_stage)
+        if chance == 0.0:
+            return sum(normal) / len(normal)
+        critical = self.rolls(level, attack, defense, power, move_type, attacker_types, defender_types, critical=True, **options)
+        return (sum(normal) * (1.0 - chance) + sum(critical) * chance) / len(normal)
+
+    def batch(self, level, attack, defense, power, move_type, attacker_types = None, defender_types = None, special = False, attack_stage = 0, defense_stage = 0,
+              critical = False, burned = False, weather : str = "", attacker_abilities = None, defender_abilities = None, targets = 1, other = 1.0):
+        '''
+        Calculate the damage rolls of many attacks at once, in vectorised NumPy operations.
+
+        Each argument is either one value for every attack, or an array with one entry per attack (broadcast together), with the same meaning as in `rolls(...)`.
+        Types are shaped (N, 2) with -1 for none, and abilities are modifier indices (see `AbilityModifier.index(...)`) with -1 for none. The weather is shared by every attack.
+        Requires the optional 'numpy' package.
+
+        Returns:
+            numpy.ndarray: The damage of each random roll of each attack, shaped (N, 16).
+        '''
+        chart = self.chart.as_array()
+        import numpy
+
+        # Every per-attack value as a 1-dimensional array of the same length.
+        level, attack, defense, power, move_type, special, attack_stage, defense_stage, critical, burned, targets = numpy.broadcast_arrays(
+            *(numpy.atleast_1d(numpy.asarray(value, dtype=numpy.int64)) for value in (level, attack, defense, power, move_type, special, attack_stage, defense_stage, critical, burned, targets))
+        )
+        count = level.shape[0]
+        special = special.astype(bool)
+        critical = critical.astype(bool)
+        attacker_types = self.__batch_types(numpy, attacker_types, count)
+        defender_types = self.__batch_types(numpy, defender_types, count)
+
+        # Type effectiveness, the product over the defender's types.
+        effectiveness = numpy.prod(chart[move_type[:, numpy.newaxis], defender_types], axis=1)
+        stab = numpy.where(((attacker_types == move_type[:, numpy.newaxis]) & (move_type[:, numpy.newaxis] >= 0)).any(axis=1), 6144, 4096)
+        final = numpy.broadcast_to(numpy.asarray(other, dtype=float) * 4096.0, (count,))
+        if attacker_abilities is not None or defender_abilities is not None:
+            from objects.type.AbilityModifier import AbilityModifier
+            multipliers, super_effective, not_super_effective, not_very_effective, ability_stabs = AbilityModifier.as_arrays(self.generation)
+            if defender_abilities is not None:
+                defender_abilities = numpy.broadcast_to(numpy.asarray(defender_abilities, dtype=numpy.intp), (count,))
+                final = final * multipliers[defender_abilities, move_type] * numpy.where(effectiveness > 1.0, super_effective[defender_abilities], not_super_effective[defender_abilities])
+            if attacker_abilities is not None:
+                attacker_abilities = numpy.broadcast_to(numpy.asarray(attacker_abilities, dtype=numpy.intp), (count,))
+                final = final * numpy.where((effectiveness > 0.0) & (effectiveness < 1.0), not_very_effective[attacker_abilities], 1.0)
+                stab = numpy.where(stab == 6144, numpy.where(numpy.isnan(ability_stabs[attacker_abilities]), 6144, ability_stabs[attacker_abilities] * 4096), 4096).astype(numpy.int64)
+        final = numpy.rint(final).astype(numpy.int64)
+
+        # Stat stages. Critical hits ignore the attacker's negative and the defender's positive stages.
+        attack_stage = numpy.clip(numpy.where(critical, numpy.maximum(attack_stage, 0), attack_stage), -6, 6)
+        defense_stage = numpy.clip(numpy.where(critical, numpy.minimum(defense_stage, 0), defense_stage), -6, 6)
+        attack = attack * numpy.maximum(2, 2 + attack_stage) // numpy.maximum(2, 2 - attack_stage)
+        defense = defense * numpy.maximum(2, 2 + defense_stage) // numpy.maximum(2, 2 - defense_stage)
+        defense = self.__weather_defense(numpy, defense, defender_types, special, weather)
+
+        base = (2 * level // 5 + 2) * power * attack // numpy.maximum(defense, 1) // 50 + 2
+        base = numpy.where(targets > 1, (base * 3072 + 2047) >> 12, base)
+        modifier = numpy.full(count, 4096, dtype=numpy.int64)
+        for type, multiplier in DamageCalculator.WEATHER.get(weather, {}).items():
+            modifier[move_type == type] = multiplier
+        base = (base * modifier + 2047) >> 12
+        base = numpy.where(critical, (base * self.critical + 2047) >> 12, base)
+
+        # Then each roll, as a column.
+        damage = base[:, numpy.newaxis] * numpy.array(DamageCalculator.ROLLS) // 100
+        damage = (damage * stab[:, numpy.newaxis] + 2047) >> 12
+        damage = numpy.floor(damage * effectiveness[:, numpy.newaxis]).astype(numpy.int64)
+        damage = numpy.where((burned.astype(bool) & ~special)[:, numpy.newaxis], (damage * 2048 + 2047) >> 12, damage)
+        damage = (damage * final[:, numpy.newaxis] + 2047) >> 12
+        return numpy.where((effectiveness * final == 0)[:, numpy.newaxis], 0, numpy.maximum(damage, 1))
+
+    @staticmethod
+    def __batch_types(numpy, types, count : int):
+        '''
+        Internal helper function shaping the types of a batch to (count, types per Pokemon).
+
+        Arguments:
+            numpy (module): The NumPy module.
+            types (array-like[int] | None): One typing shared by every attack, or one per attack. None for no types.
+            count (int): The number of attacks.
+        Returns:
+            numpy.ndarray: The types of each attack.
+        '''
+        if types is None:
+            return numpy.full((count, 1), -1, dtype=numpy.intp)
+        types = numpy.atleast_2d(numpy.asarray(types, dtype=numpy.intp))
+        return numpy.broadcast_to(types, (count, types.shape[1]))
+
+    def __prepare(self, level, attack, defense, power, move_type, attacker_types, defender_types, special, attack_stage, defense_stage,
+                  critical, burned, weather, attacker_ability, defender_ability, targets, other) -> tuple:
+        '''
+        Internal method calculating everything about an attack that doesn't depend on the random roll.
+
+        Returns:
+            tuple: The base damage (with the targets, weather and critical hit modifiers applied), the STAB modifier in 4096ths,
+                the type effectiveness (0.0 if the attack deals no damage), whether a burn halves the damage, and the final modifier in 4096ths (abilities and other).
+        '''
+        # Type effectiveness, from the precomputed defensive profile of the defender's typing.
+        if 0 < len(defender_types) <= 2:
+            effectiveness = self.chart.defensive_profile(*defender_types)[move_type]
+        else:
+            effectiveness = self.chart.effectiveness(move_type, defender_types)
+        stab = 6144 if move_type >= 0 and move_type in attacker_types else 4096
+        final = other
+        if defender_ability != "":
+            modifier = AbilityModifier.get(defender_ability, self.generation)
+            if modifier is not None:
+                final *= modifier.defending_multiplier(move_type, effectiveness)
+        if attacker_ability != "":
+            modifier = AbilityModifier.get(attacker_ability, self.generation)
+            if modifier is not None:
+                final *= modifier.attacking_multiplier(effectiveness)
+                if stab == 6144 and modifier.stab is not None:
+                    stab = round(modifier.stab * 4096)
+        if effectiveness == 0.0 or final == 0.0:
+            return (0, stab, 0.0, False, 0)
+        final = round(final * 4096)
+
+        # Stat stages. Critical hits ignore the attacker's negative and the defender's positive stages.
+        if critical:
+            attack_stage = max(attack_stage, 0)
+            defense_stage = min(defense_stage, 0)
+        numerator, denominator = DamageCalculator.STAGES[min(max(attack_stage, -6), 6)]
+        attack = attack * numerator // denominator
+        numerator, denominator = DamageCalculator.STAGES[min(max(defense_stage, -6), 6)]
+        defense = defense * numerator // denominator
+        if weather != "":
+            defense = self.__weather_defense(None, defense, defender_types, special, weather)
+
+        base = (2 * level // 5 + 2) * power * attack // max(defense, 1) // 50 + 2
+        if targets > 1:
+            base = (base * 3072 + 2047) >> 12
+        if weather != "":
+            base = (base * DamageCalculator.WEATHER.get(weather, {}).get(move_type, 4096) + 2047) >> 12
+        if critical:
+            base = (base * self.critical + 2047) >> 12
+        return (base, stab, effectiveness, burned and not special, final)
+
+    def __weather_defense(self, numpy, defense, defender_types, special, weather : str):
+        '''
+        Internal method applying the weather's boost to the defending stat: a sandstorm boosts the Special Defense of Rock types (since Generation 4), and snow the Defense of Ice types (since Generation 9).
+
+        Arguments:
+            numpy (module | None): The NumPy module for a batch, or None for a single attack.
+            defense: The defending stat, or stats for a batch.
+            defender_types: The defender's types, or each defender's types for a batch.
+            special: Whether the move is special, or each move for a batch.
+            weather (str): The weather.
+        Returns:
+            The boosted defending stat(s).
+        '''
+        if weather == "sandstorm" and self.generation >= 4:
+            boosted, type = special, TypeChart.index("rock")
+        elif weather == "snow" and self.generation >= 9:
+            boosted, type = ~special if numpy is not None else not special, TypeChart.index("ice")
+        else:
+            return defense
+        if numpy is None:
+            return defense * 3 // 2 if boosted and type in defender_types else defense
+        return numpy.where(boosted & (defender_types == type).any(axis=1), defense * 3 // 2, defense)
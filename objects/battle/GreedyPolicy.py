@@ -0,0 +1,18 @@
+from objects.battle.BattlePolicy import BattlePolicy
+from objects.battle.PokeBattle import PokeBattle
+
+class GreedyPolicy(BattlePolicy):
+    '''
+    Always uses the move expected to deal the most damage to the opposing active Pokemon this turn (see `PokeBattle.expected_damage(...)`), and never switches by choice.
+    If no move deals any damage, the first legal move is used.
+    '''
+
+    def choose(self, battle, side : int) -> int:
+        best, best_damage = None, -1.0
+        for action in battle.legal_actions(side):
+            if action >= PokeBattle.SWITCH:
+                break
+            damage = battle.expected_damage(side, action)
+            if damage > best_damage:
+                best, best_damage = action, damage
+        return best
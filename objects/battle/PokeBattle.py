@@ -0,0 +1,489 @@
+import array
+import random
+
+from objects.battle.AbilityRegistry import AbilityRegistry
+from objects.battle.BattleMove import BattleMove
+from objects.battle.BattleState import BattleState
+from objects.battle.DamageCalculator import DamageCalculator
+from objects.type.TypeChart import TypeChart
+
+class PokeBattle:
+    '''
+    A headless singles battle between two teams, played a turn at a time.
+
+    Each turn, both sides choose an action from `legal_actions(...)`, which are ints: the position of one of the active Pokemon's moves (0-3),
+    `PokeBattle.SWITCH + N` to switch to the team member in position N, or `PokeBattle.STRUGGLE` when the active Pokemon has no PP left.
+    Switches happen first, then moves in order of priority and Speed, with ties broken at random. Damage is one of the random rolls from the `DamageCalculator`.
+    A Pokemon that faints is replaced by the next healthy member of its team (in team order) at the end of the turn, and a side loses when its whole team has fainted.
+    Abilities take effect through the hooks of their `BattleAbility` (see `AbilityRegistry`), which are only called in the phases they're subscribed to.
+
+    Every random decision is taken from the battle's own RNG, so a battle played with the same seed and the same choices always has the same result.
+    Everything that changes as the battle is played is kept in its `state` (see `BattleState`), so a position can be saved and returned to with `state.snapshot()` and `state.restore(...)`.
+
+    Usage:
+        battle = PokeBattle((team, other_team), seed=42)
+        battle.play((RandomPolicy(), GreedyPolicy()))  # 0 if the first team won, 1 if the second team won, or PokeBattle.DRAW
+    '''
+
+    # The first switch action; SWITCH + N switches to the team member in position N.
+    SWITCH = 4
+    # The action of a Pokemon with no PP left.
+    STRUGGLE = -1
+    # The result of a battle neither side won.
+    DRAW = -1
+    # The number of turns after which a battle is declared a draw.
+    MAX_TURNS = 500
+    # Statuses.
+    HEALTHY = BattleState.HEALTHY
+    BURNED = BattleState.BURNED
+    PARALYSED = BattleState.PARALYSED
+
+    # The positions of the stats a physical or special move attacks with and against, in `BattlePokemon.STATS`.
+    _ATTACKING = ((1, 2), (3, 4))
+    _SPEED = 5
+    _FIRE = TypeChart.index("fire")
+    _ELECTRIC = TypeChart.index("electric")
+    # The stat stages of a Pokemon that has just switched in.
+    _NO_STAGES = array.array("i", [0] * len(BattleMove.STATS))
+
+    def __init__(self, teams : tuple, generation : int = 8, seed = None, weather : str = "", max_turns : int = MAX_TURNS, calculator : DamageCalculator | None = None):
+        '''
+        Create a battle.
+
+        Arguments:
+            teams (tuple[list[BattlePokemon], list[BattlePokemon]]): The two teams. The first member of each team leads.
+            generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+            seed: The seed of the battle's RNG (anything `random.Random` accepts), or None for a random seed.
+            weather (str): The weather at the start of the battle (see `BattleState.WEATHERS`). Defaults to none.
+            max_turns (int): The number of turns after which the battle is a draw. Defaults to `PokeBattle.MAX_TURNS`.
+            calculator (DamageCalculator | None): The damage calculator to use, which should be for the same generation. Sharing one between battles shares its remembered rolls.
+        Raises:
+            ValueError: If either team is empty, or the weather is not known.
+        '''
+        if len(teams) != 2 or len(teams[0]) == 0 or len(teams[1]) == 0:
+            raise ValueError("A battle needs two teams of at least one Pokemon.")
+        self.teams = (tuple(teams[0]), tuple(teams[1]))
+        self.generation = generation
+        self.calculator = calculator if calculator is not None else DamageCalculator(generation)
+        self.random = random.Random(seed)
+        self.max_turns = max_turns
+        # Burn deals 1/8 of the maximum HP each turn before Generation 7, and 1/16 since. Paralysis quarters Speed before Generation 7, and halves it since.
+        self.burn_fraction = 8 if generation < 7 else 16
+        self.paralysis_speed = 4 if generation < 7 else 2
+        self.state = BattleState(self.teams, weather)
+        # The handlers of the teams' abilities' hooks.
+        self.hooks = AbilityRegistry.dispatch(self.teams)
+        # The move behind the last damage each side's active Pokemon took this turn (None for other damage), for abilities to react to.
+        self.last_damage = [None, None]
+        # The leads are sent out.
+        for side in (0, 1):
+            self.__dispatch("on_summon", side)
+
+    @property
+    def turn(self) -> int:
+        '''
+        The number of turns played.
+        '''
+        return self.state.data[BattleState.TURN]
+
+    @property
+    def winner(self):
+        '''
+        0 or 1 once a side has won, `PokeBattle.DRAW` for a draw, or None while the battle goes on.
+        '''
+        winner = self.state.data[BattleState.WINNER]
+        return None if winner == BattleState.ONGOING else winner
+
+    @property
+    def weather(self) -> str:
+        '''
+        The current weather, or "" for none.
+        '''
+        return BattleState.WEATHERS[self.state.data[BattleState.WEATHER]]
+
+    def active(self, side : int) -> int:
+        '''
+        Retrieve the position of a side's active Pokemon in its team.
+
+        Arguments:
+            side (int): The side (0 or 1).
+        Returns:
+            int: The position of the active Pokemon.
+        '''
+        return self.state.data[self.state.sides[side] + BattleState.ACTIVE]
+
+    def active_pokemon(self, side : int):
+        '''
+        Retrieve a side's active Pokemon.
+
+        Arguments:
+            side (int): The side (0 or 1).
+        Returns:
+            BattlePokemon: The active Pokemon.
+        '''
+        return self.teams[side][self.active(side)]
+
+    def hp(self, side : int, member : int | None = None) -> int:
+        '''
+        Retrieve the remaining HP of a team member.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            member (int | None): The position of the member in its team, or None for the active Pokemon.
+        Returns:
+            int: The remaining HP.
+        '''
+        return self.state.data[self.state.member(side, self.active(side) if member is None else member) + BattleState.HP]
+
+    def status(self, side : int, member : int | None = None) -> int:
+        '''
+        Retrieve the status of a team member.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            member (int | None): The position of the member in its team, or None for the active Pokemon.
+        Returns:
+            int: The status, e.g. `PokeBattle.BURNED`.
+        '''
+        return self.state.data[self.state.member(side, self.active(side) if member is None else member) + BattleState.STATUS]
+
+    def stage(self, side : int, stat : str) -> int:
+        '''
+        Retrieve a stat stage of a side's active Pokemon.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            stat (str): The stat, one of `BattleMove.STATS`.
+        Returns:
+            int: The stage, from -6 to 6.
+        '''
+        return self.state.data[self.state.sides[side] + BattleState.STAGES + BattleMove.STATS.index(stat)]
+
+    def damage(self, side : int, amount : int, move : BattleMove | None = None) -> int:
+        '''
+        Deal damage to a side's active Pokemon, which faints if its HP reaches 0.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            amount (int): The damage.
+            move (BattleMove | None): The move dealing the damage, or None for any other damage (e.g. a burn or recoil).
+        Returns:
+            int: The damage actually dealt, which is at most the Pokemon's remaining HP.
+        '''
+        offset = self.state.active(side) + BattleState.HP
+        data = self.state.data
+        hp = data[offset]
+        if hp == 0:
+            return 0
+        dealt = min(amount, hp)
+        data[offset] = hp - dealt
+        self.last_damage[side] = move
+        if dealt == hp:
+            self.__dispatch("on_faint", side)
+        return dealt
+
+    def set_status(self, side : int, status : int) -> bool:
+        '''
+        Give a side's active Pokemon a status, unless it already has one, has fainted, or is immune (Fire types to burns, and Electric types to paralysis since Generation 6).
+
+        Arguments:
+            side (int): The side (0 or 1).
+            status (int): The status, e.g. `PokeBattle.BURNED`.
+        Returns:
+            bool: Whether the Pokemon was given the status.
+        '''
+        offset = self.state.active(side)
+        data = self.state.data
+        if data[offset + BattleState.HP] == 0 or data[offset + BattleState.STATUS] != PokeBattle.HEALTHY:
+            return False
+        types = self.active_pokemon(side).types
+        if (status == PokeBattle.BURNED and PokeBattle._FIRE in types) or (status == PokeBattle.PARALYSED and self.generation >= 6 and PokeBattle._ELECTRIC in types):
+            return False
+        data[offset + BattleState.STATUS] = status
+        return True
+
+    def boost(self, side : int, stat : str, change : int):
+        '''
+        Change a stat stage of a side's active Pokemon, within -6 to 6.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            stat (str): The stat, one of `BattleMove.STATS`.
+            change (int): The number of stages to raise (or, if negative, lower) the stat by.
+        '''
+        offset = self.state.sides[side] + BattleState.STAGES + BattleMove.STATS.index(stat)
+        self.state.data[offset] = min(max(self.state.data[offset] + change, -6), 6)
+
+    def legal_actions(self, side : int) -> list:
+        '''
+        Retrieve the actions a side may choose this turn.
+
+        Arguments:
+            side (int): The side (0 or 1).
+        Returns:
+            list[int]: The actions: every move with PP left (or only `PokeBattle.STRUGGLE` if there are none), then every switch to a healthy member. Empty once the battle is over.
+        '''
+        state = self.state
+        data = state.data
+        if data[BattleState.WINNER] != BattleState.ONGOING:
+            return []
+        active = data[state.sides[side] + BattleState.ACTIVE]
+        offset = state.member(side, active) + BattleState.PP
+        actions = [move for move, pp in enumerate(data[offset:offset + 4]) if pp > 0] or [PokeBattle.STRUGGLE]
+        # Every member's HP, taken in one strided slice.
+        offset = state.member(side, 0) + BattleState.HP
+        actions.extend(PokeBattle.SWITCH + member for member, hp in enumerate(data[offset:offset + BattleState.MEMBER * state.sizes[side]:BattleState.MEMBER]) if hp > 0 and member != active)
+        return actions
+
+    def move(self, side : int, action : int) -> BattleMove:
+        '''
+        Retrieve the move a move action uses.
+
+        Arguments:
+            side (int): The side (0 or 1).
+            action (int): The action, which must not be a switch.
+        Returns:
+            BattleMove: The move.
+        '''
+        if action == PokeBattle.STRUGGLE:
+            return BattleMove.STRUGGLE
+        state = self.state
+        return self.teams[side][state.data[state.sides[side] + BattleState.ACTIVE]].moves[action]
+
+    def expected_damage(self, side : int, action : int) -> float:
+        '''
+        Estimate the damage an action would deal to the opposing active Pokemon: its average over the random rolls and critical hits, weighted by its accuracy.
+
+        Arguments:
+            side (int): The attacking side (0 or 1).
+            action (int): The action.
+        Returns:
+            float: The expected damage, or 0.0 for a switch or a move that deals no damage.
+        '''
+        if action >= PokeBattle.SWITCH:
+            return 0.0
+        state = self.state
+        data = state.data
+        attacker_side, defender_side = state.sides[side], state.sides[1 - side]
+        user = data[attacker_side + BattleState.ACTIVE]
+        attacker = self.teams[side][user]
+        move = BattleMove.STRUGGLE if action == PokeBattle.STRUGGLE else attacker.moves[action]
+        if move.power == 0:
+            return 0.0
+        defender = self.teams[1 - side][data[defender_side + BattleState.ACTIVE]]
+        attacking, defending = PokeBattle._ATTACKING[move.special]
+        damage = self.calculator.expected(attacker.level, attacker.stats[attacking], defender.stats[defending], move.power, move.type, attacker.types, defender.types,
+                                          move.critical_stage, special=move.special, attack_stage=data[attacker_side + BattleState.STAGES + attacking - 1],
+                                          defense_stage=data[defender_side + BattleState.STAGES + defending - 1],
+                                          burned=data[state.member(side, user) + BattleState.STATUS] == PokeBattle.BURNED, weather=BattleState.WEATHERS[data[BattleState.WEATHER]],
+                                          attacker_ability=attacker.ability, defender_ability=defender.ability)
+        return damage if move.accuracy is None else damage * move.accuracy / 100
+
+    def step(self, first : int, second : int):
+        '''
+        Play a turn.
+
+        Arguments:
+            first (int): The action of the first side, from `legal_actions(0)`.
+            second (int): The action of the second side, from `legal_actions(1)`.
+        Returns:
+            int | None: The winner once the battle is over (see `winner`), otherwise None.
+        Raises:
+            ValueError: If the battle is already over, or either action isn't legal.
+        '''
+        state = self.state
+        data = state.data
+        if data[BattleState.WINNER] != BattleState.ONGOING:
+            raise ValueError("The battle is already over.")
+        actions = (first, second)
+        for side in (0, 1):
+            if not self.__legal(side, actions[side]):
+                raise ValueError(f"Action {actions[side]} is not legal for side {side}. Expected one of {', '.join(str(action) for action in self.legal_actions(side))}.")
+        self.last_damage = [None, None]
+        for side in (0, 1):
+            self.__dispatch("pre_turn", side)
+        # Both tie-breakers are drawn every turn, so the RNG advances the same way whichever actions were chosen.
+        ties = (self.random.random(), self.random.random())
+        for side in sorted((0, 1), key=lambda side: self.__order(side, actions[side], ties[side]), reverse=True):
+            action = actions[side]
+            if action >= PokeBattle.SWITCH:
+                self.__switch(side, action - PokeBattle.SWITCH)
+            elif data[state.active(side) + BattleState.HP] > 0 and data[state.active(1 - side) + BattleState.HP] > 0:
+                # A Pokemon that fainted earlier in the turn doesn't move, and there's nothing to hit once the target has fainted.
+                self.__use(side, action)
+
+        # End of the turn: the field's effects (none yet), then statuses, then fainted Pokemon are replaced.
+        for side in (0, 1):
+            if data[state.active(side) + BattleState.HP] > 0:
+                self.__dispatch("pre_field_tick", side)
+        for side in (0, 1):
+            offset = state.active(side)
+            if data[offset + BattleState.HP] > 0:
+                self.__dispatch("pre_effect_tick", side)
+                if data[offset + BattleState.STATUS] == PokeBattle.BURNED:
+                    self.damage(side, max(self.active_pokemon(side).stats[0] // self.burn_fraction, 1))
+        lost = [False, False]
+        for side in (0, 1):
+            if data[state.active(side) + BattleState.HP] == 0:
+                offset = state.member(side, 0) + BattleState.HP
+                replacement = next((member for member in range(state.sizes[side]) if data[offset + BattleState.MEMBER * member] > 0), None)
+                if replacement is None:
+                    lost[side] = True
+                else:
+                    self.__switch(side, replacement)
+        if not (lost[0] or lost[1]):
+            for side in (0, 1):
+                self.__dispatch("post_turn", side)
+
+        data[BattleState.TURN] += 1
+        if lost[0] or lost[1]:
+            data[BattleState.WINNER] = PokeBattle.DRAW if lost[0] and lost[1] else int(lost[0])
+        elif data[BattleState.TURN] >= self.max_turns:
+            data[BattleState.WINNER] = PokeBattle.DRAW
+        else:
+            return None
+        return data[BattleState.WINNER]
+
+    def play(self, policies : tuple) -> int:
+        '''
+        Play the battle to the end.
+
+        Arguments:
+            policies (tuple[BattlePolicy, BattlePolicy]): The policy choosing each side's actions.
+        Returns:
+            int: The winner: 0 or 1, or `PokeBattle.DRAW`.
+        '''
+        first, second = policies
+        winner = None
+        while winner is None:
+            winner = self.step(first.choose(self, 0), second.choose(self, 1))
+        return winner
+
+    def __legal(self, side : int, action : int) -> bool:
+        '''
+        Internal method checking whether an action is legal, as `action in legal_actions(side)` but without building the list, as it's checked every turn.
+
+        Arguments:
+            side (int): The side.
+            action (int): The action.
+        Returns:
+            bool: Whether the action is legal.
+        '''
+        state = self.state
+        data = state.data
+        active = data[state.sides[side] + BattleState.ACTIVE]
+        if action >= PokeBattle.SWITCH:
+            member = action - PokeBattle.SWITCH
+            return member < state.sizes[side] and member != active and data[state.member(side, member) + BattleState.HP] > 0
+        offset = state.member(side, active) + BattleState.PP
+        if action == PokeBattle.STRUGGLE:
+            return not any(data[offset:offset + 4])
+        return 0 <= action < 4 and data[offset + action] > 0
+
+    def __order(self, side : int, action : int, tie : float) -> tuple:
+        '''
+        Internal method calculating the key an action is ordered by within a turn, highest first.
+
+        Arguments:
+            side (int): The side taking the action.
+            action (int): The action.
+            tie (float): The side's random tie-breaker.
+        Returns:
+            tuple: The key: switches first, then by move priority, then by Speed (with stat stages and paralysis), then at random.
+        '''
+        if action >= PokeBattle.SWITCH:
+            return (1, 0, 0, tie)
+        data = self.state.data
+        offset = self.state.sides[side]
+        pokemon = self.teams[side][data[offset + BattleState.ACTIVE]]
+        numerator, denominator = DamageCalculator.STAGES[data[offset + BattleState.STAGES + PokeBattle._SPEED - 1]]
+        speed = pokemon.stats[PokeBattle._SPEED] * numerator // denominator
+        if data[self.state.active(side) + BattleState.STATUS] == PokeBattle.PARALYSED:
+            speed //= self.paralysis_speed
+        priority = BattleMove.STRUGGLE.priority if action == PokeBattle.STRUGGLE else pokemon.moves[action].priority
+        return (0, priority, speed, tie)
+
+    def __switch(self, side : int, member : int):
+        '''
+        Internal method switching a side's active Pokemon, which resets its stat stages, and sending out the new one.
+
+        Arguments:
+            side (int): The side.
+            member (int): The position of the team member to switch to.
+        '''
+        offset = self.state.sides[side]
+        self.state.data[offset + BattleState.ACTIVE] = member
+        self.state.data[offset + BattleState.STAGES:offset + BattleState.SIDE] = PokeBattle._NO_STAGES
+        self.__dispatch("on_summon", side)
+
+    def __dispatch(self, hook : str, side : int, *arguments):
+        '''
+        Internal method calling a hook of the ability of a side's active Pokemon, if its ability is subscribed to the hook.
+
+        Arguments:
+            hook (str): The name of the hook (see `BattleAbility.HOOKS`).
+            side (int): The side.
+            *arguments: Any further arguments of the hook.
+        '''
+        handlers = self.hooks[hook]
+        if handlers is None:
+            # No Pokemon in the battle has an ability subscribed to the hook.
+            return
+        handler = handlers[side][self.state.data[self.state.sides[side] + BattleState.ACTIVE]]
+        if handler is not None:
+            handler(self, side, *arguments)
+
+    def __use(self, side : int, action : int):
+        '''
+        Internal method using a move against the opposing active Pokemon.
+
+        Arguments:
+            side (int): The side using the move.
+            action (int): The move action.
+        '''
+        rng = self.random
+        state = self.state
+        data = state.data
+        other = 1 - side
+        attacker_side, defender_side = state.sides[side], state.sides[other]
+        user, target = data[attacker_side + BattleState.ACTIVE], data[defender_side + BattleState.ACTIVE]
+        attacker, defender = self.teams[side][user], self.teams[other][target]
+        move = BattleMove.STRUGGLE if action == PokeBattle.STRUGGLE else attacker.moves[action]
+        # The offsets of the user's and the target's values.
+        user, target = state.member(side, user), state.member(other, target)
+        if data[user + BattleState.STATUS] == PokeBattle.PARALYSED and rng.random() < 0.25:
+            # Fully paralysed, so the move isn't used at all.
+            return
+        if action != PokeBattle.STRUGGLE:
+            data[user + BattleState.PP + action] -= 1
+        self.__dispatch("pre_user_damage", side, move)
+        self.__dispatch("pre_target_damage", other, move)
+        if move.accuracy is not None and rng.random() * 100 >= move.accuracy:
+            return
+
+        if move.power > 0:
+            attacking, defending = PokeBattle._ATTACKING[move.special]
+            critical = rng.random() < self.calculator.critical_chance(move.critical_stage)
+            rolls = self.calculator.rolls(attacker.level, attacker.stats[attacking], defender.stats[defending], move.power, move.type, attacker.types, defender.types,
+                                          move.special, data[attacker_side + BattleState.STAGES + attacking - 1], data[defender_side + BattleState.STAGES + defending - 1], critical,
+                                          data[user + BattleState.STATUS] == PokeBattle.BURNED, BattleState.WEATHERS[data[BattleState.WEATHER]], attacker.ability, defender.ability)
+            damage = rolls[rng.randrange(len(rolls))]
+            if damage == 0:
+                # The target is immune, so none of the move's other effects happen either.
+                return
+            self.damage(other, damage, move)
+            # The target reacts to the hit straight away (e.g. Rough Skin), even if it fainted, as it's only replaced at the end of the turn.
+            self.__dispatch("post_target_damage", other, move)
+            if move is BattleMove.STRUGGLE:
+                self.damage(side, max(attacker.stats[0] // 4, 1))
+
+        # Secondary effects.
+        if move.burn_chance > 0 and data[target + BattleState.HP] > 0 and data[target + BattleState.STATUS] == PokeBattle.HEALTHY and PokeBattle._FIRE not in defender.types:
+            if move.burn_chance >= 100 or rng.random() * 100 < move.burn_chance:
+                self.set_status(other, PokeBattle.BURNED)
+        if len(move.stat_changes) > 0:
+            affected, stages = (user, attacker_side) if move.targets_user else (target, defender_side)
+            if data[affected + BattleState.HP] > 0 and (move.stat_chance >= 100 or rng.random() * 100 < move.stat_chance):
+                stages += BattleState.STAGES
+                for stat, change in move.stat_changes:
+                    data[stages + stat] = min(max(data[stages + stat] + change, -6), 6)
@@ -0,0 +1,10 @@
+from objects.battle.BattlePolicy import BattlePolicy
+
+class RandomPolicy(BattlePolicy):
+    '''
+    Chooses uniformly at random between every legal action, including switches.
+    '''
+
+    def choose(self, battle, side : int) -> int:
+        actions = battle.legal_actions(side)
+        return actions[battle.random.randrange(len(actions))]
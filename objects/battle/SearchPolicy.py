@@ -0,0 +1,235 @@
+import math
+import random
+import time
+
+from objects.Logger import Logger
+from objects.battle.BattleMove import BattleMove
+from objects.battle.BattlePolicy import BattlePolicy
+from objects.battle.BattleState import BattleState
+from objects.battle.PokeBattle import PokeBattle
+
+class SearchPolicy(BattlePolicy):
+    '''
+    Chooses actions with a Monte Carlo tree search through the battle engine, for as long as its budget allows.
+
+    Both sides act at once each turn, so the search is "decoupled": at every position, each side picks its own action with UCB1 (the action with the best average result so far,
+    plus a bonus for actions tried less often), knowing only its own statistics. Each simulation plays turns from the current position this way until it reaches a position not searched before,
+    scores that position by the fraction of HP each team has left (or by who won), and adds the score to the statistics of every action on the way.
+    The turns' random outcomes (accuracy, critical hits, damage rolls...) are sampled by the engine as it plays, so averages are over them too.
+    The engine's state is saved and restored with `BattleState` snapshots, so nothing is copied.
+
+    To make the most of the budget:
+      - Actions not tried yet at a position are tried in order of how hard they hit on the type chart (power x effectiveness x STAB), switches last,
+        so with a small budget the promising moves are the ones explored.
+      - Positions' statistics are kept in a transposition table keyed by the position, shared by every order of actions reaching it, and reused by the next turn's search in the same battle.
+        The table is emptied when a new battle starts (or the policy is reset), so a battle's choices never depend on earlier battles.
+
+    After each choice, `statistics` holds the nodes (turns simulated), simulations, positions in the table, time taken and nodes per second, for tuning the budget.
+
+    Usage:
+        policy = SearchPolicy(time_limit=0.1)
+        battle.play((policy, GreedyPolicy()))
+        policy.statistics["nodes_per_second"]
+    '''
+
+    # The number of positions kept in the transposition table. Once it's full, a search stops adding positions, and the next choice empties it.
+    TABLE_SIZE = 200000
+    # The weight of UCB1's exploration bonus. Scores are between -1 and 1.
+    EXPLORATION = 0.7
+
+    def __init__(self, time_limit : float | None = 0.5, max_nodes : int | None = None, max_depth : int = 8, logger : Logger = Logger.no_logger()):
+        '''
+        Create a search policy.
+
+        Arguments:
+            time_limit (float | None): The wall-clock time to search for each choice, in seconds, or None for no limit. Defaults to 0.5.
+            max_nodes (int | None): The number of nodes (turns simulated) to search for each choice, or None for no limit. Unlike a time limit, this makes a seeded battle's choices reproducible. Defaults to none.
+            max_depth (int): The number of turns a simulation looks ahead at most. Defaults to 8.
+            logger (Logger): The logger the statistics of each search are logged to, as debug messages. Defaults to no logger.
+        Raises:
+            ValueError: If the search has neither a time nor a node limit.
+        '''
+        if time_limit is None and max_nodes is None:
+            raise ValueError("A search needs a time limit or a node limit.")
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.logger = logger
+        # Position -> its statistics (see `__expand(...)`), kept between choices in the same battle.
+        self._table = {}
+        self._battle = None
+        self.statistics = {}
+
+    def reset(self):
+        self._table.clear()
+        self._battle = None
+
+    def __getstate__(self) -> dict:
+        # A copy (e.g. one sent to a BattleRunner's workers) starts with an empty table, rather than carrying this one's along.
+        state = self.__dict__.copy()
+        state["_table"] = {}
+        state["_battle"] = None
+        return state
+
+    def choose(self, battle, side : int) -> int:
+        actions = battle.legal_actions(side)
+        if len(actions) == 1:
+            return actions[0]
+        state = battle.state
+        root = state.snapshot()
+        # Statistics are only reused within a battle, so its choices depend on its own seed and history alone.
+        if self._battle is not battle or len(self._table) >= SearchPolicy.TABLE_SIZE:
+            self._table.clear()
+            self._battle = battle
+        maximum_hp = tuple(tuple(pokemon.stats[0] for pokemon in team) for team in battle.teams)
+        # The search draws from its own RNG, seeded from the battle's, so the battle's RNG advances the same way however much is searched.
+        battle_random = battle.random
+        battle.random = random.Random(battle_random.random())
+        start = time.perf_counter()
+        nodes = simulations = 0
+        try:
+            while True:
+                if self.max_nodes is not None and nodes >= self.max_nodes:
+                    break
+                if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                    break
+                nodes += self.__simulate(battle, maximum_hp)
+                simulations += 1
+                state.restore(root)
+        finally:
+            state.restore(root)
+            battle.random = battle_random
+        elapsed = time.perf_counter() - start
+
+        # The most visited action is the most reliable; its average breaks ties.
+        node = self._table.get(state.key())
+        best = actions[0]
+        if node is not None:
+            counts, totals = node[2 + side], node[4 + side]
+            best = node[side][max(range(len(counts)), key=lambda action: (counts[action], totals[action] / counts[action] if counts[action] > 0 else 0.0))]
+        self.statistics = {
+            "nodes": nodes,
+            "simulations": simulations,
+            "positions": len(self._table),
+            "seconds": elapsed,
+            "nodes_per_second": nodes / elapsed if elapsed > 0 else 0.0,
+        }
+        self.logger.debug(f"Searched {nodes} nodes in {simulations} simulations in {elapsed * 1000:.1f}ms ({self.statistics['nodes_per_second']:.0f} nodes/s, {len(self._table)} positions).")
+        return best
+
+    def __simulate(self, battle, maximum_hp : tuple) -> int:
+        '''
+        Internal method running one simulation from the current position, and adding its result to the statistics of the positions it passed through.
+
+        Arguments:
+            battle (PokeBattle): The battle, at the position to search. Left wherever the simulation ended.
+            maximum_hp (tuple[tuple[int]]): The maximum HP of every member of each team.
+        Returns:
+            int: The number of turns simulated.
+        '''
+        state = battle.state
+        data = state.data
+        table = self._table
+        path = []
+        while True:
+            if data[BattleState.WINNER] != BattleState.ONGOING:
+                winner = data[BattleState.WINNER]
+                score = 1.0 if winner == 0 else -1.0 if winner == 1 else 0.0
+                break
+            key = state.key()
+            node = table.get(key)
+            if node is None or len(path) == self.max_depth:
+                if node is None and len(table) < SearchPolicy.TABLE_SIZE:
+                    table[key] = self.__expand(battle)
+                score = self.__evaluate(battle, maximum_hp)
+                break
+            first, second = SearchPolicy.__select(node, 0), SearchPolicy.__select(node, 1)
+            path.append((node, first, second))
+            battle.step(node[0][first], node[1][second])
+
+        # Scores are from the first side's point of view, so the second side's are negated.
+        for node, first, second in path:
+            node[2][first] += 1
+            node[4][first] += score
+            node[3][second] += 1
+            node[5][second] -= score
+            node[6] += 1
+        return len(path)
+
+    @staticmethod
+    def __select(node : list, side : int) -> int:
+        '''
+        Internal helper function choosing a side's action at a position with UCB1.
+
+        Arguments:
+            node (list): The position's statistics.
+            side (int): The side.
+        Returns:
+            int: The position of the action in the node's actions for the side.
+        '''
+        counts, totals = node[2 + side], node[4 + side]
+        # Untried actions first, in their (type chart) order.
+        for action, count in enumerate(counts):
+            if count == 0:
+                return action
+        exploration = SearchPolicy.EXPLORATION * math.sqrt(math.log(node[6]))
+        best, best_score = 0, -math.inf
+        for action, count in enumerate(counts):
+            score = totals[action] / count + exploration / math.sqrt(count)
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    @staticmethod
+    def __expand(battle) -> list:
+        '''
+        Internal helper function creating the statistics of a position.
+
+        Arguments:
+            battle (PokeBattle): The battle, at the position.
+        Returns:
+            list: The statistics: each side's actions (ordered by `__ordered(...)`), each side's visit count and total score for each action, then the position's visit count.
+        '''
+        first = SearchPolicy.__ordered(battle, 0, battle.legal_actions(0))
+        second = SearchPolicy.__ordered(battle, 1, battle.legal_actions(1))
+        return [first, second, [0] * len(first), [0] * len(second), [0.0] * len(first), [0.0] * len(second), 0]
+
+    @staticmethod
+    def __evaluate(battle, maximum_hp : tuple) -> float:
+        '''
+        Internal helper function scoring a position from the first side's point of view: the fraction of HP its team has left, minus the second team's, scaled to between -1 and 1.
+
+        Arguments:
+            battle (PokeBattle): The battle, at the position.
+            maximum_hp (tuple[tuple[int]]): The maximum HP of every member of each team.
+        Returns:
+            float: The score.
+        '''
+        state = battle.state
+        data = state.data
+        remaining = []
+        for team in (0, 1):
+            offset = state.member(team, 0) + BattleState.HP
+            remaining.append(sum(hp / maximum for hp, maximum in zip(data[offset:offset + BattleState.MEMBER * state.sizes[team]:BattleState.MEMBER], maximum_hp[team])))
+        return (remaining[0] - remaining[1]) / max(state.sizes)
+
+    @staticmethod
+    def __ordered(battle, side : int, actions : list) -> list:
+        '''
+        Internal helper function ordering a side's actions by how hard each move hits the opposing active Pokemon on the type chart, hardest first, with switches last.
+
+        Arguments:
+            battle (PokeBattle): The battle.
+            side (int): The side.
+            actions (list[int]): The side's legal actions.
+        Returns:
+            list[int]: The actions, ordered.
+        '''
+        attacker, defender = battle.active_pokemon(side), battle.active_pokemon(1 - side)
+        profile = battle.calculator.chart.defensive_profile(*defender.types)
+        def strength(action : int) -> float:
+            if action >= PokeBattle.SWITCH:
+                return -1.0
+            move = BattleMove.STRUGGLE if action == PokeBattle.STRUGGLE else attacker.moves[action]
+            return move.power * profile[move.type] * (1.5 if move.type in attacker.types else 1.0)
+        return sorted(actions, key=strength, reverse=True)
@@ -0,0 +1,15 @@
+from objects.battle.BattleAbility import BattleAbility
+
+class AftermathAbility(BattleAbility):
+    '''
+    Aftermath: when the holder is knocked out by a physical (contact) move, the attacker loses 1/4 of its maximum HP.
+    '''
+
+    name = "aftermath"
+
+    def on_faint(self, battle, side : int):
+        # Check the damage that knocked the holder out was from a physical attack, and that the attacker hasn't fainted too.
+        move = battle.last_damage[side]
+        if move is None or move.special or battle.hp(1 - side) == 0:
+            return
+        battle.damage(1 - side, max(battle.active_pokemon(1 - side).stats[0] // 4, 1))
@@ -0,0 +1,12 @@
+from objects.battle.BattleAbility import BattleAbility
+
+class IntimidateAbility(BattleAbility):
+    '''
+    Intimidate: when the holder is sent out, the opposing Pokemon's Attack falls by one stage.
+    '''
+
+    name = "intimidate"
+
+    def on_summon(self, battle, side : int):
+        if battle.hp(1 - side) > 0:
+            battle.boost(1 - side, "attack", -1)
@@ -0,0 +1,13 @@
+from objects.battle.BattleAbility import BattleAbility
+
+class RoughSkinAbility(BattleAbility):
+    '''
+    Rough Skin: a Pokemon that hits the holder with a physical (contact) move loses 1/8 of its maximum HP.
+    '''
+
+    name = "rough-skin"
+
+    def post_target_damage(self, battle, side : int, move):
+        if move.special or battle.hp(1 - side) == 0:
+            return
+        battle.damage(1 - side, max(battle.active_pokemon(1 - side).stats[0] // 8, 1))
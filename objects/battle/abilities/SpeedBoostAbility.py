@@ -0,0 +1,12 @@
+from objects.battle.BattleAbility import BattleAbility
+
+class SpeedBoostAbility(BattleAbility):
+    '''
+    Speed Boost: the holder's Speed rises by one stage at the end of every turn.
+    '''
+
+    name = "speed-boost"
+
+    def post_turn(self, battle, side : int):
+        if battle.hp(side) > 0:
+            battle.boost(side, "speed", 1)
@@ -0,0 +1,17 @@
+from objects.battle.BattleAbility import BattleAbility
+from objects.battle.BattleState import BattleState
+
+class StaticAbility(BattleAbility):
+    '''
+    Static: a Pokemon that hits the holder with a physical (contact) move has a 30% chance of being paralysed.
+    '''
+
+    name = "static"
+
+    def post_target_damage(self, battle, side : int, move):
+        # Check the hit was a physical attack, and that the attacker is still there to be paralysed.
+        if move.special or battle.hp(1 - side) == 0:
+            return
+        # Chance check: 30% to apply paralysis.
+        if battle.random.random() < 0.3:
+            battle.set_status(1 - side, BattleState.PARALYSED)
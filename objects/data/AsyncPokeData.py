@@ -0,0 +1,172 @@
+import asyncio
+
+from objects.api.AsyncPokeSession import AsyncPokeSession
+from objects.api.PokeRegistry import PokeRegistry
+from objects.data.PokeAbilityData import PokeAbilityData
+from objects.data.PokeData import PokeData
+from objects.Logger import Logger
+
+class AsyncPokeData:
+    '''
+    The async variant of PokeData, loading a Pokemon together with its child resources.
+
+    `AsyncPokeData.fetch(...)` fetches the Pokemon, then fetches all of the requested child resources (abilities, forms, species, moves) concurrently, rather than one after another.
+    `AsyncPokeData.fetch_team(...)` does the same for several Pokemon at once, so a whole team loads in roughly the latency of a couple of round-trips.
+
+    Abilities and forms are loaded into regular PokeAbilityData and PokeData objects and registered in the identity map, so calling `get_abilities()` or `get_forms()` on the resulting PokeData afterwards sends no requests.
+    Species and moves have no data objects yet, so their raw JSON data is kept instead.
+
+    Requires the optional 'aiohttp' package.
+    '''
+
+    # Child resources fetched when `include` is not given. Moves are left out by default, as popular Pokemon learn hundreds of them.
+    DEFAULT_INCLUDE = ("abilities", "forms", "species")
+
+    def __init__(self, pokemon : PokeData, abilities : list = [], forms : list = [], species : dict | None = None, moves : list = []):
+        self.pokemon = pokemon
+        self.abilities = abilities
+        self.forms = forms
+        self.species = species
+        self.moves = moves
+
+    def get_pokemon(self) -> PokeData:
+        '''
+        Retrieve the loaded Pokemon.
+
+        Arguments:
+            None
+        Returns:
+            PokeData: The Pokemon.
+        '''
+        return self.pokemon
+
+    def get_abilities(self) -> list:
+        '''
+        Retrieve the loaded abilities of the Pokemon, in the order they are listed by the API.
+
+        Arguments:
+            None
+        Returns:
+            list[PokeAbilityData]: The abilities of the Pokemon. Empty if abilities were not included.
+        '''
+        return self.abilities
+
+    def get_forms(self) -> list:
+        '''
+        Retrieve the loaded forms of the Pokemon.
+
+        Arguments:
+            None
+        Returns:
+            list[PokeData]: The forms of the Pokemon. Empty if forms were not included.
+        '''
+        return self.forms
+
+    def get_species(self) -> dict | None:
+        '''
+        Retrieve the raw species data of the Pokemon.
+
+        Arguments:
+            None
+        Returns:
+            dict | None: The JSON data of the species, or None if the species was not included.
+        '''
+        return self.species
+
+    def get_moves(self) -> list:
+        '''
+        Retrieve the raw data of every move the Pokemon can learn.
+
+        Arguments:
+            None
+        Returns:
+            list[dict]: The JSON data of each move. Empty if moves were not included.
+        '''
+        return self.moves
+
+    @staticmethod
+    async def fetch(name : str = "", url : str = "", include : tuple = DEFAULT_INCLUDE, session : AsyncPokeSession | None = None, concurrency : int = 16, logger : Logger = Logger.no_logger()):
+        '''
+        Fetch a Pokemon and its child resources.
+
+        Child resources are fetched concurrently, at most `concurrency` requests at a time.
+        Any resource already loaded in this process is re-used rather than fetched again.
+
+        Arguments:
+            name (str): The name of the Pokemon.
+            url (str): The URL of the Pokemon. Used if no name is provided.
+            include (tuple[str]): The child resources to fetch. Any of "abilities", "forms", "species" and "moves".
+            session (AsyncPokeSession | None): The session to fetch with. If None, a session is created for this call and closed afterwards.
+            concurrency (int): The maximum number of requests in flight, when a session is created for this call.
+            logger (Logger): The logger to use.
+        Returns:
+            AsyncPokeData: The Pokemon, and its child resources.
+        '''
+        if session is None:
+            async with AsyncPokeSession(concurrency=concurrency, logger=logger) as session:
+                return await AsyncPokeData.fetch(name=name, url=url, include=include, session=session, logger=logger)
+
+        if name != "": url = session.resource_url("pokemon", name)
+        elif url == "": raise ValueError("Either name or url must be provided.")
+
+        pokemon = PokeRegistry.default_registry().get(url)
+        if not isinstance(pokemon, PokeData) or not pokemon.is_loaded():
+            pokemon = PokeData.from_data(await session.fetch(url, logger=logger), url=url, logger=logger)
+        data = pokemon._raw_data()
+
+        # Every child resource is scheduled up front, and awaited together.
+        ability_urls = [ability.get("ability", {}).get("url", "") for ability in data.get("abilities", [])] if "abilities" in include else []
+        form_urls = [form.get("url", "") for form in data.get("forms", [])] if "forms" in include else []
+        species_urls = [data.get("species", {}).get("url", "")] if "species" in include and data.get("species") else []
+        move_urls = [move.get("move", {}).get("url", "") for move in data.get("moves", [])] if "moves" in include else []
+
+        results = await asyncio.gather(
+            asyncio.gather(*[AsyncPokeData.__load(session, PokeAbilityData, url, logger) for url in ability_urls]),
+            asyncio.gather(*[AsyncPokeData.__load(session, PokeData, url, logger) for url in form_urls]),
+            asyncio.gather(*[session.fetch(url, logger=logger) for url in species_urls]),
+            asyncio.gather(*[session.fetch(url, logger=logger) for url in move_urls]),
+        )
+        abilities, forms, species, moves = results
+        return AsyncPokeData(pokemon, abilities=list(abilities), forms=list(forms), species=species[0] if len(species) != 0 else None, moves=list(moves))
+
+    @staticmethod
+    async def fetch_team(names_or_urls : list, include : tuple = DEFAULT_INCLUDE, session : AsyncPokeSession | None = None, concurrency : int = 16, logger : Logger = Logger.no_logger()) -> list:
+        '''
+        Fetch several Pokemon and their child resources concurrently.
+
+        Child resources shared between Pokemon (e.g. two Pokemon with Levitate) are only fetched once.
+
+        Arguments:
+            names_or_urls (list[str]): The names or URLs of the Pokemon. Anything containing '://' is treated as a URL.
+            include (tuple[str]): The child resources to fetch. Any of "abilities", "forms", "species" and "moves".
+            session (AsyncPokeSession | None): The session to fetch with. If None, a session is created for this call and closed afterwards.
+            concurrency (int): The maximum number of requests in flight, when a session is created for this call.
+            logger (Logger): The logger to use.
+        Returns:
+            list[AsyncPokeData]: The Pokemon, in the order they were given.
+        '''
+        if session is None:
+            async with AsyncPokeSession(concurrency=concurrency, logger=logger) as session:
+                return await AsyncPokeData.fetch_team(names_or_urls, include=include, session=session, logger=logger)
+        return list(await asyncio.gather(*[
+            AsyncPokeData.fetch(url=entry, include=include, session=session, logger=logger) if "://" in entry else AsyncPokeData.fetch(name=entry, include=include, session=session, logger=logger)
+            for entry in names_or_urls
+        ]))
+
+    @staticmethod
+    async def __load(session : AsyncPokeSession, cls : type, url : str, logger : Logger):
+        '''
+        Internal method for loading a data object, re-using the already-loaded object if there is one.
+
+        Arguments:
+            session (AsyncPokeSession): The session to fetch with.
+            cls (type): The data class, PokeData or PokeAbilityData.
+            url (str): The URL of the resource.
+            logger (Logger): The logger to use.
+        Returns:
+            PokeData | PokeAbilityData: The loaded object.
+        '''
+        existing = PokeRegistry.default_registry().get(url)
+        if isinstance(existing, cls) and existing.is_loaded():
+            return existing
+        return cls.from_data(await session.fetch(url, logger=logger), url=url, logger=logger)
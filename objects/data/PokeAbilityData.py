@@ -1,21 +1,228 @@
+from typing import Any
+
 from objects.Logger import Logger
-import requests
-from requests.exceptions import HTTPError
+from objects.api.PokeProjection import PokeProjection
+from objects.api.PokeRegistry import PokeRegistry
+from objects.api.PokeSession import PokeSession
+from requests.exceptions import ConnectionError as RequestConnectionError, HTTPError
 
 class PokeAbilityData:
-    def __init__(self, name : str = "", url : str = "", logger : Logger = Logger.no_logger()): # type: ignore
-        if name != "": self.url = "https://pokeapi.co/api/v2/ability/" + name
+    # The fields needed by get_name() and get_id().
+    BASIC_FIELDS = ("name", "id")
+
+    def __new__(cls, name : str = "", url : str = "", logger : Logger = Logger.no_logger(), lazy : bool = False, known : dict = {}, fields : tuple = ()):
+        # Return the already-loaded object if this ability has been loaded before, whether by name or by URL.
+        registry = PokeRegistry.default_registry()
+        if name != "": url = PokeSession.default_session().resource_url("ability", name)
+        existing = registry.get(url) if url != "" else None
+        if isinstance(existing, cls):
+            return existing
+        if lazy or url == "":
+            return super().__new__(cls)
+        # Concurrent loads of the same URL wait for the first, and then share its object rather than fetching again.
+        with registry.loading(url):
+            existing = registry.get(url)
+            if isinstance(existing, cls):
+                return existing
+            ability = super().__new__(cls)
+            ability.__init__(url=url, logger=logger, known=known, fields=fields)
+        # If the ability was loaded under another of its URLs meanwhile (e.g. by ID rather than by name), the object registered first is the one kept.
+        registered = registry.get(url)
+        return registered if isinstance(registered, cls) else ability
+
+    def __init__(self, name : str = "", url : str = "", logger : Logger = Logger.no_logger(), lazy : bool = False, known : dict = {}, fields : tuple = ()): # type: ignore
+        '''
+        Load an ability, by name or by URL.
+
+        When `lazy` is True, construction sends no request; the data is fetched on first access instead, and any request failure is raised at that point.
+        Fields already known, either passed in `known` or taken from the name/URL itself, are answered without fetching at all.
+        When `fields` is given, only those top-level fields of the data are decoded and kept; the ID and name are always kept. Reading the whole of `data` later fetches the full data once.
+        Ability data is mostly translated effect and flavour text, so `fields=PokeAbilityData.BASIC_FIELDS` is much lighter when only the name and ID are needed.
+
+        Arguments:
+            name (str): The name of the ability.
+            url (str): The URL of the ability. Used if no name is provided.
+            logger (Logger): The logger to use.
+            lazy (bool): Whether to defer fetching the data until it is first needed. Defaults to False.
+            known (dict): Fields of the ability that are already known, keyed as in the API data (e.g. {"name": "levitate"}).
+            fields (tuple[str]): The top-level fields of the data to keep, keyed as in the API data. If empty, every field is kept.
+        '''
+        # __init__ runs again when __new__ returns an already-registered object, which must be left as-is.
+        # A lazy object still unloaded is fetched now if this construction isn't lazy, so a resource that doesn't exist raises as usual.
+        if getattr(self, "_initialised", False):
+            if not lazy and not self.is_loaded():
+                self._set_data(PokeSession.default_session().fetch(self.url, logger=logger, fields=self._fields))
+            return
+
+        session = PokeSession.default_session()
+        if name != "": self.url = session.resource_url("ability", name)
         elif url != "": self.url = url
         else: raise ValueError("Either name or url must be provided.")
 
         self.logger = logger
+        self._data = None
+        self._fields = tuple(fields)
+        self._known = PokeSession.identity_fields(self.url, known)
+
+        if lazy:
+            # Register the unloaded object straight away, so other lookups of this URL share it (and its eventual fetch).
+            PokeRegistry.default_registry().register(self, self.url)
+            self._initialised = True
+            return
+
+        # Get the data from the response cache, or from the API on a miss. Raises an exception if the request fails.
+        self._set_data(session.fetch(self.url, logger=logger, fields=self._fields))
+
+    @classmethod
+    def from_data(cls, data : dict, url : str = "", logger : Logger = Logger.no_logger(), fields : tuple = ()):
+        '''
+        Create a PokeAbilityData from already-fetched API data, without sending a request.
+
+        If the ability has already been loaded, the existing object is returned instead.
+
+        Arguments:
+            data (dict): The JSON data of the ability, as returned by the API.
+            url (str): The URL the data was fetched from. Defaults to the ID-based URL of the ability.
+            logger (Logger): The logger to use.
+            fields (tuple[str]): The top-level fields of the data to keep. If empty, every field is kept.
+        Returns:
+            PokeAbilityData: The ability.
+        '''
+        if url == "": url = PokeSession.default_session().resource_url("ability", data.get("id", data.get("name", "")))
+        existing = PokeRegistry.default_registry().get(url)
+        if isinstance(existing, cls) and existing.is_loaded():
+            return existing
+        # An unloaded (lazy) object for this URL is filled in rather than replaced, so everyone holding it sees the data.
+        ability = existing if isinstance(existing, cls) else object.__new__(cls)
+        if ability is not existing:
+            ability.url = url
+            ability.logger = logger
+            ability._fields = tuple(fields)
+            ability._known = {}
+        ability._set_data(PokeProjection.project(data, ability._fields))
+        # If the ability was already registered under another of its URLs, the object registered first is the one kept (and loaded, if it wasn't).
+        registered = PokeRegistry.default_registry().get(url)
+        if isinstance(registered, cls) and registered is not ability:
+            if not registered.is_loaded():
+                registered._set_data(PokeProjection.project(data, registered._fields))
+            return registered
+        return ability
+
+    @property
+    def data(self) -> dict:
+        '''
+        The raw data of the ability, fetched on first access if the ability was constructed lazily.
+
+        The object may be shared with callers that asked for a projection, so the first access of a projected ability fetches the full data once (usually from the cache) and drops the projection.
+        '''
+        self._require()
+        return self._data
+
+    def is_loaded(self) -> bool:
+        '''
+        Check whether the data of the ability has been fetched.
+
+        This is always True, unless the ability was constructed lazily and its data has not been needed yet.
+
+        Arguments:
+            None
+        Returns:
+            bool: Whether the data has been fetched.
+        '''
+        return self._data is not None
+
+    def _set_data(self, data : dict):
+        '''
+        Set the loaded data of the ability, and register it so later lookups re-use this object.
+
+        Internal method.
+
+        Arguments:
+            data (dict): The JSON data of the ability.
+        Returns:
+            None
+        '''
+        self._data = data
+        # Register under every URL this resource can be reached by.
+        PokeRegistry.default_registry().register(self, self.url, aliases=PokeSession.resource_aliases(self.url, data))
+        self._initialised = True
+
+    def _get_data(self, key : str, default_return = None) -> Any:
+        '''
+        Retrieve data from the API.
+
+        Arguments:
+            key (str): The key to get data from.
+            default_return (any): The default value to return if the key does not exist.
+        Returns:
+            any: The value of the key in the dictionary, or the provided value OR None if the key doesn't exist.
+        '''
+        self._require(key)
+        return self._data.get(key, default_return)
+
+    def _require(self, key : str | None = None):
+        '''
+        Make sure a field of the data is available, fetching the data if it has not been yet.
+
+        If the ability was loaded with a projection that left the field out, the full data is fetched (usually from the cache) and the projection is dropped.
+
+        Internal method.
+
+        Arguments:
+            key (str | None): The top-level field that is needed, or None if every field is.
+        Returns:
+            None
+        '''
+        if len(self._fields) != 0 and (key is None or (key not in self._fields and key not in PokeProjection.IDENTITY_FIELDS)):
+            if self._data is not None:
+                self.logger.debug(f"'{key or 'every field'}' is not in the projection of '{self.url}', fetching the full data.")
+            self._fields = ()
+            self._set_data(PokeSession.default_session().fetch(self.url, logger=self.logger))
+        elif self._data is None:
+            self._set_data(PokeSession.default_session().fetch(self.url, logger=self.logger, fields=self._fields))
+
+    def get_name(self) -> str:
+        '''
+        Retrieve the name of the ability.
+
+        If the name is already known (e.g. the ability was constructed by name, or from a Pokemon's ability list), no request is made, even for a lazy ability.
 
-        # Get the data from the API.
-        request = requests.get(self.url)
-        # Raise an exception if the request failed.
-        logger.route(request.raise_for_status, raise_exceptions=True)  # type: ignore
-        # Get the data from the request.
-        self.data = request.json()
+        Arguments:
+            None
+        Returns:
+            str: The name of the ability.
+        '''
+        if not self.is_loaded() and "name" in self._known:
+            return self._known["name"]
+        return self._get_data("name", "Unknown")
+
+    def get_id(self) -> int:
+        '''
+        Retrieve the ID of the ability.
+
+        If the ID is already known (e.g. the ability was constructed from an ID-based URL), no request is made, even for a lazy ability.
+
+        Arguments:
+            None
+        Returns:
+            int: The ID of the ability.
+        '''
+        if not self.is_loaded() and "id" in self._known:
+            return self._known["id"]
+        return self._get_data("id", -1)
+
+    def get_url(self) -> str:
+        '''
+        Retrieve the URL of the ability.
+
+        This never requires the data of the ability to be fetched.
+
+        Arguments:
+            None
+        Returns:
+            str: The URL of the ability.
+        '''
+        return self.url
 
     @staticmethod
     def test_connection(name : str = "", url : str = "") -> int:
@@ -26,22 +233,29 @@ class PokeAbilityData:
             name (str): The name of the Ability to test the connection with.
             url (str): The URL of the Ability to test the connection with.
         Returns:
-            int: The response code of the connection test.
+            int: The response code of the connection test, or 503 if the API can't be reached.
         '''
+        session = PokeSession.default_session()
+        if not session.health.is_available():
+            # The API is already known to be unreachable, there is no need to spend a request finding out again.
+            return 503
         try:
             # Test a default connection.
-            default = requests.get("https://pokeapi.co/api/v2/ability/1")
+            default = session.get(session.resource_url("ability", 1))
             default.raise_for_status()
             # If a name is provided, test a connection with the name.
             if len(name) != 0:
-                name_search = requests.get(f"https://pokeapi.co/api/v2/ability/{name}")
+                name_search = session.get(session.resource_url("ability", name))
                 name_search.raise_for_status()
             # If a URL is provided, test a connection with the URL.
             if len(url) != 0:
-                url_search = requests.get(url)
+                url_search = session.get(url)
                 url_search.raise_for_status()
             # All checks have passed, return 'Success' status code
             return 200
         except HTTPError as e:
             # Return the status code of the failed connection.
-            return e.response.status_code
\ No newline at end of file
+            return e.response.status_code
+        except RequestConnectionError:
+            # The API couldn't be reached, or the session won't send requests (the circuit is open, or it's offline).
+            return 503
\ No newline at end of file
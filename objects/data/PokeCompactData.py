@@ -0,0 +1,266 @@
+import copy
+import sys
+import threading
+from array import array
+from typing import Any
+
+class StringTable:
+    '''
+    An append-only table interning strings (and their API URLs) to small integer IDs.
+
+    Compact data objects store these IDs in packed arrays rather than holding their own copies of every move or version group name.
+    A table is shared by every object in the process, so each distinct name is stored once.
+    '''
+
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._urls = []
+        self._lock = threading.Lock()
+
+    def intern(self, name : str, url : str = "") -> int:
+        '''
+        Retrieve the ID of a name, adding it to the table if it is new.
+
+        Arguments:
+            name (str): The name to intern.
+            url (str): The API URL of the named resource, stored alongside the name the first time it is seen.
+        Returns:
+            int: The ID of the name.
+        '''
+        id = self._ids.get(name)
+        if id is not None:
+            return id
+        with self._lock:
+            # Check again, another thread may have added the name while we waited for the lock.
+            id = self._ids.get(name)
+            if id is None:
+                id = len(self._names)
+                self._names.append(sys.intern(name))
+                self._urls.append(sys.intern(url))
+                self._ids[self._names[id]] = id
+        return id
+
+    def name(self, id : int) -> str:
+        '''
+        Retrieve the name with the given ID.
+
+        Arguments:
+            id (int): The ID of the name.
+        Returns:
+            str: The name.
+        '''
+        return self._names[id]
+
+    def url(self, id : int) -> str:
+        '''
+        Retrieve the API URL stored for the name with the given ID.
+
+        Arguments:
+            id (int): The ID of the name.
+        Returns:
+            str: The URL, or an empty string if none was stored.
+        '''
+        return self._urls[id]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+class PokeCompactData:
+    '''
+    A compact, parsed representation of a Pokemon's API data.
+
+    The raw JSON of a popular Pokemon is hundreds of kilobytes, almost all of it the `moves` array, where every move repeats the name and URL of its learn method and version group.
+    PokeCompactData keeps the parts PokeSuite uses in a fixed set of slots instead:
+        - Names are interned, and nested resources (types, abilities, forms) are kept as tuples.
+        - Stats are stored as a packed array of base stats and effort values, against a shared tuple of stat names.
+        - Moves are stored as integer IDs into process-wide string tables, and each move's version group details as packed (move, level, method, version group) quadruples.
+
+    `get(key)` rebuilds any supported section in the same shape as the API data, so PokeData's accessors work unchanged.
+    Only the sections listed in `KEYS` are kept; anything else (e.g. game_indices, or the per-game sprite 'versions') is dropped.
+    '''
+
+    __slots__ = ("name", "id", "height", "weight", "order", "base_experience", "is_default", "types", "stat_names", "stats", "abilities", "forms", "species", "sprites", "moves", "move_details")
+
+    # The API data sections kept by the compact representation.
+    KEYS = ("name", "id", "height", "weight", "order", "base_experience", "is_default", "types", "stats", "abilities", "forms", "species", "sprites", "moves")
+
+    # Process-wide string tables, shared by every compact Pokemon.
+    MOVES = StringTable()
+    LEARN_METHODS = StringTable()
+    VERSION_GROUPS = StringTable()
+    # Every distinct (stat name, stat URL) tuple, so Pokemon share one copy rather than holding their own.
+    _STAT_LAYOUTS = {}
+
+    def __init__(self, data : dict, keys : tuple = KEYS):
+        '''
+        Parse the API data of a Pokemon.
+
+        Arguments:
+            data (dict): The JSON data of the Pokemon, as returned by the API.
+            keys (tuple[str]): The sections of the data to keep. Defaults to every supported section.
+        '''
+        intern = sys.intern
+        self.name = intern(data["name"]) if "name" in keys and data.get("name") is not None else None
+        self.id = data.get("id") if "id" in keys else None
+        self.height = data.get("height") if "height" in keys else None
+        self.weight = data.get("weight") if "weight" in keys else None
+        self.order = data.get("order") if "order" in keys else None
+        self.base_experience = data.get("base_experience") if "base_experience" in keys else None
+        self.is_default = data.get("is_default") if "is_default" in keys else None
+
+        # Types, in slot order, as (name, url) pairs.
+        self.types = tuple(
+            (intern(entry["type"]["name"]), intern(entry["type"]["url"]))
+            for entry in sorted(data.get("types", []), key=lambda entry: entry.get("slot", 0))
+        ) if "types" in keys and "types" in data else None
+
+        if "stats" in keys and "stats" in data:
+            layout = tuple((entry["stat"]["name"], entry["stat"]["url"]) for entry in data["stats"])
+            self.stat_names = PokeCompactData._STAT_LAYOUTS.setdefault(layout, tuple((intern(name), intern(url)) for name, url in layout))
+            # Base stats first, then effort values.
+            self.stats = array("H", [entry.get("base_stat", 0) for entry in data["stats"]] + [entry.get("effort", 0) for entry in data["stats"]])
+        else:
+            self.stat_names = None
+            self.stats = None
+
+        # Abilities as (name, url, is_hidden, slot) tuples.
+        self.abilities = tuple(
+            (intern(entry["ability"]["name"]), intern(entry["ability"]["url"]), bool(entry.get("is_hidden", False)), entry.get("slot", 0))
+            for entry in data.get("abilities", [])
+        ) if "abilities" in keys and "abilities" in data else None
+        self.forms = tuple((intern(entry["name"]), intern(entry["url"])) for entry in data.get("forms", [])) if "forms" in keys and "forms" in data else None
+        species = data.get("species")
+        self.species = (intern(species["name"]), intern(species["url"])) if "species" in keys and species is not None else None
+
+        if "sprites" in keys and "sprites" in data:
+            # The top-level sprites (including missing ones, as None) and the 'other' categories are kept; per-game 'versions' are dropped.
+            sprites = data["sprites"] or {}
+            self.sprites = {intern(key): value for key, value in sprites.items() if value is None or isinstance(value, str)}
+            if isinstance(sprites.get("other"), dict):
+                # Copied, so the data passed in can't change it later.
+                self.sprites["other"] = copy.deepcopy(sprites["other"])
+        else:
+            self.sprites = None
+
+        if "moves" in keys and "moves" in data:
+            moves = PokeCompactData.MOVES
+            methods = PokeCompactData.LEARN_METHODS
+            groups = PokeCompactData.VERSION_GROUPS
+            self.moves = array("H")
+            self.move_details = array("H")
+            for position, entry in enumerate(data["moves"]):
+                move = entry["move"]
+                self.moves.append(moves.intern(move["name"], move["url"]))
+                for detail in entry.get("version_group_details", []):
+                    method = detail["move_learn_method"]
+                    group = detail["version_group"]
+                    self.move_details.extend((position, detail.get("level_learned_at", 0), methods.intern(method["name"], method["url"]), groups.intern(group["name"], group["url"])))
+        else:
+            self.moves = None
+            self.move_details = None
+
+    def has(self, key : str) -> bool:
+        '''
+        Check whether a section of the data was kept.
+
+        Arguments:
+            key (str): The API data key of the section.
+        Returns:
+            bool: Whether the section is available.
+        '''
+        if key == "moves":
+            return self.moves is not None
+        if key == "stats":
+            return self.stats is not None
+        return key in PokeCompactData.KEYS and getattr(self, key) is not None
+
+    def get(self, key : str, default_return = None) -> Any:
+        '''
+        Retrieve a section of the data, rebuilt in the same shape as the API data.
+
+        Arguments:
+            key (str): The API data key of the section.
+            default_return (any): The value to return if the section is not available.
+        Returns:
+            any: The section, or the default value if it was not kept.
+        '''
+        if not self.has(key):
+            return default_return
+        if key in ("name", "id", "height", "weight", "order", "base_experience", "is_default"):
+            return getattr(self, key)
+        if key == "types":
+            return [{"slot": slot + 1, "type": {"name": name, "url": url}} for slot, (name, url) in enumerate(self.types)]
+        if key == "stats":
+            count = len(self.stat_names)
+            return [{"base_stat": self.stats[index], "effort": self.stats[count + index], "stat": {"name": name, "url": url}} for index, (name, url) in enumerate(self.stat_names)]
+        if key == "abilities":
+            return [{"ability": {"name": name, "url": url}, "is_hidden": is_hidden, "slot": slot} for name, url, is_hidden, slot in self.abilities]
+        if key == "forms":
+            return [{"name": name, "url": url} for name, url in self.forms]
+        if key == "species":
+            return {"name": self.species[0], "url": self.species[1]}
+        if key == "sprites":
+            # A deep copy, so changes to the result can't leak into the kept data.
+            return copy.deepcopy(self.sprites)
+        if key == "moves":
+            return self.__rebuild_moves()
+        return default_return
+
+    def get_type_names(self) -> list:
+        '''
+        Retrieve the names of the Pokemon's types, in slot order, without rebuilding the API structure.
+
+        Arguments:
+            None
+        Returns:
+            list[str]: The type names.
+        '''
+        return [name for name, _ in self.types] if self.types is not None else []
+
+    def get_base_stats(self) -> dict:
+        '''
+        Retrieve the Pokemon's base stats by stat name, without rebuilding the API structure.
+
+        Arguments:
+            None
+        Returns:
+            dict: The base stats.
+        '''
+        if self.stats is None:
+            return {}
+        return {name: self.stats[index] for index, (name, _) in enumerate(self.stat_names)}
+
+    def to_json(self) -> dict:
+        '''
+        Rebuild every kept section into a dictionary shaped like the API data.
+
+        Arguments:
+            None
+        Returns:
+            dict: The rebuilt data.
+        '''
+        return {key: self.get(key) for key in PokeCompactData.KEYS if self.has(key)}
+
+    def __rebuild_moves(self) -> list:
+        '''
+        Internal method for rebuilding the moves section from the packed arrays.
+
+        Arguments:
+            None
+        Returns:
+            list: The moves, shaped like the API data.
+        '''
+        moves = PokeCompactData.MOVES
+        methods = PokeCompactData.LEARN_METHODS
+        groups = PokeCompactData.VERSION_GROUPS
+        rebuilt = [{"move": {"name": moves.name(id), "url": moves.url(id)}, "version_group_details": []} for id in self.moves]
+        details = self.move_details
+        for index in range(0, len(details), 4):
+            position, level, method, group = details[index:index + 4]
+            rebuilt[position]["version_group_details"].append({
+                "level_learned_at": level,
+                "move_learn_method": {"name": methods.name(method), "url": methods.url(method)},
+                "version_group": {"name": groups.name(group), "url": groups.url(group)},
+            })
+        return rebuilt
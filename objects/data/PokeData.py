@@ -1,24 +1,163 @@
-from typing import Any
-import requests
-from requests.exceptions import HTTPError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable
+from requests.exceptions import ConnectionError as RequestConnectionError, HTTPError
 
+from objects.api.PokeProjection import PokeProjection
+from objects.api.PokeRegistry import PokeRegistry
+from objects.api.PokeSession import PokeSession
 from objects.data.PokeAbilityData import PokeAbilityData
+from objects.data.PokeCompactData import PokeCompactData
 from objects.Logger import Logger
 
 class PokeData:
-    def __init__(self, name : str = "", url : str = "", logger : Logger = Logger.no_logger()):
-        if name != "": self.url = "https://pokeapi.co/api/v2/pokemon/" + name
+    # The fields needed by get_name(), get_internal_id(), get_default_types() and get_default_stats(), which is all most callers use.
+    BASIC_FIELDS = ("name", "id", "types", "stats")
+
+    def __new__(cls, name : str = "", url : str = "", logger : Logger = Logger.no_logger(), lazy : bool = False, known : dict = {}, compact : bool = False, fields : tuple = ()):
+        # Return the already-loaded object if this Pokemon has been loaded before, whether by name or by URL.
+        registry = PokeRegistry.default_registry()
+        if name != "": url = PokeSession.default_session().resource_url("pokemon", name)
+        existing = registry.get(url) if url != "" else None
+        if isinstance(existing, cls):
+            return existing
+        if lazy or url == "":
+            return super().__new__(cls)
+        # Concurrent loads of the same URL wait for the first, and then share its object rather than fetching again.
+        with registry.loading(url):
+            existing = registry.get(url)
+            if isinstance(existing, cls):
+                return existing
+            pokemon = super().__new__(cls)
+            pokemon.__init__(url=url, logger=logger, known=known, compact=compact, fields=fields)
+        # If the Pokemon was loaded under another of its URLs meanwhile (e.g. by ID rather than by name), the object registered first is the one kept.
+        registered = registry.get(url)
+        return registered if isinstance(registered, cls) else pokemon
+
+    def __init__(self, name : str = "", url : str = "", logger : Logger = Logger.no_logger(), lazy : bool = False, known : dict = {}, compact : bool = False, fields : tuple = ()):
+        '''
+        Load a Pokemon, by name or by URL.
+
+        When `lazy` is True, construction sends no request; the data is fetched on first access instead, and any request failure is raised at that point.
+        Fields already known, either passed in `known` (e.g. the name from a parent listing) or taken from the name/URL itself, are answered without fetching at all.
+        When `compact` is True, the fetched JSON is parsed into a PokeCompactData and discarded, which takes a fraction of the memory when many Pokemon are held at once.
+        When `fields` is given, only those top-level fields of the data are decoded and kept (e.g. PokeData.BASIC_FIELDS for the name, types and stats).
+        Needing any other field later (or the whole of `data`) fetches the full data once, so neither a projection nor the compact representation changes what is returned,
+        even to callers sharing the object without asking for either.
+
+        Arguments:
+            name (str): The name of the Pokemon.
+            url (str): The URL of the Pokemon. Used if no name is provided.
+            logger (Logger): The logger to use.
+            lazy (bool): Whether to defer fetching the data until it is first needed. Defaults to False.
+            known (dict): Fields of the Pokemon that are already known, keyed as in the API data (e.g. {"name": "rattata-alola"}).
+            compact (bool): Whether to keep the data in the compact representation rather than as raw JSON. Defaults to False.
+            fields (tuple[str]): The top-level fields of the data to keep, keyed as in the API data. If empty, every field is kept.
+        '''
+        # __init__ runs again when __new__ returns an already-registered object, which must be left as-is.
+        # A lazy object still unloaded is fetched now if this construction isn't lazy, so a resource that doesn't exist raises as usual.
+        if getattr(self, "_initialised", False):
+            if not lazy and not self.is_loaded():
+                self._set_data(PokeSession.default_session().fetch(self.url, logger=logger, fields=self._fields))
+            return
+
+        session = PokeSession.default_session()
+        if name != "": self.url = session.resource_url("pokemon", name)
         elif url != "": self.url = url
         else: raise ValueError("Either name or url must be provided.")
         
         self.logger = logger
+        self._data = None
+        self._compact = compact
+        self._fields = tuple(fields)
+        self._known = PokeSession.identity_fields(self.url, known)
+
+        if lazy:
+            # Register the unloaded object straight away, so other lookups of this URL share it (and its eventual fetch).
+            PokeRegistry.default_registry().register(self, self.url)
+            self._initialised = True
+            return
+
+        # Get the data from the response cache, or from the API on a miss. Raises an exception if the request fails.
+        self._set_data(session.fetch(self.url, logger=logger, fields=self._fields))
+
+    @classmethod
+    def from_data(cls, data : dict, url : str = "", logger : Logger = Logger.no_logger(), compact : bool = False, fields : tuple = ()):
+        '''
+        Create a PokeData from already-fetched API data, without sending a request.
 
-        # Get the data from the API.
-        request = requests.get(self.url)
-        # Raise an exception if the request fails.
-        logger.route(request.raise_for_status, raise_exceptions=True)  # type: ignore
-        # Set the data.
-        self.data : dict = request.json()
+        If the Pokemon has already been loaded, the existing object is returned instead.
+
+        Arguments:
+            data (dict): The JSON data of the Pokemon, as returned by the API.
+            url (str): The URL the data was fetched from. Defaults to the ID-based URL of the Pokemon.
+            logger (Logger): The logger to use.
+            compact (bool): Whether to keep the data in the compact representation rather than as raw JSON. Defaults to False.
+            fields (tuple[str]): The top-level fields of the data to keep. If empty, every field is kept.
+        Returns:
+            PokeData: The Pokemon.
+        '''
+        if url == "": url = PokeSession.default_session().resource_url("pokemon", data.get("id", data.get("name", "")))
+        existing = PokeRegistry.default_registry().get(url)
+        if isinstance(existing, cls) and existing.is_loaded():
+            return existing
+        # An unloaded (lazy) object for this URL is filled in rather than replaced, so everyone holding it sees the data.
+        pokemon = existing if isinstance(existing, cls) else object.__new__(cls)
+        if pokemon is not existing:
+            pokemon.url = url
+            pokemon.logger = logger
+            pokemon._compact = compact
+            pokemon._fields = tuple(fields)
+            pokemon._known = {}
+        pokemon._set_data(PokeProjection.project(data, pokemon._fields))
+        # If the Pokemon was already registered under another of its URLs, the object registered first is the one kept (and loaded, if it wasn't).
+        registered = PokeRegistry.default_registry().get(url)
+        if isinstance(registered, cls) and registered is not pokemon:
+            if not registered.is_loaded():
+                registered._set_data(PokeProjection.project(data, registered._fields))
+            return registered
+        return pokemon
+
+    @property
+    def data(self) -> dict:
+        '''
+        The raw data of the Pokemon, fetched on first access if the Pokemon was constructed lazily.
+
+        The object may be shared with callers that asked for a projection or the compact representation, so the first access of a projected or compact Pokemon
+        fetches the full data once (usually from the cache) and drops the projection and compact representation. Prefer the accessors where possible.
+        '''
+        self._require()
+        return self._data
+
+    def is_loaded(self) -> bool:
+        '''
+        Check whether the data of the Pokemon has been fetched.
+
+        This is always True, unless the Pokemon was constructed lazily and its data has not been needed yet.
+
+        Arguments:
+            None
+        Returns:
+            bool: Whether the data has been fetched.
+        '''
+        return self._data is not None
+
+    def _set_data(self, data : dict):
+        '''
+        Set the loaded data of the Pokemon, and register it so later lookups re-use this object.
+
+        If the Pokemon is compact, the data is parsed into a PokeCompactData and the JSON itself is not kept.
+
+        Internal method.
+
+        Arguments:
+            data (dict): The JSON data of the Pokemon.
+        Returns:
+            None
+        '''
+        self._data = PokeCompactData(data) if self._compact else data
+        # Register under every URL this resource can be reached by.
+        PokeRegistry.default_registry().register(self, self.url, aliases=PokeSession.resource_aliases(self.url, data))
+        self._initialised = True
 
     def _raw_data(self) -> dict:
         '''
@@ -45,28 +184,89 @@ class PokeData:
         Returns:
             any: The value of the key in the dictionary, or the provided value OR None if the key doesn't exist.
         '''
-        return self.data.get(key, default_return)
+        self._require(key)
+        # Compact data rebuilds only the requested section, rather than the whole document.
+        return self._data.get(key, default_return)
+
+    def _require(self, key : str | None = None):
+        '''
+        Make sure a field of the data is available, fetching the data if it has not been yet.
+
+        If the Pokemon was loaded with a projection, or in the compact representation, that left the field out, the full data is fetched (usually from the cache),
+        and the projection and compact representation are dropped.
+
+        Internal method.
+
+        Arguments:
+            key (str | None): The top-level field that is needed, or None if every field is.
+        Returns:
+            None
+        '''
+        projected = len(self._fields) != 0 and (key is None or (key not in self._fields and key not in PokeProjection.IDENTITY_FIELDS))
+        compacted = self._compact and (key is None or key not in PokeCompactData.KEYS)
+        if projected or compacted:
+            if self._data is not None:
+                self.logger.debug(f"'{key or 'every field'}' is not in the loaded data of '{self.url}', fetching the full data.")
+            self._fields = ()
+            self._compact = False
+            self._set_data(PokeSession.default_session().fetch(self.url, logger=self.logger))
+        elif self._data is None:
+            self._set_data(PokeSession.default_session().fetch(self.url, logger=self.logger, fields=self._fields))
+
+    def is_compact(self) -> bool:
+        '''
+        Check whether the data of the Pokemon is kept in the compact representation.
+
+        This becomes False once a field the compact representation leaves out is needed, and the full data is fetched.
+
+        Arguments:
+            None
+        Returns:
+            bool: Whether the Pokemon is compact.
+        '''
+        return self._compact
 
     def get_name(self) -> str:
         '''
         Retrieve the name of the Pokemon.
 
+        If the name is already known (e.g. the Pokemon was constructed by name), no request is made, even for a lazy Pokemon.
+
         Arguments:
             None
         Returns:
             str: The name of the Pokemon.
         '''
+        if not self.is_loaded() and "name" in self._known:
+            return self._known["name"]
         return self._get_data("name", "Unknown")
 
+    def get_url(self) -> str:
+        '''
+        Retrieve the URL of the Pokemon.
+
+        This never requires the data of the Pokemon to be fetched.
+
+        Arguments:
+            None
+        Returns:
+            str: The URL of the Pokemon.
+        '''
+        return self.url
+
     def get_internal_id(self) -> int:
         '''
         Retrieve the internal ID of the Pokemon.
 
+        If the ID is already known (e.g. the Pokemon was constructed from an ID-based URL), no request is made, even for a lazy Pokemon.
+
         Arguments:
             None
         Returns:
             int: The internal ID of the Pokemon.
         '''
+        if not self.is_loaded() and "id" in self._known:
+            return self._known["id"]
         return self._get_data("id", -1)
 
     def get_height(self) -> float:
@@ -105,7 +305,7 @@ class PokeData:
         '''
         return self._get_data("order", -1)
 
-    def get_abilities(self, slots : list = [], names : list = [], limit : int = -1) -> list:
+    def get_abilities(self, slots : list = [], names : list = [], limit : int = -1, lazy : bool = False) -> list:
         '''
         Retrieve the abilities of the Pokemon.
         
@@ -116,6 +316,7 @@ class PokeData:
             slots (list[int]): The slots to retrieve. Any parameters that are out of range are ignored. If empty, this parameter is ignored.
             names (list[str]): The names of the abilities to retrieve. Any parameters that aren't strings are ignored. If empty, this parameter is ignored.
             limit (int): The maximum number of abilities to retrieve. If -1 or out of range, the parameter is ignored.
+            lazy (bool): Whether to construct the abilities lazily, deferring each fetch until its data is first needed. Their names are known without fetching. Defaults to False.
         Returns:
             list: The abilities of the Pokemon.
         '''
@@ -133,7 +334,7 @@ class PokeData:
         if limit != -1:
             abilities = abilities[:limit]
         # Fetch the URL, and pass each URL into the PokeAbilityData constructor.
-        return [PokeAbilityData(url=ability.get("ability", {}).get("url", ""), logger=self.logger) for ability in abilities]
+        return [PokeAbilityData(url=ability.get("ability", {}).get("url", ""), logger=self.logger, lazy=lazy, known={"name": ability.get("ability", {}).get("name", "")}) for ability in abilities]
 
     def get_moves(self, slots : list = [], names : list = [], limit : int = -1) -> list:
         '''
@@ -158,7 +359,7 @@ class PokeData:
         # TODO: Implement functionality for PokeMoveData.
         return moves
         
-    def get_forms(self, names : list = [], limit : int = -1) -> list:
+    def get_forms(self, names : list = [], limit : int = -1, lazy : bool = False) -> list:
         '''
         Fetch the forms of the Pokemon.
 
@@ -171,6 +372,7 @@ class PokeData:
         Arguments:
             names (list[str]): The names of the forms to retrieve. If empty or not found, the parameter is ignored.
             limit (int): The maximum number of forms to retrieve. If -1 or out of range, the parameter is ignored.
+            lazy (bool): Whether to construct the forms lazily, deferring each fetch until its data is first needed. Their names are known without fetching. Defaults to False.
         Returns:
             list: The forms of the Pokemon.
         '''
@@ -180,7 +382,7 @@ class PokeData:
         if limit != -1:
             forms = forms[:limit]
         # Fetch the URL, and pass each URL into the PokeFormData constructor.
-        return [PokeData(url=form.get("url", ""), logger=self.logger) for form in forms]
+        return [PokeData(url=form.get("url", ""), logger=self.logger, lazy=lazy, known={"name": form.get("name", "")}) for form in forms]
 
     def get_sprites(self, front : bool = True, back : bool = True, shiny : bool = False, female : bool = False, other_category : str = "") -> dict:
         '''
@@ -231,6 +433,10 @@ class PokeData:
             dict: The default stats of the Pokemon.
         '''
         stats = [stat.lower().replace(" ", "-") for stat in stats if stat != "" and type(stat) == str]
+        self._require("stats")
+        if isinstance(self._data, PokeCompactData):
+            # Read the packed stats directly, rather than rebuilding the API structure.
+            return {name: value for name, value in self._data.get_base_stats().items() if len(stats) == 0 or name in stats}
         toReturn = {}
         for stat in self._get_data("stats", []):
             if len(stats) != 0 and stat.get("stat", {}).get("name", "") not in stats: continue
@@ -247,8 +453,56 @@ class PokeData:
         Returns:
             list: The default types of the Pokemon.
         '''
+        self._require("types")
+        if isinstance(self._data, PokeCompactData):
+            return self._data.get_type_names()
         return [type.get("type", {}).get("name", "") for type in self._get_data("types", [])]
 
+    @staticmethod
+    def load_many(names_or_urls : list, workers : int = 16, batch_size : int = 512, progress : Callable[[int, int], Any] | None = None, compact : bool = False, fields : tuple = (), logger : Logger = Logger.no_logger()) -> list:
+        '''
+        Load many Pokemon at once.
+
+        Duplicate names and URLs are only loaded once, and the remaining Pokemon are loaded in parallel on a thread pool, sharing the pooled connections of the default PokeSession.
+        The same Pokemon given by name and by ID gives the same object (see `PokeRegistry`), though both may be requested if neither has been loaded before.
+        Pokemon are submitted in batches of `batch_size`, so the number of pending requests stays bounded for very large inputs.
+        A failure to load one Pokemon does not stop the others; the exception is returned in its place instead.
+
+        Keep `workers` at or below the session's `pool_maxsize`, otherwise connections are opened and discarded rather than re-used.
+
+        Arguments:
+            names_or_urls (list[str]): The names or URLs of the Pokemon. Anything containing '://' is treated as a URL.
+            workers (int): The number of threads to load with.
+            batch_size (int): The number of Pokemon to submit to the thread pool at a time.
+            progress (Callable[[int, int], Any] | None): Called as `progress(done, total)` after each unique Pokemon is loaded. This is optional.
+            compact (bool): Whether to keep newly loaded Pokemon in the compact representation, which is recommended for very large inputs. Defaults to False.
+            fields (tuple[str]): The top-level fields to keep of newly loaded Pokemon, e.g. PokeData.BASIC_FIELDS. If empty, every field is kept.
+            logger (Logger): The logger to use.
+        Returns:
+            list[PokeData | Exception]: The loaded Pokemon, in the order they were given, with the raised exception in place of any Pokemon that failed to load.
+        '''
+        session = PokeSession.default_session()
+        # Canonical URL of each input, so 'Pikachu', 'pikachu' and '.../pokemon/pikachu/' are loaded once.
+        keys = [PokeSession.canonical_url(entry if "://" in entry else session.resource_url("pokemon", entry)) for entry in names_or_urls]
+        unique = list(dict.fromkeys(keys))
+        results = {}
+
+        def load(url : str):
+            try:
+                return PokeData(url=url, logger=logger, compact=compact, fields=fields)
+            except Exception as e:
+                logger.warn(f"Failed to load '{url}': {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for start in range(0, len(unique), batch_size):
+                futures = {executor.submit(load, url): url for url in unique[start:start + batch_size]}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(len(results), len(unique))
+        return [results[key] for key in keys]
+
     @staticmethod
     def test_connection(name : str = "", url : str = "") -> int:
         '''
@@ -258,22 +512,29 @@ class PokeData:
             name (str): The name of the Pokemon to test the connection with.
             url (str): The URL of the Pokemon to test the connection with.
         Returns:
-            int: The response code of the connection.
+            int: The response code of the connection, or 503 if the API can't be reached.
         '''
+        session = PokeSession.default_session()
+        if not session.health.is_available():
+            # The API is already known to be unreachable, there is no need to spend a request finding out again.
+            return 503
         try:
             # Test a default connection.
-            default = requests.get("https://pokeapi.co/api/v2/pokemon/1")
+            default = session.get(session.resource_url("pokemon", 1))
             default.raise_for_status()
             # If a name is provided, test a connection with the name.
             if len(name) != 0:
-                name_search = requests.get(f"https://pokeapi.co/api/v2/pokemon/{name}")
+                name_search = session.get(session.resource_url("pokemon", name))
                 name_search.raise_for_status()
             # If a URL is provided, test a connection with the URL.
             if len(url) != 0:
-                url_search = requests.get(url)
+                url_search = session.get(url)
                 url_search.raise_for_status()
             # All checks have passed, return 'Success' status code
             return 200
         except HTTPError as e:
             # Return the status code of the failed connection.
-            return e.response.status_code
\ No newline at end of file
+            return e.response.status_code
+        except RequestConnectionError:
+            # The API couldn't be reached, or the session won't send requests (the circuit is open, or it's offline).
+            return 503
\ No newline at end of file
@@ -0,0 +1,226 @@
+import threading
+
+from objects.type.TypeChart import TypeChart
+
+class AbilityModifier:
+    '''
+    An ability's effect on type effectiveness, e.g. Levitate making its holder immune to Ground moves, or Adaptability raising its holder's STAB to 2x.
+
+    Each ability is compiled to a multiplier per attacking type (applied when its holder is hit), plus multipliers that depend on the type chart's result:
+    against super effective moves (Filter), against every other move (Wonder Guard), and, when its holder attacks, for not very effective moves (Tinted Lens) and STAB (Adaptability).
+    Modifiers are applied on top of the type chart's result, so a typing's modified profile can be precomputed once and reused.
+
+    Abilities are registered by their PokeAPI names (e.g. "flash-fire"), and the common type-changing abilities are registered by default.
+    Each modifier applies from the first generation its ability changes type effectiveness in (e.g. Generation 5 for Lightning Rod's immunity), and is ignored in lookups for earlier generations.
+
+    Usage:
+        levitate = AbilityModifier.get("levitate", generation=8)
+        levitate.defending_multiplier(TypeChart.index("ground"), 2.0)  # 0.0
+    '''
+
+    # Ability name -> modifier, and every modifier in the order registered (its position is its index).
+    _registry = {}
+    _modifiers = []
+    _lock = threading.Lock()
+    # Generation -> the NumPy form of every registered modifier, built on first use by the batch API.
+    _arrays = {}
+    # The first generation with abilities.
+    FIRST_GENERATION = 3
+
+    def __init__(self, name : str, multipliers : dict = {}, super_effective : float = 1.0, not_super_effective : float = 1.0, not_very_effective : float = 1.0, stab : float | None = None,
+                 generation : int = FIRST_GENERATION):
+        '''
+        Create an ability modifier.
+
+        Arguments:
+            name (str): The name of the ability.
+            multipliers (dict): The multiplier against each attacking type when the holder is hit, keyed by type name. Other types are unaffected.
+            super_effective (float): The multiplier when the holder is hit by a super effective move. Defaults to 1.0.
+            not_super_effective (float): The multiplier when the holder is hit by any other move. Defaults to 1.0.
+            not_very_effective (float): The multiplier when the holder uses a not very effective (but not ineffective) move. Defaults to 1.0.
+            stab (float | None): The holder's STAB multiplier, or None to leave it as normal.
+            generation (int): The first generation the ability has this effect in. Defaults to `AbilityModifier.FIRST_GENERATION`, the first with abilities.
+        '''
+        self.name = AbilityModifier.canonical(name)
+        # One multiplier per attacking type in `TypeChart.TYPES` order, plus a neutral one for unknown types (-1).
+        self.multipliers = tuple(float(multipliers.get(type, 1.0)) for type in TypeChart.TYPES) + (1.0,)
+        self.super_effective = float(super_effective)
+        self.not_super_effective = float(not_super_effective)
+        self.not_very_effective = float(not_very_effective)
+        self.stab = None if stab is None else float(stab)
+        self.generation = generation
+        # Defensive profile -> the multipliers this ability adds to it, built as profiles are used.
+        self._profiles = {}
+
+    @staticmethod
+    def canonical(name : str) -> str:
+        '''
+        Canonicalise the name of an ability, e.g. "Flash Fire" to "flash-fire".
+
+        Arguments:
+            name (str): The name of the ability.
+        Returns:
+            str: The canonical name.
+        '''
+        return "-".join(name.strip().lower().replace("_", " ").replace("-", " ").split())
+
+    @staticmethod
+    def register(modifier):
+        '''
+        Register an ability modifier, replacing any registered under the same name.
+
+        Arguments:
+            modifier (AbilityModifier): The modifier.
+        Returns:
+            int: The modifier's index, for the batch API.
+        '''
+        with AbilityModifier._lock:
+            existing = AbilityModifier._registry.get(modifier.name)
+            if existing is not None:
+                index = AbilityModifier._modifiers.index(existing)
+                AbilityModifier._modifiers[index] = modifier
+            else:
+                index = len(AbilityModifier._modifiers)
+                AbilityModifier._modifiers.append(modifier)
+            AbilityModifier._registry[modifier.name] = modifier
+            AbilityModifier._arrays = {}
+        return index
+
+    @staticmethod
+    def get(name : str, generation : int | None = None):
+        '''
+        Retrieve the modifier of an ability.
+
+        Arguments:
+            name (str): The name of the ability.
+            generation (int | None): The generation of Pokemon to use (1-9). If None, every modifier applies.
+        Returns:
+            AbilityModifier | None: The modifier, or None if the ability doesn't affect type effectiveness in the generation (or isn't known).
+        '''
+        if name == "":
+            return None
+        modifier = AbilityModifier._registry.get(name)
+        if modifier is None:
+            modifier = AbilityModifier._registry.get(AbilityModifier.canonical(name))
+        if modifier is not None and generation is not None and generation < modifier.generation:
+            return None
+        return modifier
+
+    @staticmethod
+    def index(name : str, generation : int | None = None) -> int:
+        '''
+        Intern the name of an ability to its modifier's index, for the batch API.
+
+        Arguments:
+            name (str): The name of the ability.
+            generation (int | None): The generation of Pokemon to use (1-9). If None, every modifier applies.
+        Returns:
+            int: The index of the modifier, or -1 if the ability doesn't affect type effectiveness in the generation (or isn't known).
+        '''
+        modifier = AbilityModifier.get(name, generation)
+        return -1 if modifier is None else AbilityModifier._modifiers.index(modifier)
+
+    def defending_multiplier(self, attacking : int, multiplier : float) -> float:
+        '''
+        Retrieve the multiplier this ability adds to a move hitting its holder.
+
+        Arguments:
+            attacking (int): The index of the move's type.
+            multiplier (float): The move's multiplier from the type chart.
+        Returns:
+            float: The ability's multiplier, to apply on top of the type chart's.
+        '''
+        return self.multipliers[attacking] * (self.super_effective if multiplier > 1.0 else self.not_super_effective)
+
+    def attacking_multiplier(self, multiplier : float) -> float:
+        '''
+        Retrieve the multiplier this ability adds to a move its holder uses, excluding STAB.
+
+        Arguments:
+            multiplier (float): The move's multiplier from the type chart.
+        Returns:
+            float: The ability's multiplier, to apply on top of the type chart's.
+        '''
+        return self.not_very_effective if 0.0 < multiplier < 1.0 else 1.0
+
+    def defensive_modifiers(self, profile : tuple) -> tuple:
+        '''
+        Retrieve the multipliers this ability adds to a defensive profile (see `TypeChart.defensive_profile(...)`), precomputed the first time each profile is used.
+
+        Arguments:
+            profile (tuple[float]): The defensive profile of the holder's typing.
+        Returns:
+            tuple[float]: The multiplier to apply to each attacking type's entry in the profile, in the same order (including the neutral final entry).
+        '''
+        modifiers = self._profiles.get(profile)
+        if modifiers is None:
+            modifiers = self._profiles[profile] = tuple(self.defending_multiplier(attacking, multiplier) for attacking, multiplier in enumerate(profile))
+        return modifiers
+
+    @staticmethod
+    def as_arrays(generation : int | None = None) -> tuple:
+        '''
+        Retrieve every registered modifier as NumPy arrays, for vectorised lookups.
+
+        Each array has a row per modifier in index order, plus a neutral final row, so indexing with -1 (no ability) applies no modifier.
+        The rows of modifiers that don't apply in the generation are neutral too.
+        Requires the optional 'numpy' package.
+
+        Arguments:
+            generation (int | None): The generation of Pokemon to use (1-9). If None, every modifier applies.
+        Returns:
+            tuple[numpy.ndarray]: The per-type "multipliers" (indexed [modifier, attacking type], with a neutral final column),
+                then the "super_effective", "not_super_effective", "not_very_effective" and "stab" multipliers (indexed [modifier], with NaN for a normal STAB). Treat them as read-only.
+        '''
+        # Imported here for the same reason as in `TypeChart.as_array()`, which raises a helpful error if NumPy is missing.
+        TypeChart.for_generation(TypeChart.GENERATIONS[-1]).as_array()
+        import numpy
+        arrays = AbilityModifier._arrays.get(generation)
+        if arrays is None:
+            with AbilityModifier._lock:
+                neutral = AbilityModifier("")
+                modifiers = [modifier if generation is None or generation >= modifier.generation else neutral for modifier in AbilityModifier._modifiers] + [neutral]
+                arrays = (
+                    numpy.array([modifier.multipliers for modifier in modifiers]),
+                    numpy.array([modifier.super_effective for modifier in modifiers]),
+                    numpy.array([modifier.not_super_effective for modifier in modifiers]),
+                    numpy.array([modifier.not_very_effective for modifier in modifiers]),
+                    numpy.array([numpy.nan if modifier.stab is None else modifier.stab for modifier in modifiers]),
+                )
+                for array in arrays:
+                    array.setflags(write=False)
+                AbilityModifier._arrays[generation] = arrays
+        return arrays
+
+# The abilities that change how effective a move is, registered by default, each from the first generation it has its effect in.
+for modifier in (
+    # Immunities.
+    AbilityModifier("levitate", {"ground": 0.0}),
+    AbilityModifier("earth-eater", {"ground": 0.0}, generation=9),
+    AbilityModifier("flash-fire", {"fire": 0.0}),
+    AbilityModifier("well-baked-body", {"fire": 0.0}, generation=9),
+    AbilityModifier("water-absorb", {"water": 0.0}),
+    # Storm Drain and Lightning Rod only redirect moves before Generation 5.
+    AbilityModifier("storm-drain", {"water": 0.0}, generation=5),
+    AbilityModifier("volt-absorb", {"electric": 0.0}),
+    AbilityModifier("lightning-rod", {"electric": 0.0}, generation=5),
+    AbilityModifier("motor-drive", {"electric": 0.0}, generation=4),
+    AbilityModifier("sap-sipper", {"grass": 0.0}, generation=5),
+    # Resistances and weaknesses.
+    AbilityModifier("dry-skin", {"water": 0.0, "fire": 1.25}, generation=4),
+    AbilityModifier("thick-fat", {"fire": 0.5, "ice": 0.5}),
+    AbilityModifier("heatproof", {"fire": 0.5}, generation=4),
+    AbilityModifier("water-bubble", {"fire": 0.5}, generation=7),
+    AbilityModifier("purifying-salt", {"ghost": 0.5}, generation=9),
+    AbilityModifier("fluffy", {"fire": 2.0}, generation=7),
+    # Effectiveness-dependent.
+    AbilityModifier("wonder-guard", not_super_effective=0.0),
+    AbilityModifier("filter", super_effective=0.75, generation=4),
+    AbilityModifier("solid-rock", super_effective=0.75, generation=4),
+    AbilityModifier("prism-armor", super_effective=0.75, generation=7),
+    # Attacking.
+    AbilityModifier("tinted-lens", not_very_effective=2.0, generation=4),
+    AbilityModifier("adaptability", stab=2.0, generation=4),
+):
+    AbilityModifier.register(modifier)
+del modifier
@@ -0,0 +1,208 @@
+import heapq
+import threading
+
+from objects.type.TypeChart import TypeChart
+
+class TeamAnalyser:
+    '''
+    Analyses the defensive type coverage of whole teams, e.g. finding the attacking types a team shares weaknesses to.
+
+    Every typing's weaknesses, resistances and immunities are precomputed as 18-bit masks (bit N is the attacking type with index N), so a team is aggregated with a handful of bitwise operations rather than by multiplying through the chart.
+    Team members are given as (primary, secondary) type index pairs, with -1 for no secondary type.
+
+    A team's score is how many resistances (and immunities) its members have, minus how many weaknesses they have, minus the number of attacking types that two or more members are weak to,
+    minus the number of attacking types that no member resists. Higher is better.
+
+    Usage:
+        analyser = TeamAnalyser.for_chart(TypeChart.for_generation(9))
+        analyser.analyse([(TypeChart.index("water"), TypeChart.index("ground")), (TypeChart.index("steel"), -1)])
+    '''
+
+    # A mask with a bit set for every attacking type.
+    ALL = (1 << TypeChart.SIZE) - 1
+
+    # Chart -> analyser, shared so the masks of a chart are only built once.
+    _analysers = {}
+    _analysers_lock = threading.Lock()
+
+    def __init__(self, chart : TypeChart):
+        '''
+        Create a team analyser, precomputing the masks of every typing in a chart.
+
+        Arguments:
+            chart (TypeChart): The type chart to analyse teams with.
+        '''
+        self.chart = chart
+        # Like the chart's defensive profiles, the masks are stored for every ordered pair of indices including -1 (as the final slot), so a lookup needs no normalisation.
+        size = TypeChart.SIZE + 1
+        weak = []
+        covered = []
+        immune = []
+        net = []
+        for primary in range(size):
+            for secondary in range(size):
+                profile = chart.defensive_profile(primary if primary < TypeChart.SIZE else -1, secondary if secondary < TypeChart.SIZE else -1)
+                weak_mask = covered_mask = immune_mask = 0
+                for attacking in range(TypeChart.SIZE):
+                    if profile[attacking] > 1.0:
+                        weak_mask |= 1 << attacking
+                    elif profile[attacking] < 1.0:
+                        covered_mask |= 1 << attacking
+                        if profile[attacking] == 0.0:
+                            immune_mask |= 1 << attacking
+                weak.append(weak_mask)
+                covered.append(covered_mask)
+                immune.append(immune_mask)
+                # A member's own share of the score.
+                net.append(covered_mask.bit_count() - weak_mask.bit_count())
+        # Weaknesses, resistances (including immunities), and immunities alone, of each typing.
+        self._weak = tuple(weak)
+        self._covered = tuple(covered)
+        self._immune = tuple(immune)
+        self._net = tuple(net)
+
+    @staticmethod
+    def for_chart(chart : TypeChart):
+        '''
+        Retrieve the team analyser of a type chart, creating it the first time.
+
+        Arguments:
+            chart (TypeChart): The type chart to analyse teams with.
+        Returns:
+            TeamAnalyser: The analyser. Analysers are shared, so the same object is returned for the same chart.
+        '''
+        analyser = TeamAnalyser._analysers.get(chart)
+        if analyser is None:
+            with TeamAnalyser._analysers_lock:
+                analyser = TeamAnalyser._analysers.get(chart)
+                if analyser is None:
+                    analyser = TeamAnalyser._analysers[chart] = TeamAnalyser(chart)
+        return analyser
+
+    @staticmethod
+    def key(primary : int, secondary : int = -1) -> int:
+        '''
+        Intern a typing to the key its masks are stored under.
+
+        Arguments:
+            primary (int): The index of the primary type.
+            secondary (int): The index of the secondary type, or -1 for a single-typed Pokemon.
+        Returns:
+            int: The key of the typing.
+        '''
+        # -1 wraps around to the extra, 'none' slot at the end of each dimension.
+        return (primary % (TypeChart.SIZE + 1)) * (TypeChart.SIZE + 1) + secondary % (TypeChart.SIZE + 1)
+
+    def masks(self, primary : int, secondary : int = -1) -> tuple:
+        '''
+        Retrieve the masks of a typing.
+
+        Arguments:
+            primary (int): The index of the primary type.
+            secondary (int): The index of the secondary type, or -1 for a single-typed Pokemon.
+        Returns:
+            tuple[int, int, int]: The attacking types the typing is weak to, resists (including immunities), and is immune to, as masks.
+        '''
+        key = TeamAnalyser.key(primary, secondary)
+        return (self._weak[key], self._covered[key], self._immune[key])
+
+    def analyse(self, team : list) -> dict:
+        '''
+        Analyse the defensive coverage of a team.
+
+        Arguments:
+            team (list[tuple[int, int]]): The (primary, secondary) typing of each member.
+        Returns:
+            dict: The number of members "weak" to, "resisting" (including immunities), and "immune" to each attacking type (as tuples in `TypeChart.TYPES` order),
+                the attacking types two or more members are weak to ("shared"), and no member resists ("uncovered"), as tuples of indices, and the team's "score".
+        '''
+        keys = [TeamAnalyser.key(*member) for member in team]
+        weak = TeamAnalyser.__count([self._weak[key] for key in keys])
+        covered = TeamAnalyser.__count([self._covered[key] for key in keys])
+        immune = TeamAnalyser.__count([self._immune[key] for key in keys])
+        return {
+            "weak": weak,
+            "resisting": covered,
+            "immune": immune,
+            "shared": tuple(attacking for attacking in range(TypeChart.SIZE) if weak[attacking] >= 2),
+            "uncovered": tuple(attacking for attacking in range(TypeChart.SIZE) if covered[attacking] == 0),
+            "score": self.__score(keys),
+        }
+
+    def score(self, team : list) -> int:
+        '''
+        Score the defensive coverage of a team. Higher is better.
+
+        Arguments:
+            team (list[tuple[int, int]]): The (primary, secondary) typing of each member.
+        Returns:
+            int: The team's score.
+        '''
+        return self.__score([TeamAnalyser.key(*member) for member in team])
+
+    def rank(self, teams, count : int | None = None) -> list:
+        '''
+        Score many teams, and rank them from best to worst.
+
+        Teams are scored one at a time as they're read, so `teams` may be a generator over far more teams than would fit in memory when `count` is given.
+
+        Arguments:
+            teams (Iterable[list[tuple[int, int]]]): The teams, each a list of member typings.
+            count (int | None): The number of teams to keep. If None, every team is ranked.
+        Returns:
+            list[tuple[int, int]]: The (position in `teams`, score) of each ranked team, best first. Teams with the same score keep their original order.
+        '''
+        size = TypeChart.SIZE + 1
+        score = self.__score
+        # The keys are computed inline, as this is the hot loop.
+        scored = ((score([(primary % size) * size + secondary % size for primary, secondary in team]), -position) for position, team in enumerate(teams))
+        if count is None:
+            ranked = sorted(scored, reverse=True)
+        else:
+            ranked = heapq.nlargest(count, scored)
+        return [(-position, team_score) for team_score, position in ranked]
+
+    def __score(self, keys : list) -> int:
+        '''
+        Internal method scoring a team from the keys of its members' typings.
+
+        Arguments:
+            keys (list[int]): The key of each member's typing.
+        Returns:
+            int: The team's score.
+        '''
+        weak = self._weak
+        covered = self._covered
+        net = self._net
+        score = 0
+        # Every attacking type seen once so far, seen at least twice so far, and resisted by anyone so far.
+        seen = shared = resisted = 0
+        for key in keys:
+            score += net[key]
+            mask = weak[key]
+            shared |= seen & mask
+            seen |= mask
+            resisted |= covered[key]
+        return score - shared.bit_count() - (TeamAnalyser.ALL & ~resisted).bit_count()
+
+    @staticmethod
+    def __count(masks : list) -> tuple:
+        '''
+        Internal helper function counting how many masks have each bit set.
+
+        The masks are summed as a bit-sliced counter: plane N holds bit N of every count, so each mask is added to all 18 counts at once with a ripple of ANDs and XORs.
+
+        Arguments:
+            masks (list[int]): The masks to count.
+        Returns:
+            tuple[int]: The count of each attacking type, in `TypeChart.TYPES` order.
+        '''
+        planes = []
+        for carry in masks:
+            for plane in range(len(planes)):
+                if carry == 0:
+                    break
+                planes[plane], carry = planes[plane] ^ carry, planes[plane] & carry
+            if carry != 0:
+                planes.append(carry)
+        return tuple(sum(((mask >> attacking) & 1) << plane for plane, mask in enumerate(planes)) for attacking in range(TypeChart.SIZE))
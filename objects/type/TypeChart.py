@@ -0,0 +1,479 @@
+import itertools
+import os
+import threading
+from typing import Callable
+
+class TypeChart:
+    '''
+    A compiled type chart: the damage multiplier of every attacking type against every defending type, as an 18x18 matrix.
+
+    Type names are interned to integer indices (see `TypeChart.index(...)`), and every lookup after that is a single read from a flat tuple, rather than a search through lists of type names.
+    Unknown types (including types that don't exist yet in older generations, such as Fairy in Gen 2-5) are treated as neutral in both directions.
+
+    The chart of every generation is read from a compact table file (TypeChart.txt, next to this file) the first time one is needed.
+
+    Usage:
+        chart = TypeChart.for_generation(9)
+        fire, grass = TypeChart.index("fire"), TypeChart.index("grass")
+        chart.multiplier(fire, grass)  # 2.0
+    '''
+
+    # Every type, in PokeAPI order. A type's position in this tuple is its index.
+    TYPES = ("normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel", "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy")
+    SIZE = len(TYPES)
+    # Type name -> index.
+    _INDEX = {name: index for index, name in enumerate(TYPES)}
+    # Every distinct typing as (primary, secondary) indices: the 18 single types (with a secondary type of -1), then the 153 dual types.
+    TYPINGS = tuple([(type, -1) for type in range(SIZE)] + list(itertools.combinations(range(SIZE), 2)))
+    # Translates the digits of a binary string to bytes of 0 and 1.
+    _BITS = bytes.maketrans(b"01", b"\x00\x01")
+    # The generations with a type chart.
+    GENERATIONS = range(1, 10)
+    # The table file holding the chart of every generation.
+    TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "TypeChart.txt")
+    # The codes used in the table file, and the multiplier each stands for.
+    _CODES = {"+": 2.0, ".": 1.0, "-": 0.5, "0": 0.0}
+
+    # Generation -> chart, loaded from the table file on first use.
+    _generations = None
+    _generations_lock = threading.Lock()
+
+    def __init__(self, rows : list):
+        '''
+        Create a type chart from its rows.
+
+        Arguments:
+            rows (list[list[float]]): One row per attacking type, in `TypeChart.TYPES` order, each holding the multiplier against every defending type in the same order.
+        '''
+        if len(rows) != TypeChart.SIZE or any(len(row) != TypeChart.SIZE for row in rows):
+            raise ValueError(f"A type chart must be {TypeChart.SIZE}x{TypeChart.SIZE}.")
+        # Flattened, so a lookup is `matrix[attacking * SIZE + defending]`.
+        self.matrix = tuple(float(multiplier) for row in rows for multiplier in row)
+        # The NumPy form of the matrix, built on first use by the batch API.
+        self._array = None
+        # The defensive profile of every typing, and its attacking types grouped by multiplier, built on first use.
+        self._profiles = None
+        self._profile_groups = None
+        # For every attacking type, the typings it hits super effectively, resisted (including immune), and immune, as masks over `TypeChart.typings()`, plus the typings grouped by multiplier, built on first use.
+        self._reverse = None
+
+    @staticmethod
+    def from_function(multiplier : Callable[[str, str], float]):
+        '''
+        Compile a type chart by evaluating a function for every (attacking, defending) pair of types once.
+
+        Arguments:
+            multiplier (Callable[[str, str], float]): Called as `multiplier(attacking, defending)` with lowercase type names, returning the damage multiplier.
+        Returns:
+            TypeChart: The compiled chart.
+        '''
+        return TypeChart([[multiplier(attacking, defending) for defending in TypeChart.TYPES] for attacking in TypeChart.TYPES])
+
+    @staticmethod
+    def for_generation(generation : int):
+        '''
+        Retrieve the type chart of a generation.
+
+        Generations before 1 use the Gen 1 chart, and generations after the latest use the latest chart.
+
+        Arguments:
+            generation (int): The generation of Pokemon.
+        Returns:
+            TypeChart: The type chart. Charts are shared, so the same object is returned for generations with the same chart.
+        '''
+        if TypeChart._generations is None:
+            with TypeChart._generations_lock:
+                if TypeChart._generations is None:
+                    TypeChart._generations = TypeChart.load(TypeChart.TABLE_PATH)
+        return TypeChart._generations[min(max(generation, TypeChart.GENERATIONS[0]), TypeChart.GENERATIONS[-1])]
+
+    @staticmethod
+    def load(path : str) -> dict:
+        '''
+        Load the type charts held in a table file.
+
+        The file is made up of [sections], each covering a range of generations (e.g. [2-5]).
+        Each section is a header row listing the defending types, then one row per attacking type, with types written as the first three letters of their names.
+        Each cell is one of '+' (2x), '.' (1x), '-' (0.5x) or '0' (0x). Types missing from a section are neutral to and from everything.
+        Lines starting with '#' are comments.
+
+        Arguments:
+            path (str): The path of the table file.
+        Returns:
+            dict[int, TypeChart]: The chart of every generation covered by the file.
+        Raises:
+            ValueError: If the file is malformed.
+        '''
+        abbreviations = {name[:3]: index for index, name in enumerate(TypeChart.TYPES)}
+        charts = {}
+        generations = None
+        columns = None
+        rows = None
+
+        def finish():
+            if generations is not None:
+                chart = TypeChart(rows)
+                for generation in generations:
+                    charts[generation] = chart
+
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, start=1):
+                tokens = line.split()
+                if len(tokens) == 0 or tokens[0].startswith("#"):
+                    continue
+                if tokens[0].startswith("["):
+                    # A new section. Finish the previous one first.
+                    finish()
+                    first, _, last = tokens[0].strip("[]").partition("-")
+                    generations = range(int(first), int(last if last != "" else first) + 1)
+                    columns = None
+                    rows = [[1.0] * TypeChart.SIZE for _ in range(TypeChart.SIZE)]
+                    continue
+                if generations is None or any(token[:3] not in abbreviations for token in tokens[:1 if columns is not None else None]):
+                    raise ValueError(f"{path}:{number}: expected a [section], or a row of known types.")
+                if columns is None:
+                    # The header row of the section.
+                    columns = [abbreviations[token[:3]] for token in tokens]
+                    continue
+                if len(tokens) != len(columns) + 1 or any(code not in TypeChart._CODES for code in tokens[1:]):
+                    raise ValueError(f"{path}:{number}: expected the attacking type, then one of {' '.join(TypeChart._CODES)} for each of the {len(columns)} defending types.")
+                attacking = abbreviations[tokens[0][:3]]
+                for defending, code in zip(columns, tokens[1:]):
+                    rows[attacking][defending] = TypeChart._CODES[code]
+        finish()
+        return charts
+
+    @staticmethod
+    def index(name : str) -> int:
+        '''
+        Intern a type name to its index.
+
+        Arguments:
+            name (str): The name of the type. Case and surrounding whitespace are ignored.
+        Returns:
+            int: The index of the type, or -1 if the name is not a type.
+        '''
+        index = TypeChart._INDEX.get(name)
+        if index is None:
+            index = TypeChart._INDEX.get(name.strip().lower(), -1)
+        return index
+
+    @staticmethod
+    def name(index : int) -> str:
+        '''
+        Retrieve the name of the type with the given index.
+
+        Arguments:
+            index (int): The index of the type.
+        Returns:
+            str: The name of the type.
+        '''
+        return TypeChart.TYPES[index]
+
+    def multiplier(self, attacking : int, defending : int) -> float:
+        '''
+        Retrieve the damage multiplier of an attacking type against a single defending type.
+
+        Arguments:
+            attacking (int): The index of the attacking type.
+            defending (int): The index of the defending type.
+        Returns:
+            float: The multiplier, 1.0 if either type is unknown (-1).
+        '''
+        if attacking < 0 or defending < 0:
+            return 1.0
+        return self.matrix[attacking * TypeChart.SIZE + defending]
+
+    def effectiveness(self, attacking : int, defending : list) -> float:
+        '''
+        Retrieve the damage multiplier of an attacking type against a Pokemon with one or more types.
+
+        Arguments:
+            attacking (int): The index of the attacking type.
+            defending (list[int]): The indices of the defending Pokemon's types.
+        Returns:
+            float: The product of the multipliers against each defending type.
+        '''
+        if attacking < 0:
+            return 1.0
+        row = attacking * TypeChart.SIZE
+        result = 1.0
+        for type in defending:
+            if type >= 0:
+                result *= self.matrix[row + type]
+        return result
+
+    def row(self, attacking : int) -> tuple:
+        '''
+        Retrieve the multipliers of an attacking type against every defending type.
+
+        Arguments:
+            attacking (int): The index of the attacking type.
+        Returns:
+            tuple[float]: The multipliers, in `TypeChart.TYPES` order.
+        '''
+        if attacking < 0:
+            return (1.0,) * TypeChart.SIZE
+        return self.matrix[attacking * TypeChart.SIZE:(attacking + 1) * TypeChart.SIZE]
+
+    def defensive_profile(self, primary : int, secondary : int = -1) -> tuple:
+        '''
+        Retrieve the defensive profile of a typing: the multiplier every attacking type deals to it.
+
+        Profiles of every typing are precomputed together on first use, so this is a single lookup.
+        The order of the two types doesn't matter, and a typing with the same type twice is the single type.
+
+        Arguments:
+            primary (int): The index of the defending primary type.
+            secondary (int): The index of the defending secondary type, or -1 for a single-typed defender.
+        Returns:
+            tuple[float]: The multiplier of each attacking type, in `TypeChart.TYPES` order, followed by a neutral 1.0 so that indexing with -1 (an unknown attacking type) also works.
+        '''
+        if self._profiles is None:
+            self.__build_profiles()
+        # -1 wraps around to the extra, neutral slot at the end of each dimension.
+        return self._profiles[(primary % (TypeChart.SIZE + 1)) * (TypeChart.SIZE + 1) + secondary % (TypeChart.SIZE + 1)]
+
+    def attacking_types(self, primary : int, secondary : int = -1, multiplier : float = 2.0) -> tuple:
+        '''
+        Retrieve the attacking types that deal exactly the given multiplier to a typing, e.g. every type that hits Water/Ground for 4x.
+
+        Arguments:
+            primary (int): The index of the defending primary type.
+            secondary (int): The index of the defending secondary type, or -1 for a single-typed defender.
+            multiplier (float): The multiplier to look for. Defaults to 2.0.
+        Returns:
+            tuple[int]: The indices of the attacking types, in `TypeChart.TYPES` order.
+        '''
+        if self._profile_groups is None:
+            self.__build_profiles()
+        return self._profile_groups[(primary % (TypeChart.SIZE + 1)) * (TypeChart.SIZE + 1) + secondary % (TypeChart.SIZE + 1)].get(float(multiplier), ())
+
+    def defending_typings(self, attacking : int, multiplier : float = 2.0) -> tuple:
+        '''
+        Retrieve the typings that an attacking type deals exactly the given multiplier to, e.g. every typing Ground hits for 4x. This is the reverse of `attacking_types(...)`.
+
+        The typings are precomputed together on first use, so this is a single lookup.
+
+        Arguments:
+            attacking (int): The index of the attacking type.
+            multiplier (float): The multiplier to look for. Defaults to 2.0.
+        Returns:
+            tuple[tuple[int, int]]: The (primary, secondary) indices of the typings, in `TypeChart.typings()` order.
+        '''
+        if self._reverse is None:
+            self.__build_reverse()
+        if attacking < 0:
+            # An unknown type is neutral to everything.
+            return TypeChart.TYPINGS if float(multiplier) == 1.0 else ()
+        return self._reverse[3][attacking].get(float(multiplier), ())
+
+    def coverage(self, attacking : list) -> dict:
+        '''
+        Split every typing by how well a set of attacking types covers it, judged by the most effective of the types (without STAB).
+
+        Each attacking type's typings are precomputed as masks, so a set of types is combined with a handful of bitwise operations rather than a pass over every typing.
+
+        Arguments:
+            attacking (list[int]): The indices of the attacking types. Unknown types (-1) are neutral to everything.
+        Returns:
+            dict: The typings hit "super_effective" by at least one of the types, hit "neutral" at best, "not_very_effective" at best, and "immune" to all of them,
+                each as a tuple of (primary, secondary) indices in `TypeChart.typings()` order.
+        '''
+        if self._reverse is None:
+            self.__build_reverse()
+        super_masks, resisted_masks, immune_masks, _ = self._reverse
+        # With no attacking types, there's nothing to cover any typing with.
+        everything = (1 << len(TypeChart.TYPINGS)) - 1 if len(attacking) != 0 else 0
+        super_effective = 0
+        resisted = immune = everything
+        for type in attacking:
+            if type < 0:
+                # Neutral to everything, so nothing is resisted by every move.
+                resisted = immune = 0
+                continue
+            super_effective |= super_masks[type]
+            resisted &= resisted_masks[type]
+            immune &= immune_masks[type]
+        return {
+            "super_effective": TypeChart.__decode(super_effective),
+            "neutral": TypeChart.__decode(everything & ~super_effective & ~resisted),
+            "not_very_effective": TypeChart.__decode(resisted & ~immune),
+            "immune": TypeChart.__decode(immune),
+        }
+
+    @staticmethod
+    def typings() -> list:
+        '''
+        List every distinct typing: the 18 single types (with a secondary type of -1), then the 153 dual types.
+
+        Arguments:
+            None
+        Returns:
+            list[tuple[int, int]]: The (primary, secondary) index of each of the 171 typings.
+        '''
+        return list(TypeChart.TYPINGS)
+
+    def __build_profiles(self):
+        '''
+        Internal method for precomputing the defensive profile of every typing.
+
+        Profiles are stored for every ordered pair of indices, including -1 (as the final slot), so a lookup needs no normalisation.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        size = TypeChart.SIZE + 1
+        profiles = []
+        groups = []
+        for primary in range(size):
+            for secondary in range(size):
+                # The extra slot is the 'none' type, and a repeated type only counts once.
+                defending = [type for type in dict.fromkeys((primary, secondary)) if type < TypeChart.SIZE]
+                profile = tuple(self.effectiveness(attacking, defending) for attacking in range(TypeChart.SIZE)) + (1.0,)
+                grouped = {}
+                for attacking, multiplier in enumerate(profile[:TypeChart.SIZE]):
+                    grouped.setdefault(multiplier, []).append(attacking)
+                profiles.append(profile)
+                groups.append({multiplier: tuple(types) for multiplier, types in grouped.items()})
+        self._profiles = tuple(profiles)
+        self._profile_groups = tuple(groups)
+
+    def __build_reverse(self):
+        '''
+        Internal method for precomputing the typings every attacking type hits, as masks and grouped by multiplier.
+
+        Arguments:
+            None
+        Returns:
+            None
+        '''
+        typings = TypeChart.TYPINGS
+        super_masks = []
+        resisted_masks = []
+        immune_masks = []
+        groups = []
+        for attacking in range(TypeChart.SIZE):
+            super_mask = resisted_mask = immune_mask = 0
+            grouped = {}
+            for position, typing in enumerate(typings):
+                multiplier = self.defensive_profile(*typing)[attacking]
+                if multiplier > 1.0:
+                    super_mask |= 1 << position
+                elif multiplier < 1.0:
+                    resisted_mask |= 1 << position
+                    if multiplier == 0.0:
+                        immune_mask |= 1 << position
+                grouped.setdefault(multiplier, []).append(typing)
+            super_masks.append(super_mask)
+            resisted_masks.append(resisted_mask)
+            immune_masks.append(immune_mask)
+            groups.append({multiplier: tuple(members) for multiplier, members in grouped.items()})
+        self._reverse = (tuple(super_masks), tuple(resisted_masks), tuple(immune_masks), tuple(groups))
+
+    @staticmethod
+    def __decode(mask : int) -> tuple:
+        '''
+        Internal helper function listing the typings in a mask over `TypeChart.typings()`.
+
+        Arguments:
+            mask (int): The mask.
+        Returns:
+            tuple[tuple[int, int]]: The typings whose bits are set, in `TypeChart.typings()` order.
+        '''
+        # The mask's binary digits, lowest bit first, as bytes of 0 and 1 to select the typings with.
+        return tuple(itertools.compress(TypeChart.TYPINGS, bin(mask)[:1:-1].encode().translate(TypeChart._BITS)))
+
+    def as_array(self):
+        '''
+        Retrieve the chart as a NumPy array, for vectorised lookups.
+
+        The array is 19x19: the 18x18 chart, plus a neutral final row and column.
+        Indexing it with -1 (an unknown type, or the missing secondary type of a single-typed Pokemon) therefore reads a neutral 1.0, with no special-casing.
+
+        Requires the optional 'numpy' package.
+
+        Arguments:
+            None
+        Returns:
+            numpy.ndarray: The padded multiplier matrix, indexed [attacking, defending]. Treat it as read-only.
+        '''
+        try:
+            # NumPy is only needed by the batch API, and is slow to import, so it is only imported once the batch API is used.
+            import numpy
+        except ImportError:
+            raise ImportError("The batch API requires the 'numpy' package. Please install it (pip install numpy) and try again.") from None
+        if self._array is None:
+            array = numpy.ones((TypeChart.SIZE + 1, TypeChart.SIZE + 1))
+            array[:TypeChart.SIZE, :TypeChart.SIZE] = numpy.array(self.matrix).reshape(TypeChart.SIZE, TypeChart.SIZE)
+            array.setflags(write=False)
+            self._array = array
+        return self._array
+
+    def evaluate_batch(self, moves, primary, secondary = None, user_types = None, stab : float = 1.5, dtype = None, user_abilities = None, abilities = None, generation : int | None = None):
+        '''
+        Evaluate many movesets against many defending typings in a single vectorised call.
+
+        Every type is given by its index (see `TypeChart.index(...)`), with -1 for "none".
+        For B attackers with M moves each, against D defenders, the result is a (B, M, D) tensor of multipliers, including STAB and any abilities.
+
+        Requires the optional 'numpy' package.
+
+        Arguments:
+            moves (array-like[int]): The move type indices, shaped (B, M). A single moveset may be given as shape (M,), in which case B is 1.
+            primary (array-like[int]): The primary type index of each defender, shaped (D,).
+            secondary (array-like[int] | None): The secondary type index of each defender, shaped (D,), with -1 for single-typed defenders. If None, every defender is single-typed.
+            user_types (array-like[int] | None): The types of each attacker for STAB, shaped (B,) or (B, 2), with -1 for none. If None, STAB is not applied.
+            stab (float): The STAB multiplier. Defaults to 1.5.
+            dtype (numpy.dtype | None): The dtype of the result, e.g. numpy.float32 to halve the memory of very large batches. Defaults to float64.
+            user_abilities (array-like[int] | None): The ability modifier index of each attacker (see `AbilityModifier.index(...)`), shaped (B,), with -1 for none. If None, no attacker has an ability.
+            abilities (array-like[int] | None): The ability modifier index of each defender, shaped (D,), with -1 for none. If None, no defender has an ability.
+            generation (int | None): The generation whose ability modifiers apply, as charts are shared between generations. If None, every modifier applies.
+        Returns:
+            numpy.ndarray: The multipliers, indexed [attacker, move, defender].
+        '''
+        chart = self.as_array()
+        import numpy
+        if dtype is not None:
+            chart = chart.astype(dtype)
+        moves = numpy.atleast_2d(numpy.asarray(moves, dtype=numpy.intp))
+        primary = numpy.asarray(primary, dtype=numpy.intp)
+        secondary = numpy.full_like(primary, -1) if secondary is None else numpy.asarray(secondary, dtype=numpy.intp)
+        if primary.shape != secondary.shape or primary.ndim != 1:
+            raise ValueError("primary and secondary must both be 1-dimensional, with one entry per defender.")
+
+        # (B, M, 1) move rows against (D,) defender columns broadcast to (B, M, D).
+        rows = moves[:, :, numpy.newaxis]
+        result = chart[rows, primary] * chart[rows, secondary]
+
+        stabs = stab
+        if user_abilities is not None or abilities is not None:
+            # Abilities are applied as masks over the chart's result, from the precompiled modifier arrays.
+            from objects.type.AbilityModifier import AbilityModifier
+            multipliers, super_effective, not_super_effective, not_very_effective, ability_stabs = AbilityModifier.as_arrays(generation)
+            base = result
+            if abilities is not None:
+                abilities = numpy.asarray(abilities, dtype=numpy.intp)
+                if abilities.shape != primary.shape:
+                    raise ValueError("abilities must have one entry per defender.")
+                result = base * multipliers[abilities, rows].astype(base.dtype)
+                result *= numpy.where(base > 1.0, super_effective[abilities], not_super_effective[abilities]).astype(base.dtype)
+            if user_abilities is not None:
+                user_abilities = numpy.asarray(user_abilities, dtype=numpy.intp)
+                if user_abilities.shape != (moves.shape[0],):
+                    raise ValueError("user_abilities must have one entry per attacker.")
+                boost = not_very_effective[user_abilities][:, numpy.newaxis, numpy.newaxis]
+                result = result * numpy.where((base > 0.0) & (base < 1.0), boost, 1.0).astype(base.dtype)
+                # Attackers with a STAB-changing ability (e.g. Adaptability) use it in place of the usual STAB.
+                stabs = numpy.where(numpy.isnan(ability_stabs[user_abilities]), stab, ability_stabs[user_abilities])[:, numpy.newaxis]
+
+        if user_types is not None:
+            user_types = numpy.asarray(user_types, dtype=numpy.intp)
+            if user_types.ndim == 1:
+                user_types = user_types[:, numpy.newaxis]
+            # A move gets STAB when its (known) type matches any of its attacker's types.
+            matches = (moves[:, :, numpy.newaxis] == user_types[:, numpy.newaxis, :]).any(axis=2) & (moves >= 0)
+            result *= numpy.where(matches, stabs, 1.0).astype(result.dtype)[:, :, numpy.newaxis]
+        return result
@@ -0,0 +1,123 @@
+from objects.type.TypeChart import TypeChart
+
+class TypeOptimiser:
+    '''
+    Finds the set of move types with the best offensive coverage against a distribution of opponent typings.
+
+    The score of a moveset is its expected effectiveness: for each opponent typing, the multiplier of the moveset's best move against it (STAB included), weighted by how likely that typing is.
+    This is a weighted maximum coverage problem, which is solved exactly:
+        - Every candidate's multiplier against every typing is computed up front, as one matrix from the batch API.
+        - Candidates that are never better than another candidate are dropped, as they can't improve a moveset.
+        - The remaining subsets are searched depth-first, starting from the greedy solution, and a branch is pruned as soon as the best it could possibly reach (its score, plus the largest gains its remaining moves could each add) can't beat the best moveset found so far.
+
+    A learnset is reduced to its distinct move types, so there are never more than 18 candidates.
+    Requires the optional 'numpy' package.
+    '''
+
+    def __init__(self, chart : TypeChart):
+        self.chart = chart
+
+    def optimise(self, candidates : list, user_types : list = [], opponents : dict | None = None, count : int = 4, stab : float = 1.5, user_ability : int = -1) -> dict:
+        '''
+        Find the moveset with the best expected effectiveness.
+
+        Arguments:
+            candidates (list[int]): The indices of the move types to choose from. Duplicates and unknown types (-1) are ignored.
+            user_types (list[int]): The indices of the user's types, for STAB.
+            opponents (dict | None): The weight of each opponent typing, keyed by (primary, secondary) index pairs with -1 for no secondary type. If None, all 171 typings are equally likely.
+            count (int): The maximum number of moves in the moveset. Defaults to 4.
+            stab (float): The STAB multiplier. Defaults to 1.5.
+            user_ability (int): The index of the user's ability modifier (see `AbilityModifier.index(...)`), or -1 for none.
+        Returns:
+            dict: The best moveset as "moves" (type indices, best first), its "score" (the expected multiplier of its best move against an opponent), and the number of "nodes" searched.
+        '''
+        # Raises a helpful ImportError if NumPy is missing.
+        self.chart.as_array()
+        import numpy
+
+        candidates = [type for type in dict.fromkeys(candidates) if type >= 0]
+        if opponents is None:
+            opponents = {typing: 1.0 for typing in TypeChart.typings()}
+        typings = list(opponents)
+        weights = numpy.array([opponents[typing] for typing in typings], dtype=float)
+        if len(candidates) == 0 or len(typings) == 0 or weights.sum() <= 0:
+            return {"moves": [], "score": 0.0, "nodes": 0}
+        weights /= weights.sum()
+
+        # values[candidate, typing] is the multiplier of that move type against that typing.
+        values = self.chart.evaluate_batch(
+            candidates,
+            [typing[0] for typing in typings],
+            [typing[1] if len(typing) > 1 else -1 for typing in typings],
+            user_types=[list(user_types) if len(user_types) != 0 else [-1]],
+            stab=stab,
+            user_abilities=[user_ability] if user_ability >= 0 else None,
+        )[0]
+
+        # Drop dominated candidates: another candidate is at least as good against every typing (ties keep the earliest).
+        # at_least[other, index] is whether `other` is at least as good as `index` everywhere, and better[other, index] whether it's strictly better somewhere.
+        at_least = (values[:, numpy.newaxis, :] >= values[numpy.newaxis, :, :]).all(axis=2)
+        better = (values[:, numpy.newaxis, :] > values[numpy.newaxis, :, :]).any(axis=2)
+        earlier = numpy.tri(len(candidates), k=-1, dtype=bool).T
+        numpy.fill_diagonal(at_least, False)
+        dominated = (at_least & (better | earlier)).any(axis=0)
+        keep = [index for index in range(len(candidates)) if not dominated[index]]
+        # Strongest candidates first, so good movesets (and tight bounds) are found early.
+        keep.sort(key=lambda index: -float(values[index] @ weights))
+        candidates = [candidates[index] for index in keep]
+        values = values[keep]
+        count = min(count, len(candidates))
+
+        # Start from the greedy moveset, which is usually optimal or close to it.
+        best = self.__greedy(values, weights, count)
+        best_score = float(values[best].max(axis=0) @ weights)
+        nodes = 0
+
+        # Depth-first search over subsets in candidate order, as (next candidate, chosen, best multiplier per typing, score).
+        stack = [(0, [], numpy.zeros(len(typings)), 0.0)]
+        while len(stack) != 0:
+            start, chosen, current, score = stack.pop()
+            nodes += 1
+            if score > best_score + 1e-12:
+                best, best_score = chosen, score
+            slots = count - len(chosen)
+            if slots == 0 or start == len(candidates):
+                continue
+            # The gain each remaining candidate would add on its own. Gains can only shrink as moves are added, so the largest few bound the branch.
+            gains = numpy.maximum(values[start:] - current, 0.0) @ weights
+            if score + numpy.sort(gains)[-slots:].sum() <= best_score + 1e-12:
+                continue
+            # Pushed in reverse, so the strongest candidate is expanded first.
+            for offset in range(len(gains) - 1, -1, -1):
+                if gains[offset] > 1e-12:
+                    index = start + offset
+                    stack.append((index + 1, chosen + [index], numpy.maximum(current, values[index]), score + float(gains[offset])))
+
+        moves = sorted(best, key=lambda index: -float(values[index] @ weights))
+        return {"moves": [candidates[index] for index in moves], "score": best_score, "nodes": nodes}
+
+    @staticmethod
+    def __greedy(values, weights, count : int) -> list:
+        '''
+        Internal helper function building a moveset greedily, adding whichever move improves the score most until the moveset is full.
+
+        Arguments:
+            values (numpy.ndarray): The multiplier of each candidate against each typing.
+            weights (numpy.ndarray): The weight of each typing.
+            count (int): The number of moves to choose.
+        Returns:
+            list[int]: The positions of the chosen candidates.
+        '''
+        import numpy
+
+        chosen = []
+        current = numpy.zeros(values.shape[1])
+        for _ in range(count):
+            gains = numpy.maximum(values - current, 0.0) @ weights
+            gains[chosen] = -1.0
+            index = int(numpy.argmax(gains))
+            if gains[index] <= 0:
+                break
+            chosen.append(index)
+            current = numpy.maximum(current, values[index])
+        return chosen
@@ -2,6 +2,8 @@ import os
 from typing import Any
 
 try:
+    from requests.exceptions import ConnectionError as RequestConnectionError, Timeout
+    from objects.api.PokeSession import PokeSession
     from objects.data.PokeData import PokeData
     from objects.data.PokeAbilityData import PokeAbilityData
 except ImportError:
@@ -36,20 +38,15 @@ def script():
         print(f'-----------------------------------------------------------------------------------------------------------------')
         print(f'Checking for internet connection...', end=" ")
         # Check if an internet connection can be established.
-        # For now, until other data types are implemented, we will only check for a connection using either PokeData or PokeAbilityData, and other data types will be ignored.
-        if type == "pokemon":
-            if PokeData.test_connection() != 200:
-                __failure(error_msg="An internet connection could not be established. Please check your internet connection and try again.")
-                continue
-        elif type == "ability":
-            if PokeAbilityData.test_connection() != 200:
-                __failure(error_msg="An internet connection could not be established. Please check your internet connection and try again.")
-                continue
-        elif type == "item":
+        # Reachability is tracked passively from the outcome of previous requests, so this check does not send a request of its own.
+        if not PokeSession.default_session().health.is_available():
+            __failure(error_msg="An internet connection could not be established. Please check your internet connection and try again.")
+            continue
+        if data_type == "item":
             # TODO: Implement item data type.
             __failure(error_msg="The item data type is not yet implemented.")
             continue
-        elif type == "move":
+        elif data_type == "move":
             # TODO: Implement move data type.
             __failure(error_msg="The move data type is not yet implemented.")
             continue
@@ -122,7 +119,7 @@ def _search_pokemon(name : str, data : dict = {}) -> PokeData | str:
     '''
     Search for a pokemon.
 
-    The function will first check if an internet connection can be established. If it cannot, the function will return an error message.
+    If an internet connection cannot be established, the function will return an error message. Connectivity is tracked passively by the shared PokeSession, so the search itself is the only request made (or none at all, if the Pokemon is cached).
     If the Pokemon is found, the function will return a PokeData object containing the data of the Pokemon.
     If the Pokemon is not found, the function will return an error message.
 
@@ -132,12 +129,11 @@ def _search_pokemon(name : str, data : dict = {}) -> PokeData | str:
     Returns:
         Union: The data that was searched for. This will be returned as a PokeData object. If the data is not found or an internet connection cannot be established, the function will return a string containing the error message.
     '''
-    # Check if an internet connection can be established.
-    if PokeData.test_connection() != 200:
-        return "No internet connection."
-    # An internet connection is available. We can now search for the pokemon.
     try:
         pokemon = PokeData(name=name)
+    except (RequestConnectionError, Timeout):
+        # The API could not be reached, or is already known to be unreachable.
+        return "No internet connection."
     except:
         return "Pokemon not found."
     # The pokemon was found. We can now return the data.
@@ -147,7 +143,7 @@ def _search_ability(name : str, data : dict = {}) -> PokeAbilityData | str:
     '''
     Search for an ability.
 
-    The function will first check if an internet connection can be established. If it cannot, the function will return an error message.
+    If an internet connection cannot be established, the function will return an error message. Connectivity is tracked passively by the shared PokeSession, so the search itself is the only request made (or none at all, if the ability is cached).
     If the ability is found, the function will return a PokeAbilityData object containing the data of the ability.
     If the ability is not found, the function will return an error message.
 
@@ -157,12 +153,11 @@ def _search_ability(name : str, data : dict = {}) -> PokeAbilityData | str:
     Returns:
         Union: The data that was searched for. This will be returned as a PokeAbilityData object. If the data is not found or an internet connection cannot be established, the function will return a string containing the error message.
     '''
-    # Check if an internet connection can be established.
-    if PokeAbilityData.test_connection() != 200:
-        return "No internet connection."
-    # An internet connection is available. We can now search for the ability.
     try:
         ability = PokeAbilityData(name=name)
+    except (RequestConnectionError, Timeout):
+        # The API could not be reached, or is already known to be unreachable.
+        return "No internet connection."
     except:
         return "Ability not found."
     # The ability was found. We can now return the data.
@@ -1,4 +1,15 @@
+import argparse
+import csv
+import functools
+import json
 import os
+import sys
+from types import MappingProxyType
+
+from objects.type.AbilityModifier import AbilityModifier
+from objects.type.TeamAnalyser import TeamAnalyser
+from objects.type.TypeChart import TypeChart
+from objects.type.TypeOptimiser import TypeOptimiser
 
 # Attempt to import the PokeFind module.
 try:
@@ -11,6 +22,19 @@ except ImportError:
 # running variable. Used to control the app loop.
 running = True
 
+# The categories of effectiveness, in the order run_calculations() returns them. Used as field names by run_batch().
+CATEGORIES = ("super_effective", "neutral", "not_very_effective", "immune")
+# The formats run_batch() can read and write.
+BATCH_FORMATS = ("jsonl", "csv")
+# Every type name, in its canonical form.
+TYPE_NAMES = frozenset(TypeChart.TYPES)
+# The type names of every single and dual typing, keyed by its interned (primary, secondary) typing.
+TYPING_NAMES = {typing: tuple(TypeChart.name(type) for type in typing if type >= 0) for typing in TypeChart.TYPINGS}
+# The maximum number of distinct queries run_calculations() remembers.
+CACHE_SIZE = 4096
+# The columns of run_batch()'s CSV output, which has one row per (query, move).
+BATCH_CSV_COLUMNS = ("id", "generation", "user", "opponent", "move", "multiplier", "category")
+
 def script(mode : str = ""):
     '''
     Run the script.
@@ -66,14 +90,14 @@ def script(mode : str = ""):
     os.system("cmd /c cls")
     input(f'Execution has ended [ENTER]')
     
-def simple() -> list:
+def simple() -> tuple:
     '''
     Run through simple execution of the script.
 
     Arguments:
         None
     Returns:
-        Final calculated effectiveness of all moves, where each element of the returned list is a dictionary of moves, where list[0] is super effective moves... and list[3] is immune moves.
+        Final calculated effectiveness of all moves, where each element of the returned tuple is a read-only dictionary of moves, where tuple[0] is super effective moves... and tuple[3] is immune moves.
     '''
     os.system("cmd /c cls")
     print(f'Pokemon Type Calculator - Simple Mode')
@@ -120,91 +144,40 @@ def trig_exit():
     global running
     running = False
 
-def run_calculations(user : list = [], opponent : list = [], moves : list = [], generation : int = 8, print_results : bool = False) -> list:
+def run_calculations(user : list = [], opponent : list = [], moves : list = [], generation : int = 8, print_results : bool = False, user_ability : str = "", opponent_ability : str = "") -> tuple:
     '''
     Run the calculations for the effectiveness of moves against a Pokemon.
 
+    The results of the most recent queries are cached (see get_cache_info()), so repeating a query is a lookup.
+
     Arguments:
         user (list): The types of the user's Pokemon. This can be left empty, but will not take into account STAB moves.
         opponent (list): The types of the opponent's Pokemon.
         moves (list): The types of the moves available to the user.
-        generation (int): The generation of Pokemon to use (currently, 1-8). Defaults to 8.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
         print_results (bool): Whether or not to print the results to the console. Defaults to False.
+        user_ability (str): The ability of the user's Pokemon, e.g. "adaptability". Abilities that don't affect type effectiveness (in the generation) are ignored. Defaults to none.
+        opponent_ability (str): The ability of the opponent's Pokemon, e.g. "levitate". Defaults to none.
     Returns:
-        Final calculated effectiveness of all moves, where each element of the returned list is a dictionary of moves, where list[0] is super effective moves... and list[3] is immune moves.
+        Final calculated effectiveness of all moves, where each element of the returned tuple is a read-only dictionary of moves, where tuple[0] is super effective moves... and tuple[3] is immune moves.
     '''
 
-    # To begin, we need to figure out which type chart revision we need.
-    # This is done by checking the generation variable.
-    # Generation 1 uses the original type chart, without the modern types of Dark, Steel and Fairy.
-    # Generation 2-5 uses the revised type chart, featuring the new Dark and Steel types, though not Fairy.
-    # Generation 6+ uses the modern type chart, featuring all three new types.
-    if generation >= 6:
-        version = 0 # Modern type chart.
-    elif generation >= 2:
-        version = 1 # Revised type chart.
-    else:
-        version = 2 # Original type chart.
-    # We need to get efficiencies for every type.
-    # We'll use a dictionary to store the efficiencies.
-    efficiencies = {}
-    for opponent_type in opponent:
-        for move_type in moves:
-            # If the move type is within the results of super effective moves, then it's super effective.
-            if move_type in __super_effective(opponent_type, attacking=False, revision=version):
-                if move_type not in efficiencies:
-                    efficiencies[move_type] = 2.0
-                else:
-                    efficiencies[move_type] *= 2.0
-            # It isn't super effective, so we need to check if it's not very effective.
-            elif move_type in __least_effective(opponent_type, attacking=False, revision=version):
-                if move_type not in efficiencies:
-                    efficiencies[move_type] = 0.5
-                else:
-                    efficiencies[move_type] *= 0.5
-            # Not very effective either, so we need to check if it's immune.
-            elif move_type in __immune(opponent_type, attacking=False, revision=version):
-                if move_type not in efficiencies:
-                    efficiencies[move_type] = 0
-                else:
-                    efficiencies[move_type] *= 0
-            # If the move is not super effective, not very effective, or completely ineffective, it is neutral.
-            if move_type not in efficiencies:
-                efficiencies[move_type] = 1.0
-    # Next, we check if the user list has been provided.
-    # If it has, we should apply a STAB bonus to applicable moves.
-    if len(user) > 0:
+    # Queries are canonicalised (trimmed, lowercased and deduplicated into sets), so the same matchup written differently is only calculated once.
+    move_key = __canonicalise(moves)
+    # Abilities are reduced to their modifiers (None for abilities that don't affect type effectiveness), which also canonicalises them.
+    categories = __calculate(__canonicalise(user), __canonicalise(opponent), move_key, generation, AbilityModifier.get(user_ability, generation), AbilityModifier.get(opponent_ability, generation))
+    if not move_key.issuperset(moves):
+        # Some moves were written differently to their canonical names, so hand them back as they were given.
+        aliases = {}
         for move_type in moves:
-            if move_type in user:
-                efficiencies[move_type] *= 1.5
-    # Now that we have all of the efficiencies, we can split them into their respective categories.
-    super_effective = {}
-    neutral = {}
-    not_very_effective = {}
-    immune = {}
-    # We'll use a for loop to iterate through the efficiencies dictionary.
-    for move_type in efficiencies:
-        if efficiencies[move_type] > 1:
-            # The move has higher than normal effectiveness.
-            super_effective[move_type] = efficiencies[move_type]
-        elif efficiencies[move_type] == 1:
-            # The move has normal effectiveness.
-            neutral[move_type] = efficiencies[move_type]
-        elif efficiencies[move_type] < 1 and efficiencies[move_type] > 0:
-            # The move has lower than normal effectiveness.
-            not_very_effective[move_type] = efficiencies[move_type]
-        elif efficiencies[move_type] == 0:
-            # The move is completely ineffective.
-            immune[move_type] = efficiencies[move_type]
-    # Values have been separated into their categories, but remain unsorted!
-    # We'll use a function to sort the values.
-    super_effective = __sort_values(super_effective, reverse=True)
-    neutral = __sort_values(neutral, reverse=True)
-    not_very_effective = __sort_values(not_very_effective, reverse=True)
-    immune = __sort_values(immune, reverse=True)
-    # Now that the values have been sorted, they can either be returned or printed.
+            aliases.setdefault(move_type.strip().lower(), {})[move_type] = None
+        categories = tuple(MappingProxyType({move_type: efficiency for name, efficiency in category.items() for move_type in aliases[name]}) for category in categories)
+    super_effective, neutral, not_very_effective, immune = categories
+    # Now that the values have been calculated, they can either be returned or printed.
     if not print_results:
-        return [super_effective, neutral, not_very_effective, immune]
+        return categories
+    # STAB is only labelled when printing.
+    stab = set(TypeChart.index(user_type) for user_type in user) - {-1}
     os.system(f'cmd /c cls')
     print(f'Pokemon Type Calculator - Results')
     print(f'-----------------------------------------------------------------------------------------------------------------')
@@ -217,7 +190,7 @@ def run_calculations(user : list = [], opponent : list = [], moves : list = [],
         print(f' - None')
     ##################
     for move_type in super_effective:
-        if move_type in user:
+        if TypeChart.index(move_type) in stab:
             print(f' - {move_type.capitalize()}: {super_effective[move_type]}x (STAB)')
             continue
         print(f' - {move_type.capitalize()}: {super_effective[move_type]}x')
@@ -237,7 +210,7 @@ def run_calculations(user : list = [], opponent : list = [], moves : list = [],
         print(f' - None')
     ##################
     for move_type in not_very_effective:
-        if move_type in user:
+        if TypeChart.index(move_type) in stab:
             print(f' - {move_type.capitalize()}: {not_very_effective[move_type]}x (STAB)')
             continue
         print(f' - {move_type.capitalize()}: {not_very_effective[move_type]}x')
@@ -252,706 +225,434 @@ def run_calculations(user : list = [], opponent : list = [], moves : list = [],
         print(f' - {move_type.capitalize()}: {immune[move_type]}x')
     print(f'-----------------------------------------------------------------------------------------------------------------')
     input(f'Press ENTER to return to your previous menu.')
-    return [super_effective, neutral, not_very_effective, immune]
+    return categories
 
-def __super_effective(type : str, attacking : bool = True, revision : int = -1) -> list:
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def __calculate(user : frozenset, opponent : frozenset, moves : frozenset, generation : int, user_ability : AbilityModifier | None, opponent_ability : AbilityModifier | None) -> tuple:
     '''
-    Given a type, return a list of types that are super effective, either when attacking or defending.
+    Calculate the effectiveness of moves against a Pokemon, remembering the most recent queries.
 
     Arguments:
-        type (str): The type to check.
-        attacking (bool): Dictate whether the provided type is attacking (True), or defending (False).
-        revision (int): The revision of the type chart to use. Defaults to the latest revision (-1 or 0), where other options are Gen 2-5 (1) and Gen 1 (2).
+        user (frozenset): The canonical types of the user's Pokemon.
+        opponent (frozenset): The canonical types of the opponent's Pokemon.
+        moves (frozenset): The canonical types of the moves available to the user.
+        generation (int): The generation of Pokemon to use.
+        user_ability (AbilityModifier | None): The modifier of the user's ability, if any.
+        opponent_ability (AbilityModifier | None): The modifier of the opponent's ability, if any.
     Returns:
-        list: A list of types that are super effective against the provided type.
+        tuple: The efficiencies of each category as read-only dictionaries, as returned by run_calculations().
     '''
-    # Convert the type to lowercase to avoid any issues.
-    type = type.lower()
+    # To begin, we need the type chart of the generation.
+    # Every (move, opponent type) pair is then a read from that chart.
+    chart = get_type_chart(generation)
+    # Intern the opponent's types once, rather than once per move.
+    defending = [TypeChart.index(opponent_type) for opponent_type in opponent]
+    if 0 < len(defending) <= 2:
+        # Single and dual typings have a precomputed defensive profile, so each move is one lookup.
+        profile = chart.defensive_profile(*defending)
+    else:
+        # Anything else is multiplied out per type. A type listed twice only counts once.
+        profile = None
+        defending = list(dict.fromkeys(defending))
+    # Likewise for the user's types, which we'll need for STAB. Unknown types (e.g. an empty input) never give STAB.
+    stab = set(TypeChart.index(user_type) for user_type in user) - {-1}
+    stab_multiplier = user_ability.stab if user_ability is not None and user_ability.stab is not None else 1.5
+    # The opponent's ability modifies the whole profile at once, precomputed per ability.
+    modifiers = opponent_ability.defensive_modifiers(profile) if opponent_ability is not None and profile is not None else None
+    # We'll use a dictionary to store the efficiencies.
+    efficiencies = {}
+    for move_type in moves:
+        attacking = TypeChart.index(move_type)
+        # Look up the effectiveness against the opponent's types. Unknown types are neutral.
+        if profile is not None:
+            base = profile[attacking]
+        else:
+            base = chart.effectiveness(attacking, defending)
+        efficiency = base
+        # Apply any abilities on top of the type chart.
+        if modifiers is not None:
+            efficiency *= modifiers[attacking]
+        elif opponent_ability is not None:
+            efficiency *= opponent_ability.defending_multiplier(attacking, base)
+        if user_ability is not None:
+            efficiency *= user_ability.attacking_multiplier(base)
+        # If the user shares the move's type, apply a STAB bonus.
+        if attacking in stab:
+            efficiency *= stab_multiplier
+        efficiencies[move_type] = efficiency
+    # Now that we have all of the efficiencies, we can split them into their respective categories.
+    super_effective = {}
+    neutral = {}
+    not_very_effective = {}
+    immune = {}
+    # Sorting the efficiencies once up front (highest first) leaves each category sorted as it's filled.
+    efficiencies = __sort_values(efficiencies, reverse=True)
+    # We'll use a for loop to iterate through the efficiencies dictionary.
+    for move_type, efficiency in efficiencies.items():
+        if efficiency > 1:
+            # The move has higher than normal effectiveness.
+            super_effective[move_type] = efficiency
+        elif efficiency == 1:
+            # The move has normal effectiveness.
+            neutral[move_type] = efficiency
+        elif efficiency > 0:
+            # The move has lower than normal effectiveness.
+            not_very_effective[move_type] = efficiency
+        else:
+            # The move is completely ineffective.
+            immune[move_type] = efficiency
+    # The results are shared by every caller of the same query, so they're handed out read-only.
+    return (MappingProxyType(super_effective), MappingProxyType(neutral), MappingProxyType(not_very_effective), MappingProxyType(immune))
 
-    # Type should be treated as the ATTACKING type.
-    if attacking:
-        # Start type checking
-        if type == "normal":
-            # Normal is not super effective AGAINST any type.
-            pass
-        elif type == "fire":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel
-                return ["grass", "ice", "bug"]
-            return ["grass", "ice", "bug", "steel"]
-        elif type == "water":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["fire", "ground", "rock"]
-        elif type == "electric":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["water", "flying"]
-        elif type == "grass":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["water", "ground", "rock"]
-        elif type == "ice":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["grass", "ground", "flying", "dragon"]
-        elif type == "fighting":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["normal", "ice", "rock", "dark"]
-            return ["normal", "ice", "rock", "dark", "steel"]
-        elif type == "poison":
-            if revision == 1:
-                # Gen 2-5, no Fairy.
-                return ["grass"]
-            elif revision == 2:
-                # Gen 1, slight modification to be super effective against Bug.
-                return ["grass", "bug"]
-            return ["grass", "fairy"]
-        elif type == "ground":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["fire", "electric", "poison", "rock"]
-            return ["fire", "electric", "poison", "rock", "steel"]
-        elif type == "flying":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["grass", "fighting", "bug"]
-        elif type == "psychic":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["fighting", "poison"]
-        elif type == "bug":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Dark and slight modification to be super effective against Poison.
-                return ["grass", "poison", "psychic"]
-            return ["grass", "psychic", "dark"]
-        elif type == "rock":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["fire", "ice", "flying", "bug"]
-        elif type == "ghost":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, immune to Psychic instead of super effective due to programming error.
-                return ["ghost"]
-            return ["psychic", "ghost"]
-        elif type == "dragon":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["dragon"]
-        elif type == "dark":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, Dark type does not exist.
-                return []
-            return ["psychic", "ghost"]
-        elif type == "steel":
-            if revision == 1:
-                # Gen 2-5, no Fairy.
-                return ["ice", "rock"]
-            elif revision == 2:
-                # Gen 1, Steel type does not exist.
-                return []
-            return ["ice", "rock", "fairy"]
-        elif type == "fairy":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, Fairy type does not exist.
-                return []
-            return ["fighting", "dragon", "dark"]
-        # If we get here, the type is invalid.
-        return []
-    
-    # Type should be treated as the DEFENDING type.
-    if type == "normal":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["fighting"]
-    elif type == "fire":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["water", "ground", "rock"]
-    elif type == "water":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["electric", "grass"]
-    elif type == "electric":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["ground"]
-    elif type == "grass":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["fire", "ice", "poison", "flying", "bug"]
-    elif type == "ice":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Steel.
-            return ["fire", "fighting", "rock"]
-        return ["fire", "fighting", "rock", "steel"]
-    elif type == "fighting":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, no Fairy.
-            return ["flying", "psychic"]
-        return ["flying", "psychic", "fairy"]
-    elif type == "poison":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, slight modification for Bug to be super effective.
-            return ["ground", "psychic", "bug"]
-        return ["ground", "psychic"]
-    elif type == "ground":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["water", "grass", "ice"]
-    elif type == "flying":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["electric", "ice", "rock"]
-    elif type == "psychic":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Dark and slight modification to be immune to Ghost.
-            return ["bug"]
-        return ["bug", "ghost", "dark"]
-    elif type == "bug":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, slight modification for Poison to be super effective.
-            return ["fire", "poison", "flying", "rock"]
-        return ["fire", "flying", "rock"]
-    elif type == "rock":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Steel.
-            return ["water", "grass", "fighting", "ground"]
-        return ["water", "grass", "fighting", "ground", "steel"]
-    elif type == "ghost":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Dark.
-            return ["ghost"]
-        return ["ghost", "dark"]
-    elif type == "dragon":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, no Fairy.
-            return ["ice", "dragon"]
-        return ["ice", "dragon", "fairy"]
-    elif type == "dark":
-        if revision == 1:
-            # Gen 2-5, no Fairy.
-            return ["fighting", "bug"]
-        elif revision == 2:
-            # Gen 1, Dark type does not exist.
-            return []
-        return ["fighting", "bug", "fairy"]
-    elif type == "steel":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, Steel type does not exist.
-            return []
-        return ["fire", "fighting", "ground"]
-    elif type == "fairy":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, Fairy type does not exist.
-            return []
-        return ["poison", "steel"]
-    # If we get here, the type is invalid.
-    return []
+def __canonicalise(types : list) -> frozenset:
+    '''
+    Canonicalise a list of types for the results cache: trimmed, lowercased and deduplicated.
+
+    Arguments:
+        types (list): The type names.
+    Returns:
+        frozenset: The canonical type names.
+    '''
+    canonical = frozenset(types)
+    # Types are almost always given by their canonical names already, which is much cheaper to check than to redo.
+    if TYPE_NAMES.issuperset(canonical):
+        return canonical
+    return frozenset(map(str.lower, map(str.strip, types)))
 
-def __least_effective(type : str, attacking : bool = True, revision : int = -1) -> list:
+def get_cache_info():
     '''
-    Given a type, return a list of types that are least effective, either when attacking or defending.
+    Retrieve the statistics of the cache of run_calculations() results, for monitoring.
 
     Arguments:
-        type (str): The type to check.
-        attacking (bool): Dictate whether the provided type is attacking (True), or defending (False).
-        revision (int): The revision of the type chart to use. Defaults to the latest revision (-1 or 0), where other options are Gen 2-5 (1) and Gen 1 (2).
+        None
     Returns:
-        list: A list of types that are least effective against the provided type.
-    '''
-    # Convert the type to lowercase to avoid any issues.
-    type = type.lower()
-
-    # Type should be treated as the ATTACKING type.
-    if attacking:
-        if type == "normal":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["rock", "steel"]
-        elif type == "fire":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["fire", "water", "rock", "dragon"]
-        elif type == "water":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["water", "grass", "dragon"]
-        elif type == "electric":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["electric", "grass", "dragon"]
-        elif type == "grass":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["fire", "grass", "poison", "flying", "bug", "dragon"]
-            return ["fire", "grass", "poison", "flying", "bug", "dragon", "steel"]
-        elif type == "ice":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel and slight modification to be normal effectiveness against Fire.
-                return ["water", "ice"]
-            return ["fire", "water", "ice", "steel"]
-        elif type == "fighting":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, no Fairy.
-                return ["poison", "flying", "psychic", "bug"]
-            return ["poison", "flying", "psychic", "bug", "fairy"]
-        elif type == "poison":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["poison", "ground", "rock", "ghost"]
-        elif type == "ground":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["grass", "bug"]
-        elif type == "flying":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["electric", "rock"]
-            return ["electric", "rock", "steel"]
-        elif type == "psychic":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["psychic"]
-            return ["psychic", "steel"]
-        elif type == "bug":
-            if revision == 1:
-                # Gen 2-5, no Fairy.
-                return ["fire", "fighting", "poison", "flying", "ghost", "steel"]
-            elif revision == 2:
-                # Gen 1, no Steel or Fairy, as well as a slight modification to be super effective against Poison.
-                return ["fire", "fighting", "flying", "ghost"]
-            return ["fire", "fighting", "poison", "flying", "ghost", "steel", "fairy"]
-        elif type == "rock":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return ["fighting", "ground"]
-            return ["fighting", "ground", "steel"]
-        elif type == "ghost":
-            if revision == 1:
-                # Gen 2-5, slight modification to be not too effective against Steel.
-                return ["dark", "steel"]
-            elif revision == 2:
-                # Gen 1, Ghost has no weaknesses (only immunities).
-                return []
-            return ["dark"]
-        elif type == "dragon":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel, thus Dragon has no weaknesses.
-                return []
-            return ["steel"]
-        elif type == "dark":
-            if revision == 1:
-                # Gen 2-5, no Fairy as well as a slight modification to be not too effective against Steel.
-                return ["fighting", "dark", "steel"]
-            elif revision == 2:
-                # Gen 1, Dark type does not exist.
-                return []
-            return ["fighting", "dark", "fairy"]
-        elif type == "steel":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, Steel type does not exist.
-                return []
-            return ["fire", "water", "electric", "steel"]
-        elif type == "fairy":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, Fairy type does not exist.
-                return []
-            return ["fire", "poison", "steel"]
-        # If we get here, the type is invalid or has no less effective types.
-        return []
+        functools._CacheInfo: The cache's "hits", "misses", "maxsize" and "currsize".
+    '''
+    return __calculate.cache_info()
 
-    # Type should be treated as the DEFENDING type.
-    if type == "normal":
-        # Normal has no weaknesses (only immunities).
-        pass
-    elif type == "fire":
-        if revision == 1:
-            # Gen 2-5, no Fairy.
-            return ["fire", "grass", "ice", "bug", "steel"]
-        elif revision == 2:
-            # Gen 1, no Fairy or Steel, as well as a slight modification for Ice to be normal effectiveness.
-            return ["fire", "grass", "bug"]
-        return ["fire", "grass", "ice", "bug", "steel", "fairy"]
-    elif type == "water":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Steel.
-            return ["fire", "water", "ice"]
-        return ["fire", "water", "ice", "steel"]
-    elif type == "electric":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Steel.
-            return ["electric", "flying"]
-        return ["electric", "flying", "steel"]
-    elif type == "grass":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["water", "electric", "grass", "ground"]
-    elif type == "ice":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["ice"]
-    elif type == "fighting":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, no Dark.
-            return ["bug", "rock"]
-        return ["bug", "rock", "dark"]
-    elif type == "poison":
-        if revision == 1:
-            # Gen 2-5, no Fairy.
-            return ["grass", "fighting", "poison", "bug"]
-        elif revision == 2:
-            # Gen 1, no Fairy as well as a slight modification for Bug to be super effective.
-            return ["grass", "fighting", "poison"]
-        return ["grass", "fighting", "poison", "bug", "fairy"]
-    elif type == "ground":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["poison", "rock"]
-    elif type == "flying":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["grass", "fighting", "bug"]
-    elif type == "psychic":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["fighting", "psychic"]
-    elif type == "bug":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["grass", "fighting", "ground"]
-    elif type == "rock":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["normal", "fire", "poison", "flying"]
-    elif type == "ghost":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["poison", "bug"]
-    elif type == "dragon":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["fire", "water", "electric", "grass"]
-    elif type == "dark":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, Dark type does not exist.
-            return []
-        return ["ghost", "dark"]
-    elif type == "steel":
-        if revision == 1:
-            # Gen 2-5, no Fairy, as well as a slight modification for Ghost and Dark to be not very effective.
-            return ["normal", "grass", "ice", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel"]
-        elif revision == 2:
-            # Gen 1, Steel type does not exist.
-            return []
-        return ["normal", "grass", "ice", "flying", "psychic", "bug", "rock", "dragon", "steel", "fairy"]
-    elif type == "fairy":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, Fairy type does not exist.
-            return []
-        return ["fighting", "bug", "dark"]
-    # If we get here, the type is invalid or has no weaknesses.
-    return []
+def clear_cache():
+    '''
+    Empty the cache of run_calculations() results, and reset its statistics.
+
+    Arguments:
+        None
+    Returns:
+        None
+    '''
+    __calculate.cache_clear()
 
-def __immune(type : str, attacking : bool = True, revision : int = -1) -> list:
+def configure_cache(max_size : int | None = CACHE_SIZE):
     '''
-    Given a type, return a list of types that are immune, either when attacking or defending.
+    Resize the cache of run_calculations() results. The cache is emptied.
 
     Arguments:
-        type (str): The type to check.
-        attacking (bool): Dictate whether the provided type is attacking (True), or defending (False).
-        revision (int): The revision of the type chart to use. Defaults to the latest revision (-1 or 0), where other options are Gen 2-5 (1) and Gen 1 (2).
+        max_size (int | None): The maximum number of queries to remember, least recently used first out. 0 disables the cache, and None makes it unbounded. Defaults to CACHE_SIZE.
     Returns:
-        list: A list of types that are immune to the provided type.
-    '''
-    # Convert the type to lowercase to avoid any issues.
-    type = type.lower()
-
-    # Type should be treated as the ATTACKING type.
-    if attacking:
-        if type == "normal":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["ghost"]
-        elif type == "fire":
-            # Fire is not immune AGAINST anything.
-            pass
-        elif type == "water":
-            # Water is not immune AGAINST anything.
-            pass
-        elif type == "electric":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["ground"]
-        elif type == "grass":
-            # Grass is not immune AGAINST anything.
-            pass
-        elif type == "ice":
-            # Ice is not immune AGAINST anything.
-            pass
-        elif type == "fighting":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["ghost"]
-        elif type == "poison":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Steel.
-                return []
-            return ["steel"]
-        elif type == "ground":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, in this case, same as Gen 6+.
-                pass
-            return ["flying"]
-        elif type == "flying":
-            # Flying is not immune AGAINST anything.
-            pass
-        elif type == "psychic":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, no Dark.
-                return []
-            return ["dark"]
-        elif type == "bug":
-            # Bug is not immune AGAINST anything.
-            pass
-        elif type == "rock":
-            # Rock is not immune AGAINST anything.
-            pass
-        elif type == "ghost":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, slight modification for Psychic to be immune.
-                return ["normal", "psychic"]
-            return ["normal"]
-        elif type == "dragon":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, no Fairy.
-                return []
-            return ["fairy"]
-        elif type == "dark":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, Dark type does not exist.
-                return []
-            # Dark is not immune AGAINST anything.
-            pass
-        elif type == "steel":
-            if revision == 1:
-                # Gen 2-5, in this case, same as Gen 6+.
-                pass
-            elif revision == 2:
-                # Gen 1, Steel type does not exist.
-                return []
-            # Steel is not immune AGAINST anything.
-            pass
-        elif type == "fairy":
-            if revision == 1 or revision == 2:
-                # Gen 1-5, Fairy type does not exist.
-                return []
-            # Fairy is not immune AGAINST anything.
-            pass
-        # If we get here, the type is invalid or has no immunities.
-        return []
+        None
+    '''
+    global __calculate
+    __calculate = functools.lru_cache(maxsize=max_size)(__calculate.__wrapped__)
 
-    # Type should be treated as the DEFENDING type.
-    if type == "normal":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["ghost"]
-    elif type == "fire":
-        # Fire is not immune TO anything.
-        pass
-    elif type == "water":
-        # Water is not immune TO anything.
-        pass
-    elif type == "electric":
-        # Electric is not immune TO anything.
-        pass
-    elif type == "grass":
-        # Grass is not immune TO anything.
-        pass
-    elif type == "ice":
-        # Ice is not immune TO anything.
-        pass
-    elif type == "fighting":
-        # Fighting is not immune TO anything.
-        pass
-    elif type == "poison":
-        # Poison is not immune TO anything.
-        pass
-    elif type == "ground":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["electric"]
-    elif type == "flying":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["ground"]
-    elif type == "psychic":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, slight modification for Ghost to be immune.
-            return ["ghost"]
-        # Psychic is not immune TO anything.
-        pass
-    elif type == "bug":
-        # Bug is not immune TO anything.
-        pass
-    elif type == "rock":
-        # Rock is not immune TO anything.
-        pass
-    elif type == "ghost":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, in this case, same as Gen 6+.
-            pass
-        return ["normal", "fighting"]
-    elif type == "dragon":
-        # Dragon is not immune TO anything.
-        pass
-    elif type == "dark":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, Dark type does not exist.
-            return []
-        return ["psychic"]
-    elif type == "steel":
-        if revision == 1:
-            # Gen 2-5, in this case, same as Gen 6+.
-            pass
-        elif revision == 2:
-            # Gen 1, Steel type does not exist.
-            return []
-        return ["poison"]
-    elif type == "fairy":
-        if revision == 1 or revision == 2:
-            # Gen 1-5, Fairy type does not exist.
-            return []
-        return ["dragon"]
-    # If we get here, the type is invalid or has no immunities.
-    return []
+def get_type_chart(generation : int = 8) -> TypeChart:
+    '''
+    Retrieve the type chart of a generation.
+
+    Arguments:
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        TypeChart: The compiled type chart.
+    '''
+    # Each generation's chart is read from the type chart table, where Generation 1 has the original chart without Dark, Steel and Fairy,
+    # Generations 2-5 add Dark and Steel, and Generation 6+ adds Fairy.
+    return TypeChart.for_generation(generation)
+
+def get_defensive_profile(types : list, generation : int = 8) -> dict:
+    '''
+    Retrieve the defensive profile of a typing: how effective every attacking type is against it.
+
+    Profiles are precomputed for all 171 typings, so this is a lookup rather than a calculation.
+
+    Arguments:
+        types (list): The types of the defending Pokemon (one or two).
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        dict: The multiplier of every attacking type, keyed by type name.
+    Raises:
+        ValueError: If there are no types or more than two, or a type is unknown.
+    '''
+    profile = get_type_chart(generation).defensive_profile(*__intern_typing(types))
+    return {TypeChart.name(attacking): profile[attacking] for attacking in range(TypeChart.SIZE)}
+
+def get_attacking_types(types : list, multiplier : float = 2.0, generation : int = 8) -> list:
+    '''
+    Retrieve the attacking types that are exactly as effective as given against a typing, e.g. every type that hits Water/Ground for 4x.
+
+    Arguments:
+        types (list): The types of the defending Pokemon (one or two).
+        multiplier (float): The multiplier to look for. Defaults to 2.0.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        list: The names of the attacking types.
+    Raises:
+        ValueError: If there are no types or more than two, or a type is unknown.
+    '''
+    return [TypeChart.name(attacking) for attacking in get_type_chart(generation).attacking_types(*__intern_typing(types), multiplier=multiplier)]
+
+def get_defending_typings(type : str, multiplier : float = 2.0, generation : int = 8) -> list:
+    '''
+    Retrieve the typings an attacking type deals exactly the given multiplier to, e.g. every typing Ground hits for 4x. The reverse of get_attacking_types().
+
+    Arguments:
+        type (str): The attacking type.
+        multiplier (float): The multiplier to look for. Defaults to 2.0.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        list: The typings, each as a tuple of its type names.
+    Raises:
+        ValueError: If the type is unknown.
+    '''
+    return [TYPING_NAMES[typing] for typing in get_type_chart(generation).defending_typings(__intern_type(type), multiplier=multiplier)]
+
+def get_coverage(moves : list, generation : int = 8) -> dict:
+    '''
+    Split every single and dual typing by how well a set of move types covers it, judged by the most effective of the moves (without STAB).
+    For example, get_coverage(["ice", "ground"])["super_effective"] lists every typing that Ice or Ground hits super effectively.
+
+    The typings every type hits are precomputed, so this doesn't loop over every typing.
+
+    Arguments:
+        moves (list): The types of the moves.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        dict: The typings in each category of effectiveness (see CATEGORIES), each as a tuple of its type names.
+    Raises:
+        ValueError: If a type is unknown.
+    '''
+    coverage = get_type_chart(generation).coverage(list(dict.fromkeys(__intern_type(move_type) for move_type in moves)))
+    return {category: list(map(TYPING_NAMES.__getitem__, typings)) for category, typings in coverage.items()}
+
+def run_batch_calculations(moves, primary, secondary = None, user_types = None, generation : int = 8, dtype = None, user_abilities = None, abilities = None):
+    '''
+    Run the calculations for many movesets against many opponents at once, in a single vectorised NumPy call.
+
+    Unlike run_calculations(), types are given as indices rather than names (see TypeChart.index()), with -1 for "none", and the results are left as raw multipliers rather than split into categories.
+    Requires the optional 'numpy' package.
+
+    Arguments:
+        moves (array-like[int]): The move type indices of each moveset, shaped (movesets, moves).
+        primary (array-like[int]): The primary type index of each opponent, shaped (opponents,).
+        secondary (array-like[int] | None): The secondary type index of each opponent, with -1 for single-typed opponents. If None, every opponent is single-typed.
+        user_types (array-like[int] | None): The types of the user's Pokemon for each moveset, shaped (movesets,) or (movesets, 2). If None, STAB moves are not taken into account.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+        dtype (numpy.dtype | None): The dtype of the results, e.g. numpy.float32 for very large batches. Defaults to float64.
+        user_abilities (array-like[int] | None): The ability of the user's Pokemon for each moveset, as indices (see AbilityModifier.index()) with -1 for none. If None, no abilities are taken into account.
+        abilities (array-like[int] | None): The ability of each opponent, as indices with -1 for none. If None, no abilities are taken into account.
+    Returns:
+        numpy.ndarray: The effectiveness of every move against every opponent, indexed [moveset, move, opponent].
+    '''
+    return get_type_chart(generation).evaluate_batch(moves, primary, secondary=secondary, user_types=user_types, dtype=dtype, user_abilities=user_abilities, abilities=abilities, generation=generation)
+
+def find_best_moves(candidates : list, user : list = [], opponents : dict | None = None, count : int = 4, generation : int = 8, user_ability : str = "") -> dict:
+    '''
+    Find the move types with the best offensive coverage, e.g. the best four move types for a Pokemon out of its learnset.
+
+    The best moveset is the one with the highest expected effectiveness: the multiplier of its best move against each opponent typing (STAB included), weighted by how likely that typing is.
+    Requires the optional 'numpy' package.
+
+    Arguments:
+        candidates (list): The types of the moves to choose from (e.g. the type of every move in a learnset). Duplicates are ignored.
+        user (list): The types of the user's Pokemon. This can be left empty, but will not take into account STAB moves.
+        opponents (dict | None): The weight of each opponent typing, keyed by a tuple of its types (e.g. {("water", "ground"): 3, ("fire",): 1}). If None, every single and dual typing is equally likely.
+        count (int): The maximum number of moves to choose. Defaults to 4.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+        user_ability (str): The ability of the user's Pokemon, e.g. "tinted-lens". Defaults to none.
+    Returns:
+        dict: The chosen move types as "moves" (best first), and their expected effectiveness as "score".
+    Raises:
+        ValueError: If a type is unknown, or the user or an opponent typing has more than two types.
+    '''
+    if opponents is not None:
+        # Intern each typing, with -1 for no secondary type.
+        opponents = {__intern_typing(typing): weight for typing, weight in opponents.items()}
+    result = TypeOptimiser(get_type_chart(generation)).optimise(
+        [__intern_type(type) for type in candidates],
+        user_types=[type for type in __intern_typing(user) if type >= 0] if len(user) != 0 else [],
+        opponents=opponents,
+        count=count,
+        user_ability=AbilityModifier.index(user_ability, generation),
+    )
+    return {"moves": [TypeChart.name(type) for type in result["moves"]], "score": result["score"]}
+
+def analyse_team(team : list, generation : int = 8) -> dict:
+    '''
+    Analyse the defensive type coverage of a team, e.g. to find the attacking types several of its members are weak to.
+
+    Arguments:
+        team (list): The types of each member of the team (e.g. [["water", "ground"], ["steel"]]).
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        dict: The number of members "weak" to, "resisting" (including immunities), and "immune" to each attacking type (each keyed by type name),
+            the attacking types two or more members are weak to ("shared"), and no member resists ("uncovered"), as lists of names, and the team's "score" (higher is better).
+    Raises:
+        ValueError: If a member has no types or more than two, or an unknown type.
+    '''
+    result = TeamAnalyser.for_chart(get_type_chart(generation)).analyse([__intern_typing(member) for member in team])
+    return {
+        "weak": {TypeChart.name(attacking): count for attacking, count in enumerate(result["weak"])},
+        "resisting": {TypeChart.name(attacking): count for attacking, count in enumerate(result["resisting"])},
+        "immune": {TypeChart.name(attacking): count for attacking, count in enumerate(result["immune"])},
+        "shared": [TypeChart.name(attacking) for attacking in result["shared"]],
+        "uncovered": [TypeChart.name(attacking) for attacking in result["uncovered"]],
+        "score": result["score"],
+    }
+
+def rank_teams(teams, count : int | None = None, generation : int = 8) -> list:
+    '''
+    Rank many candidate teams by their defensive type coverage, best first.
+
+    Arguments:
+        teams (Iterable[list]): The teams, each a list of the types of each member (see analyse_team()). May be a generator.
+        count (int | None): The number of teams to keep. If None, every team is ranked.
+        generation (int): The generation of Pokemon to use (1-9). Defaults to 8.
+    Returns:
+        list[tuple[int, int]]: The (position in `teams`, score) of each ranked team, best first.
+    Raises:
+        ValueError: If a member has no types or more than two, or an unknown type.
+    '''
+    # There are only 171 typings, so each distinct member is only interned once.
+    typings = {}
+
+    def intern(member):
+        key = tuple(member)
+        typing = typings.get(key)
+        if typing is None:
+            typing = typings[key] = __intern_typing(member)
+        return typing
+
+    return TeamAnalyser.for_chart(get_type_chart(generation)).rank(([intern(member) for member in team] for team in teams), count=count)
+
+def __intern_typing(types : list) -> tuple:
+    '''
+    Intern the types of a Pokemon to a (primary, secondary) pair of indices, with -1 for no secondary type.
+
+    Arguments:
+        types (list): The types of the Pokemon (one or two).
+    Returns:
+        tuple[int, int]: The interned typing.
+    Raises:
+        ValueError: If there are no types or more than two, or a type is unknown.
+    '''
+    if len(types) == 0 or len(types) > 2:
+        raise ValueError("A typing must have one or two types.")
+    return (__intern_type(types[0]), __intern_type(types[1]) if len(types) > 1 else -1)
+
+def __intern_type(type : str) -> int:
+    '''
+    Intern a type name to its index.
+
+    Arguments:
+        type (str): The name of the type.
+    Returns:
+        int: The index of the type.
+    Raises:
+        ValueError: If the type is unknown.
+    '''
+    index = TypeChart.index(type)
+    if index == -1:
+        raise ValueError(f"Unknown type '{type}'.")
+    return index
+
+def run_batch(input, output, input_format : str = "jsonl", output_format : str | None = None, generation : int = 8) -> int:
+    '''
+    Run the calculations for a stream of matchup queries without any interaction, e.g. as one step of a pipeline.
+
+    Queries are read, calculated and written one at a time, so memory use stays constant however many queries there are.
+    In JSONL, each line is an object with "opponent", "moves", and optionally "user", "user_ability", "opponent_ability", "generation" and "id" (which is copied to the output).
+    In CSV, the first row names the columns, with the same names. Types may be given as a list, or as a string separated by slashes (e.g. "water/ground").
+    JSONL output has one object per query, with the query's "id" (if any), "generation", "user" and "opponent", and the moves of each category as in run_calculations().
+    CSV output has one row per move of each query, with the columns in BATCH_CSV_COLUMNS.
+
+    Arguments:
+        input (TextIO): The file to read queries from.
+        output (TextIO): The file to write results to.
+        input_format (str): The format of the queries, either "jsonl" or "csv". Defaults to "jsonl".
+        output_format (str | None): The format of the results, either "jsonl" or "csv". Defaults to the format of the queries.
+        generation (int): The generation of Pokemon to use for queries that don't give one (1-9). Defaults to 8.
+    Returns:
+        int: The number of queries processed.
+    Raises:
+        ValueError: If a format is unknown, or a query is malformed.
+    '''
+    output_format = output_format if output_format is not None else input_format
+    for format in (input_format, output_format):
+        if format not in BATCH_FORMATS:
+            raise ValueError(f"Unknown batch format '{format}'. Expected one of: {', '.join(BATCH_FORMATS)}.")
+    if input_format == "jsonl":
+        # Lines are decoded one at a time in the loop below, so a malformed line is reported with its query number.
+        rows = (line for line in input if line.strip() != "")
+    else:
+        rows = csv.DictReader(input)
+    if output_format == "csv":
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(BATCH_CSV_COLUMNS)
+
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        try:
+            if input_format == "jsonl":
+                try:
+                    row = json.loads(row)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"invalid JSON ({error}).") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"expected an object, got {type(row).__name__}.")
+            user = __parse_types(row.get("user"), "user")
+            opponent = __parse_types(row.get("opponent"), "opponent")
+            moves = __parse_types(row.get("moves"), "moves")
+            if len(opponent) == 0 or len(moves) == 0:
+                raise ValueError("\"opponent\" and \"moves\" are required.")
+            query_generation = row.get("generation")
+            try:
+                query_generation = int(query_generation) if query_generation not in (None, "") else generation
+            except (TypeError, ValueError):
+                raise ValueError("\"generation\" must be a number.") from None
+            categories = run_calculations(user=user, opponent=opponent, moves=moves, generation=query_generation, user_ability=str(row.get("user_ability") or ""), opponent_ability=str(row.get("opponent_ability") or ""))
+        except ValueError as error:
+            raise ValueError(f"Query {count}: {error}") from None
+
+        if output_format == "jsonl":
+            result = {"id": row["id"]} if row.get("id") not in (None, "") else {}
+            result.update({"generation": query_generation, "user": user, "opponent": opponent})
+            result.update((category, dict(efficiencies)) for category, efficiencies in zip(CATEGORIES, categories))
+            output.write(json.dumps(result, separators=(",", ":")))
+            output.write("\n")
+        else:
+            prefix = (row.get("id", ""), query_generation, "/".join(user), "/".join(opponent))
+            for category, efficiencies in zip(CATEGORIES, categories):
+                for move_type, efficiency in efficiencies.items():
+                    writer.writerow(prefix + (move_type, efficiency, category))
+    output.flush()
+    return count
+
+def __parse_types(types, field : str) -> list:
+    '''
+    Parse the types of a batch query, given either as a list or as a string separated by slashes.
+
+    Arguments:
+        types (list | str | None): The types.
+        field (str): The name of the field the types were given in, for error messages.
+    Returns:
+        list: The type names, with blanks removed.
+    Raises:
+        ValueError: If the types are neither a list nor a string.
+    '''
+    if types is None:
+        return []
+    if isinstance(types, str):
+        types = types.split("/")
+    elif not isinstance(types, list):
+        raise ValueError(f"\"{field}\" must be a list or a string, got {type(types).__name__}.")
+    return [str(type).strip() for type in types if str(type).strip() != ""]
 
 def __sort_values(dictionary : dict, reverse : bool = False) -> dict:
     '''
@@ -968,5 +669,29 @@ def __sort_values(dictionary : dict, reverse : bool = False) -> dict:
     return {k: v for v, k in sorted_pairs}
 
 # If this file is ran standalone, run the script() function automagicly.
+# With --batch, queries are instead streamed through run_batch() without any interaction.
 if __name__ == "__main__":
-    script()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pokemon Type Calculator. Runs interactively unless --batch is given.")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="INPUT", help="stream matchup queries from INPUT (or stdin if omitted or '-') and write the results, without any interaction")
+    parser.add_argument("--output", default="-", help="where to write batch results (default: stdout)")
+    parser.add_argument("--format", choices=BATCH_FORMATS, help="the format of the queries (default: from INPUT's extension, or jsonl)")
+    parser.add_argument("--output-format", choices=BATCH_FORMATS, help="the format of the results (default: the format of the queries)")
+    parser.add_argument("--generation", type=int, default=8, help="the generation for queries that don't give one (default: 8)")
+    arguments = parser.parse_args()
+    if arguments.batch is None:
+        script()
+    else:
+        input_format = arguments.format or ("csv" if arguments.batch.lower().endswith(".csv") else "jsonl")
+        # newline="" lets the csv module handle line endings itself.
+        input_file = sys.stdin if arguments.batch == "-" else open(arguments.batch, encoding="utf-8", newline="")
+        output_file = sys.stdout if arguments.output == "-" else open(arguments.output, "w", encoding="utf-8", newline="")
+        try:
+            run_batch(input_file, output_file, input_format=input_format, output_format=arguments.output_format, generation=arguments.generation)
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            exit(1)
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+            if output_file is not sys.stdout:
+                output_file.close()
\ No newline at end of file
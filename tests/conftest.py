@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.standin_server import StandInServer
+from objects.api.PokeRegistry import PokeRegistry
+from objects.api.PokeSession import PokeSession
+
+@pytest.fixture
+def api():
+    '''
+    A local stand-in for the PokeAPI (see `benchmarks/standin_server.py`), served through an uncached default session, with nothing loaded in the registry.
+
+    A small latency keeps requests in flight long enough for concurrent loads to overlap.
+    '''
+    with StandInServer(latency=0.05, count=500, move_count=5) as server:
+        PokeSession.configure(base_url=server.base_url, cache=None)
+        PokeRegistry.default_registry().clear()
+        yield server
+        PokeRegistry.default_registry().clear()
+        PokeSession.default_session().close()
+        PokeSession._default = None
@@ -0,0 +1,59 @@
+from benchmarks.simulation_benchmark import teams
+from objects.battle.AbilityRegistry import AbilityRegistry
+from objects.battle.BattleAbility import BattleAbility
+from objects.battle.BattleState import BattleState
+from objects.battle.PokeBattle import PokeBattle
+
+# Move slots of the simulation benchmark's teams.
+SWORDS_DANCE, CRUNCH = 3, 1
+
+def test_subscriptions_are_the_overridden_hooks():
+    assert AbilityRegistry.subscriptions(AbilityRegistry.get("rough-skin")) == ("post_target_damage",)
+    assert AbilityRegistry.subscriptions(AbilityRegistry.get("Speed Boost")) == ("post_turn",)
+    assert AbilityRegistry.subscriptions(BattleAbility()) == ()
+    assert AbilityRegistry.get("levitate") is None
+
+def test_dispatch_only_lists_subscribed_members():
+    battle_teams = teams()
+    table = AbilityRegistry.dispatch(battle_teams)
+    # Only the first team's lead (Garchomp, with Rough Skin) has an ability with hooks.
+    assert [hook for hook, handlers in table.items() if handlers is not None] == ["post_target_damage"]
+    assert table["post_target_damage"][0][0] is not None
+    assert table["post_target_damage"][0][1:] == (None, None)
+    naive = AbilityRegistry.dispatch(battle_teams, subscribed_only=False)
+    assert all(handlers is not None for handlers in naive.values())
+
+def test_rough_skin_when_holder_survives():
+    battle = PokeBattle(teams(), seed=1)
+    battle.step(SWORDS_DANCE, CRUNCH)
+    tyranitar = battle.active_pokemon(1)
+    assert battle.hp(0) > 0
+    assert battle.hp(1) == tyranitar.stats[0] - tyranitar.stats[0] // 8
+
+def test_rough_skin_when_holder_is_knocked_out():
+    battle = PokeBattle(teams(), seed=1)
+    battle.state.data[battle.state.active(0) + BattleState.HP] = 1
+    tyranitar = battle.active_pokemon(1)
+    battle.step(SWORDS_DANCE, CRUNCH)
+    assert battle.hp(0, 0) == 0
+    assert battle.hp(1) == tyranitar.stats[0] - tyranitar.stats[0] // 8
+
+def test_rough_skin_knocks_out_attacker_before_holder_moves():
+    battle = PokeBattle(teams(), seed=1)
+    # Tyranitar outspeeds Garchomp, and Rough Skin knocks it out as its Crunch lands.
+    battle.boost(1, "speed", 6)
+    battle.state.data[battle.state.active(1) + BattleState.HP] = 1
+    pp = battle.state.data[battle.state.active(0) + BattleState.PP]
+    battle.step(0, CRUNCH)
+    assert battle.hp(1, 0) == 0
+    # Garchomp had nothing left to hit, so its Earthquake was never used.
+    assert battle.state.data[battle.state.member(0, 0) + BattleState.PP] == pp
+
+def test_intimidate_on_summon():
+    battle_teams = teams()
+    battle_teams[1][1].ability = "intimidate"
+    battle = PokeBattle(battle_teams, seed=1)
+    assert battle.stage(0, "attack") == 0
+    battle.step(SWORDS_DANCE, PokeBattle.SWITCH + 1)
+    # Swords Dance goes after the switch, so +2 on top of Intimidate's -1.
+    assert battle.stage(0, "attack") == 1
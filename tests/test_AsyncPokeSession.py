@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from objects.api.AsyncPokeSession import AsyncPokeSession
+from objects.api.PokeCache import PokeCache
+from objects.api.PokeHealth import APIUnavailableError, PokeHealth
+from objects.api.PokeSnapshot import SnapshotMissError
+from objects.data.AsyncPokeData import AsyncPokeData
+
+def test_concurrent_fetches_share_one_request(api):
+    async def fetch_all():
+        async with AsyncPokeSession() as session:
+            url = session.resource_url("pokemon", "pokemon-3")
+            return await asyncio.gather(*[session.fetch(url) for _ in range(8)])
+    results = asyncio.run(fetch_all())
+    assert all(data["id"] == 3 for data in results)
+    assert api.requests == 1
+
+def test_cancelled_waiter_does_not_cancel_shared_request(api):
+    async def fetch_with_cancel():
+        async with AsyncPokeSession() as session:
+            url = session.resource_url("pokemon", "pokemon-4")
+            first = asyncio.ensure_future(session.fetch(url))
+            second = asyncio.ensure_future(session.fetch(url))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+    assert asyncio.run(fetch_with_cancel())["id"] == 4
+    assert api.requests == 1
+
+def test_cache_hit_sends_no_request(api, tmp_path):
+    cache = PokeCache(str(tmp_path / "cache.sqlite"))
+    async def fetch(identifier):
+        async with AsyncPokeSession(cache=cache) as session:
+            return await session.fetch(session.resource_url("pokemon", identifier))
+    try:
+        assert asyncio.run(fetch(9))["name"] == "pokemon-9"
+        assert api.requests == 1
+        # The name is cached as an alias of the ID, so either hits the cache.
+        assert asyncio.run(fetch(9))["id"] == 9
+        assert asyncio.run(fetch("pokemon-9"))["id"] == 9
+        assert api.requests == 1
+    finally:
+        cache.close()
+
+def test_open_circuit_raises_without_request(api):
+    health = PokeHealth(failure_threshold=1)
+    health.record_failure()
+    async def fetch():
+        async with AsyncPokeSession(health=health) as session:
+            return await session.fetch(session.resource_url("pokemon", 1))
+    with pytest.raises(APIUnavailableError):
+        asyncio.run(fetch())
+    assert api.requests == 0
+
+def test_connection_failures_open_circuit(api):
+    health = PokeHealth(failure_threshold=2)
+    async def fetch_unreachable():
+        # Nothing listens on the discard port locally, so every request fails to connect.
+        async with AsyncPokeSession(base_url="http://127.0.0.1:9/api/v2/", cache=None, health=health, timeout=2) as session:
+            for _ in range(2):
+                with pytest.raises(aiohttp.ClientConnectionError):
+                    await session.fetch(session.resource_url("pokemon", 1))
+            with pytest.raises(APIUnavailableError):
+                await session.fetch(session.resource_url("pokemon", 1))
+    asyncio.run(fetch_unreachable())
+    assert health.get_state() == PokeHealth.OPEN
+
+def test_offline_miss_raises(api):
+    async def fetch():
+        async with AsyncPokeSession() as session:
+            session.offline = True
+            return await session.fetch(session.resource_url("pokemon", 1))
+    with pytest.raises(SnapshotMissError):
+        asyncio.run(fetch())
+    assert api.requests == 0
+
+def test_fetch_team_shares_child_resources(api):
+    team = asyncio.run(AsyncPokeData.fetch_team(["pokemon-1", "pokemon-1", "pokemon-2"], include=("abilities",)))
+    assert team[0].get_pokemon() is team[1].get_pokemon()
+    assert len(team[2].get_abilities()) == 3
+    # Two Pokemon and their six abilities, each fetched once.
+    assert api.requests == 2 + len({ability.get_id() for member in team for ability in member.get_abilities()})
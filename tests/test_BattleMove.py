@@ -0,0 +1,49 @@
+from objects.battle.BattleMove import BattleMove
+from objects.battle.BattlePokemon import BattlePokemon
+from objects.battle.PokeBattle import PokeBattle
+
+def move_data(name : str, type : str, power : int, stat_changes : dict, category : str, target : str = "selected-pokemon") -> dict:
+    '''
+    A PokeAPI-shaped move resource, with only the fields `BattleMove.from_data` reads.
+    '''
+    return {
+        "name": name,
+        "type": {"name": type},
+        "power": power,
+        "accuracy": 100,
+        "damage_class": {"name": "physical" if power else "status"},
+        "priority": 0,
+        "pp": 10,
+        "target": {"name": target},
+        "stat_changes": [{"stat": {"name": stat}, "change": change} for stat, change in stat_changes.items()],
+        "meta": {"category": {"name": category}, "ailment": {"name": "none"}, "ailment_chance": 0, "crit_rate": 0, "stat_chance": 0},
+    }
+
+def test_self_boosting_damaging_move_targets_user():
+    move = BattleMove.from_data(move_data("flame-charge", "fire", 50, {"speed": 1}, "damage+raise"))
+    assert move.targets_user
+    assert move.stat_changes == ((BattleMove.STATS.index("speed"), 1),)
+    assert move.stat_chance == 100
+
+def test_self_dropping_damaging_move_targets_user():
+    move = BattleMove.from_data(move_data("close-combat", "fighting", 120, {"defense": -1, "special-defense": -1}, "damage+raise"))
+    assert move.targets_user
+    assert move.stat_changes == ((BattleMove.STATS.index("defense"), -1), (BattleMove.STATS.index("special-defense"), -1))
+
+def test_damaging_move_that_lowers_target_stats_targets_target():
+    move = BattleMove.from_data(move_data("crunch", "dark", 80, {"defense": -1}, "damage+lower"))
+    assert not move.targets_user
+
+def test_status_move_on_user_targets_user():
+    move = BattleMove.from_data(move_data("swords-dance", "normal", 0, {"attack": 2}, "net-good-stats", target="user"))
+    assert move.targets_user
+
+def test_self_boosting_move_changes_users_stage_in_battle():
+    flame_charge = BattleMove.from_data(move_data("flame-charge", "fire", 50, {"speed": 1}, "damage+raise"))
+    tackle = BattleMove("tackle", "normal", 40)
+    stats = {"hp": 100, "attack": 50, "defense": 100, "special-attack": 50, "special-defense": 100, "speed": 50}
+    battle = PokeBattle(([BattlePokemon.from_base_stats("user", ["fire"], stats, [flame_charge])],
+                         [BattlePokemon.from_base_stats("target", ["normal"], stats, [tackle])]), seed=1)
+    battle.step(0, 0)
+    assert battle.stage(0, "speed") == 1
+    assert battle.stage(1, "speed") == 0
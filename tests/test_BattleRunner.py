@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks.simulation_benchmark import teams
+from objects.battle.BattlePolicy import BattlePolicy
+from objects.battle.BattleRunner import BattleRunner
+from objects.battle.GreedyPolicy import GreedyPolicy
+from objects.battle.RandomPolicy import RandomPolicy
+
+class CyclingPolicy(BattlePolicy):
+    '''
+    A stateful policy: cycles through the legal actions, counting every choice it has made, until it's reset.
+    '''
+
+    def __init__(self):
+        self.choices = 0
+
+    def reset(self):
+        self.choices = 0
+
+    def choose(self, battle, side : int) -> int:
+        actions = battle.legal_actions(side)
+        self.choices += 1
+        return actions[self.choices % len(actions)]
+
+@pytest.mark.parametrize("policies", [(RandomPolicy(), RandomPolicy()), (GreedyPolicy(), RandomPolicy()), (CyclingPolicy(), GreedyPolicy())])
+def test_results_do_not_depend_on_workers(policies : tuple):
+    runner = BattleRunner(teams(), policies)
+    baseline = runner.run(24, seed=7, workers=1)
+    assert baseline["wins"] + baseline["losses"] + baseline["draws"] == 24
+    for workers in (2, 4):
+        assert runner.run(24, seed=7, workers=workers) == baseline
+
+def test_stateful_policies_are_reset_between_runs():
+    runner = BattleRunner(teams(), (CyclingPolicy(), GreedyPolicy()))
+    assert runner.run(24, seed=7, workers=1) == runner.run(24, seed=7, workers=1)
+
+def test_seeds_differ():
+    runner = BattleRunner(teams(), (RandomPolicy(), RandomPolicy()))
+    assert runner.run(50, seed=1, workers=1) != runner.run(50, seed=2, workers=1)
+
+def test_interval():
+    assert BattleRunner.interval(0, 0) == (0.0, 1.0)
+    low, high = BattleRunner.interval(50, 100)
+    assert low < 0.5 < high
+    assert BattleRunner.interval(100, 100)[1] == 1.0
@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks.simulation_benchmark import teams
+from objects.battle.BattleState import BattleState
+from objects.battle.GreedyPolicy import GreedyPolicy
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.RandomPolicy import RandomPolicy
+
+def test_seeded_battles_are_reproducible():
+    keys = set()
+    for _ in range(2):
+        battle = PokeBattle(teams(), seed=3)
+        battle.play((RandomPolicy(), GreedyPolicy()))
+        keys.add(battle.state.key())
+    assert len(keys) == 1
+
+def test_move_is_the_active_members():
+    battle = PokeBattle(teams(), seed=1)
+    battle.step(PokeBattle.SWITCH + 2, PokeBattle.SWITCH + 1)
+    assert battle.move(0, 0) is battle.teams[0][2].moves[0]
+    assert battle.move(1, 0) is battle.teams[1][1].moves[0]
+
+def test_move_without_pp_is_illegal():
+    battle = PokeBattle(teams(), seed=1)
+    battle.state.data[battle.state.active(0) + BattleState.PP] = 0
+    assert 0 not in battle.legal_actions(0)
+    with pytest.raises(ValueError):
+        battle.step(0, 0)
+
+def test_struggle_is_only_legal_without_pp():
+    battle = PokeBattle(teams(), seed=1)
+    with pytest.raises(ValueError):
+        battle.step(PokeBattle.STRUGGLE, 0)
+    offset = battle.state.active(0) + BattleState.PP
+    for move in range(4):
+        battle.state.data[offset + move] = 0
+    assert battle.legal_actions(0)[0] == PokeBattle.STRUGGLE
+    battle.step(PokeBattle.STRUGGLE, 0)
+
+def test_switch_to_fainted_or_active_member_is_illegal():
+    battle = PokeBattle(teams(), seed=1)
+    battle.state.data[battle.state.member(0, 1) + BattleState.HP] = 0
+    for action in (PokeBattle.SWITCH, PokeBattle.SWITCH + 1, PokeBattle.SWITCH + 3, 4 + PokeBattle.SWITCH):
+        with pytest.raises(ValueError):
+            battle.step(action, 0)
+    # A rejected turn changes nothing.
+    assert battle.turn == 0
+
+def test_illegal_action_after_the_battle_raises():
+    battle = PokeBattle(teams(), seed=1)
+    battle.play((GreedyPolicy(), RandomPolicy()))
+    with pytest.raises(ValueError):
+        battle.step(0, 0)
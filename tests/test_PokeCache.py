@@ -0,0 +1,29 @@
+import threading
+
+from objects.api.PokeCache import PokeCache
+
+def test_default_cache_is_created_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(PokeCache, "_default", None)
+    barrier = threading.Barrier(8)
+    caches = []
+
+    def first_use():
+        barrier.wait()
+        caches.append(PokeCache.default_cache())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert len(caches) == 8
+    assert all(cache is caches[0] for cache in caches)
+    assert caches[0].path == str(tmp_path / "pokesuite" / "responses.sqlite3")
+
+def test_put_and_get(tmp_path):
+    cache = PokeCache(str(tmp_path / "cache.sqlite3"))
+    url = "https://pokeapi.co/api/v2/pokemon/25/"
+    cache.put(url, {"id": 25, "name": "pikachu", "weight": 60}, aliases=["https://pokeapi.co/api/v2/pokemon/pikachu/"])
+    assert cache.get("https://pokeapi.co/api/v2/pokemon/pikachu/") == {"id": 25, "name": "pikachu", "weight": 60}
+    assert cache.get(url, ("weight",))["weight"] == 60
+    assert cache.get("https://pokeapi.co/api/v2/pokemon/1/") is None
+    cache.close()
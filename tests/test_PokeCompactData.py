@@ -0,0 +1,30 @@
+from benchmarks.standin_server import pokemon_payload
+from objects.data.PokeCompactData import PokeCompactData
+
+def payload() -> dict:
+    data = pokemon_payload("http://127.0.0.1/api/v2/", 25, move_count=3)
+    data["sprites"]["other"] = {"official-artwork": {"front_default": "https://example.invalid/artwork/25.png", "front_shiny": None}}
+    data["sprites"]["versions"] = {"generation-i": {"red-blue": {"front_default": None}}}
+    return data
+
+def test_sections_match_raw_data():
+    data = payload()
+    compact = PokeCompactData(data)
+    for key in ("name", "id", "types", "stats", "abilities", "forms", "species", "moves"):
+        assert compact.get(key) == data[key]
+
+def test_sprites_match_raw_data_without_versions():
+    data = payload()
+    sprites = PokeCompactData(data).get("sprites")
+    expected = dict(data["sprites"])
+    del expected["versions"]
+    assert sprites == expected
+    assert sprites["front_female"] is None
+
+def test_sprites_are_copies():
+    data = payload()
+    compact = PokeCompactData(data)
+    compact.get("sprites")["other"]["official-artwork"]["front_default"] = "changed"
+    data["sprites"]["other"]["official-artwork"]["front_shiny"] = "changed"
+    artwork = compact.get("sprites")["other"]["official-artwork"]
+    assert artwork == {"front_default": "https://example.invalid/artwork/25.png", "front_shiny": None}
@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests.exceptions import HTTPError
+
+from objects.api.PokeSession import PokeSession
+from objects.data.PokeAbilityData import PokeAbilityData
+from objects.data.PokeData import PokeData
+
+def test_lazy_sends_no_request(api):
+    pokemon = PokeData(name="pokemon-5", lazy=True)
+    assert not pokemon.is_loaded()
+    assert pokemon.get_name() == "pokemon-5"
+    assert api.requests == 0
+
+def test_eager_lookup_loads_lazy_object(api):
+    lazy = PokeData(name="pokemon-5", lazy=True)
+    eager = PokeData(name="pokemon-5")
+    assert eager is lazy
+    assert eager.is_loaded()
+    assert eager.get_internal_id() == 5
+
+def test_eager_lookup_of_missing_lazy_object_raises(api):
+    PokeData(name="missingno", lazy=True)
+    with pytest.raises(HTTPError):
+        PokeData(name="missingno")
+
+def test_eager_lookup_of_missing_lazy_ability_raises(api):
+    PokeAbilityData(name="missing-ability", lazy=True)
+    with pytest.raises(HTTPError):
+        PokeAbilityData(name="missing-ability")
+
+def test_known_fields_from_url(api):
+    ability = PokeAbilityData(url=f"{api.base_url}ability/7/", lazy=True)
+    assert ability.get_id() == 7
+    assert api.requests == 0
+
+def test_concurrent_loads_share_one_request(api):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: PokeData(name="pokemon-7"), range(8)))
+    assert all(pokemon is results[0] for pokemon in results)
+    assert api.requests == 1
+
+def test_load_many_gives_one_object_per_resource(api):
+    results = PokeData.load_many(["pokemon-40", f"{api.base_url}pokemon/40/", "Pokemon-40", "pokemon-41"], workers=4)
+    assert results[0] is results[1] is results[2]
+    assert results[3] is not results[0]
+    assert PokeData(url=f"{api.base_url}pokemon/40") is results[0]
+
+def test_from_data_keeps_registered_object(api):
+    pokemon = PokeData(name="pokemon-12")
+    data = pokemon._raw_data()
+    assert PokeData.from_data(data, url=f"{api.base_url}pokemon/12/") is pokemon
+    assert PokeData.from_data(data) is pokemon
+
+def test_projection_does_not_leak_to_plain_lookup(api):
+    projected = PokeData(name="pokemon-3", fields=PokeData.BASIC_FIELDS)
+    assert "moves" not in projected._data
+    pokemon = PokeData(name="pokemon-3")
+    assert pokemon is projected
+    assert "moves" in pokemon.data
+    assert "game_indices" in pokemon._raw_data()
+
+def test_projection_keeps_accessors_light(api):
+    pokemon = PokeData(name="pokemon-4", fields=PokeData.BASIC_FIELDS)
+    assert pokemon.get_name() == "pokemon-4"
+    assert pokemon.get_default_types() != []
+    assert "moves" not in pokemon._data
+
+def test_ability_projection_does_not_leak_to_plain_lookup(api):
+    projected = PokeAbilityData(name="ability-3", fields=PokeAbilityData.BASIC_FIELDS)
+    assert projected.get_name() == "ability-3"
+    assert "effect_entries" not in projected._data
+    ability = PokeAbilityData(name="ability-3")
+    assert ability is projected
+    assert ability.data["effect_entries"][0]["short_effect"] == "Ability 3."
+
+def test_compact_section_left_out_is_fetched(api):
+    pokemon = PokeData(name="pokemon-6", compact=True)
+    assert pokemon.get_name() == "pokemon-6"
+    assert pokemon.is_compact()
+    assert len(pokemon._get_data("game_indices", [])) == 19
+    assert not pokemon.is_compact()
+
+def test_compact_does_not_leak_to_plain_lookup(api):
+    compact = PokeData(name="pokemon-8", compact=True)
+    pokemon = PokeData(name="pokemon-8")
+    assert pokemon is compact
+    assert "game_indices" in pokemon.data
+    assert not pokemon.is_compact()
+
+def test_connection_test(api):
+    assert PokeData.test_connection(name="pokemon-2") == 200
+    assert PokeData.test_connection(name="missingno") == 404
+    assert PokeAbilityData.test_connection(name="ability-2") == 200
+
+def test_connection_test_offline(api):
+    PokeSession.default_session().offline = True
+    assert PokeData.test_connection() == 503
+    assert PokeAbilityData.test_connection() == 503
+
+def test_connection_test_unreachable(api):
+    session = PokeSession.default_session()
+    session.base_url = "http://127.0.0.1:9/api/v2/"
+    session.health.reset()
+    assert PokeData.test_connection() == 503
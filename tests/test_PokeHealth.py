@@ -0,0 +1,41 @@
+import time
+
+import pytest
+from requests.exceptions import InvalidURL
+
+from objects.api.PokeHealth import PokeHealth
+from objects.api.PokeSession import PokeSession
+
+def open_circuit(reset_timeout : float) -> PokeHealth:
+    health = PokeHealth(failure_threshold=1, reset_timeout=reset_timeout)
+    health.record_failure()
+    assert not health.is_available()
+    # Wait for the reset timeout, so the next request is let through as the probe.
+    time.sleep(reset_timeout)
+    return health
+
+def test_probe_success_closes_circuit():
+    health = open_circuit(0.1)
+    assert health.allow_request()
+    assert not health.allow_request()
+    health.record_success()
+    assert health.get_state() == PokeHealth.CLOSED
+
+def test_abandoned_probe_frees_next_probe():
+    health = open_circuit(0.1)
+    assert health.allow_request()
+    assert not health.allow_request()
+    health.record_abandoned()
+    assert health.allow_request()
+
+def test_probe_raising_unexpected_error_does_not_block_session(api):
+    health = open_circuit(0.2)
+    session = PokeSession(base_url=api.base_url, cache=None, health=health)
+    try:
+        # The probe fails before reaching the API, which says nothing about whether it's reachable.
+        with pytest.raises(InvalidURL):
+            session.get("http://")
+        assert session.get(session.resource_url("pokemon", 1)).status_code == 200
+        assert health.get_state() == PokeHealth.CLOSED
+    finally:
+        session.close()
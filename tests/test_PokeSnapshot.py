@@ -0,0 +1,27 @@
+import pytest
+
+from objects.api.PokeSession import PokeSession
+from objects.api.PokeSnapshot import PokeSnapshot, SnapshotMissError
+
+def test_build_and_serve_offline(api, tmp_path):
+    snapshot = PokeSnapshot.build(str(tmp_path / "snapshot.sqlite"), resources=("pokemon",), limit=3, workers=2)
+    try:
+        session = PokeSession(base_url=api.base_url, cache=None, snapshot=snapshot, offline=True)
+        requests = api.requests
+        assert session.fetch(session.resource_url("pokemon", "pokemon-2"))["id"] == 2
+        with pytest.raises(SnapshotMissError):
+            session.fetch(session.resource_url("pokemon", 4))
+        assert api.requests == requests
+    finally:
+        snapshot.close()
+
+def test_rebuild_while_default_session_is_offline(api, tmp_path):
+    path = str(tmp_path / "snapshot.sqlite")
+    snapshot = PokeSnapshot.build(path, resources=("ability",), limit=2, workers=2)
+    PokeSession.configure(base_url=api.base_url, cache=None, snapshot=snapshot, offline=True)
+    rebuilt = PokeSnapshot.build(str(tmp_path / "rebuilt.sqlite"), resources=("ability",), limit=3, workers=2)
+    try:
+        assert rebuilt.get_info()["counts"] == {"ability": 3}
+    finally:
+        rebuilt.close()
+        snapshot.close()
@@ -0,0 +1,49 @@
+import pickle
+
+from benchmarks.simulation_benchmark import teams
+from objects.battle.BattleRunner import BattleRunner
+from objects.battle.GreedyPolicy import GreedyPolicy
+from objects.battle.PokeBattle import PokeBattle
+from objects.battle.SearchPolicy import SearchPolicy
+
+# Shared by every battle here, so a search's table could carry over from one battle to the next.
+TEAMS = teams()
+
+def play(policy : SearchPolicy, seed : int) -> bytes:
+    battle = PokeBattle(TEAMS, seed=seed)
+    battle.play((policy, GreedyPolicy()))
+    return battle.state.key()
+
+def first_choice(policy : SearchPolicy, seed : int) -> tuple:
+    action = policy.choose(PokeBattle(TEAMS, seed=seed), 0)
+    return (action, policy.statistics["nodes"], policy.statistics["simulations"], policy.statistics["positions"])
+
+def test_node_budget_is_reproducible_after_other_battles():
+    fresh = first_choice(SearchPolicy(time_limit=None, max_nodes=200), 7)
+    policy = SearchPolicy(time_limit=None, max_nodes=200)
+    play(policy, 3)
+    assert first_choice(policy, 7) == fresh
+    play(policy, 3)
+    policy.reset()
+    assert first_choice(policy, 7) == fresh
+
+def test_runner_results_do_not_depend_on_workers():
+    runner = BattleRunner(TEAMS, (SearchPolicy(time_limit=None, max_nodes=60), GreedyPolicy()))
+    baseline = runner.run(24, seed=7, workers=1)
+    assert runner.run(24, seed=7, workers=1) == baseline
+    for workers in (2, 4):
+        assert runner.run(24, seed=7, workers=workers) == baseline
+
+def test_table_stays_within_its_size(monkeypatch):
+    monkeypatch.setattr(SearchPolicy, "TABLE_SIZE", 50)
+    policy = SearchPolicy(time_limit=None, max_nodes=2000)
+    battle = PokeBattle(TEAMS, seed=1)
+    policy.choose(battle, 0)
+    assert 0 < len(policy._table) <= 50
+    assert policy.statistics["nodes"] >= 2000
+
+def test_copies_start_afresh():
+    policy = SearchPolicy(time_limit=None, max_nodes=200)
+    play(policy, 1)
+    copy = pickle.loads(pickle.dumps(policy))
+    assert len(copy._table) == 0 and copy.max_nodes == 200
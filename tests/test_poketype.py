@@ -0,0 +1,89 @@
+import io
+import json
+
+import pytest
+
+import poketype
+
+def batch(lines : list) -> list:
+    output = io.StringIO()
+    poketype.run_batch(io.StringIO("\n".join(lines) + "\n"), output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_batch_runs_queries():
+    results = batch(['{"id": 1, "opponent": "water/ground", "moves": ["grass", "electric"]}'])
+    assert results[0]["id"] == 1
+    assert results[0]["super_effective"] == {"grass": 4.0}
+
+@pytest.mark.parametrize("line, message", [
+    ('{"opponent": "water", "moves": ', "invalid JSON"),
+    ('["water"]', "expected an object"),
+    ('{"opponent": "water", "moves": 5}', "\"moves\" must be a list or a string"),
+    ('{"opponent": {"type": "water"}, "moves": "grass"}', "\"opponent\" must be a list or a string"),
+    ('{"user": 1, "opponent": "water", "moves": "grass"}', "\"user\" must be a list or a string"),
+    ('{"opponent": "water", "moves": "grass", "generation": "two"}', "\"generation\" must be a number"),
+    ('{"opponent": "water"}', "\"opponent\" and \"moves\" are required"),
+])
+def test_malformed_query_raises_value_error_naming_query(line, message):
+    with pytest.raises(ValueError, match=f"^Query 2: .*{message}"):
+        batch(['{"opponent": "water", "moves": "grass"}', line])
+
+def test_analyse_team_rejects_unknown_type():
+    with pytest.raises(ValueError, match="'firre'"):
+        poketype.analyse_team([["firre"], ["water"]])
+
+def test_rank_teams_rejects_unknown_type():
+    with pytest.raises(ValueError, match="'grund'"):
+        poketype.rank_teams([[["fire"], ["water"]], [["water", "grund"]]])
+
+def test_ability_modifiers_apply_from_their_first_generation():
+    # Lightning Rod only gives an immunity from Generation 5.
+    assert "electric" in poketype.run_calculations(opponent=["water"], moves=["electric"], generation=4, opponent_ability="lightning-rod")[0]
+    assert "electric" in poketype.run_calculations(opponent=["water"], moves=["electric"], generation=5, opponent_ability="lightning-rod")[3]
+    # There are no abilities before Generation 3.
+    assert "ground" in poketype.run_calculations(opponent=["fire"], moves=["ground"], generation=2, opponent_ability="levitate")[0]
+    assert "ground" in poketype.run_calculations(opponent=["fire"], moves=["ground"], generation=3, opponent_ability="levitate")[3]
+
+def test_batch_ability_modifiers_apply_from_their_first_generation():
+    pytest.importorskip("numpy")
+    water, electric = poketype.TypeChart.index("water"), poketype.TypeChart.index("electric")
+    lightning_rod = poketype.AbilityModifier.index("lightning-rod")
+    for generation, expected in ((4, 2.0), (5, 0.0)):
+        result = poketype.run_batch_calculations([[electric]], [water], generation=generation, abilities=[lightning_rod])
+        assert result[0, 0, 0] == expected
+
+@pytest.mark.parametrize("arguments", [
+    {"candidates": ["ice", "watr"]},
+    {"candidates": ["ice"], "user": ["watr"]},
+    {"candidates": ["ice"], "opponents": {("watr", "ground"): 1}},
+])
+def test_find_best_moves_rejects_unknown_type(arguments):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="'watr'"):
+        poketype.find_best_moves(**arguments)
+
+def test_find_best_moves_takes_single_type_opponents():
+    pytest.importorskip("numpy")
+    assert poketype.find_best_moves(["ice", "fire", "electric"], opponents={("water", "ground"): 1, ("flying",): 1}, count=1)["moves"] == ["ice"]
+
+def test_defensive_profile_and_attacking_types():
+    assert poketype.get_defensive_profile(["water", "ground"])["grass"] == 4.0
+    assert poketype.get_attacking_types(["water", "ground"], 4.0) == ["grass"]
+
+@pytest.mark.parametrize("function", [poketype.get_defensive_profile, poketype.get_attacking_types])
+def test_typing_lookups_reject_unknown_type(function):
+    with pytest.raises(ValueError, match="'watr'"):
+        function(["watr"])
+    with pytest.raises(ValueError, match="'grund'"):
+        function(["water", "grund"])
+
+def test_defending_typings_and_coverage():
+    assert poketype.get_defending_typings("grass", 4.0) == poketype.get_defending_typings("Grass ", 4.0)
+    assert ("ground", "water") in poketype.get_defending_typings("grass", 4.0)
+    assert ("ground", "water") in poketype.get_coverage(["grass"])["super_effective"]
+
+def test_reverse_lookups_reject_unknown_type():
+    with pytest.raises(ValueError, match="'fir'"):
+        poketype.get_defending_typings("fir")
+    with pytest.raises(ValueError, match="'fir'"):
+        poketype.get_coverage(["ice", "fir"])